@@ -0,0 +1,46 @@
+"""
+가격정규화 확인 (python -m pytest test_가격정규화.py)
+- 문자열 형식별 결과, 빈 값(None/NaN/무한대) → None
+"""
+import math
+
+import pytest
+
+from 가격정규화 import (parse_area, parse_areas, parse_price, parse_price_range, parse_prices, parse_rent,
+                   parse_rents)
+
+@pytest.mark.parametrize('text, expected', [
+    ('12억 5,000', 125000),
+    ('6억', 60000),
+    ('8,500', 8500),
+    ('최대 2억 4,800만원', 24800),
+    ('1.5억', 15000),
+    (59000, 59000),
+    ('가격 없음', None),
+])
+def test_parse_price(text, expected):
+    assert parse_price(text) == expected
+
+@pytest.mark.parametrize('value', [None, math.nan, math.inf, -math.inf])
+def test_missing_values(value):
+    assert parse_price(value) is None
+    assert parse_area(value) is None
+    assert parse_rent(value) == (None, None)
+    assert parse_price_range(value) == (None, None)
+
+def test_parse_rent_and_range():
+    assert parse_rent('1억/200') == (10000, 200)
+    assert parse_rent('5,000') == (5000, None)
+    assert parse_rent(5000.0) == (5000, None)
+    assert parse_price_range('5억 7,000 ~ 6억 9,000') == (57000, 69000)
+    assert parse_price_range('6억') == (60000, 60000)
+
+def test_parse_area():
+    assert parse_area('59.84㎡') == 59.84
+    assert parse_area('25평') == 82.64
+    assert parse_area(84) == 84.0
+
+def test_columns_keep_missing_values():
+    assert parse_prices(['6억', math.nan, None, '6억']) == [60000, None, None, 60000]
+    assert parse_areas([math.nan, '25평']) == [None, 82.64]
+    assert parse_rents(['1억/200', math.nan]) == ([10000, None], [200, None])
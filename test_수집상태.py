@@ -0,0 +1,121 @@
+"""
+수집 상태 확인 (python -m pytest test_수집상태.py)
+- 임시 폴더의 SQLite 파일로 이어서 수집 / 증분 수집 계획 확인
+"""
+import pytest
+
+from 수집상태 import DELISTED, DONE, FAILED, MAX_ATTEMPTS, RUNNING, CrawlState, snippet_hash
+
+def url_info(article_id, snippet='아파트 84㎡ 12층 남향'):
+    return {'매물ID': article_id, 'URL': f'https://fin.land.naver.com/articles/{article_id}', '매물정보': snippet}
+
+@pytest.fixture
+def state_path(tmp_path):
+    return tmp_path / '수집상태.db'
+
+def open_state(path):
+    return CrawlState(path, batch_size=1)
+
+def test_started_then_crash_is_pending(state_path):
+    state = open_state(state_path)
+    state.mark_started('1')
+    state.mark_started('2')
+    state.mark_done('2', 'data/article_2.json')
+    # close() 없이 종료 → 다시 열면 진행 중이던 매물만 다시 수집
+    state.conn.close()
+
+    with open_state(state_path) as state:
+        assert state.get('1')['상태'] == RUNNING
+        targets, skipped = state.pending([url_info('1'), url_info('2'), url_info('3')])
+    assert [t['매물ID'] for t in targets] == ['1', '3']
+    assert skipped == {DONE: 1, '실패한도': 0}
+
+def test_uncommitted_done_is_recrawled(state_path):
+    state = CrawlState(state_path, batch_size=100, flush_interval=3600)
+    state.mark_started('1')
+    state.flush()
+    state.mark_done('1', 'data/article_1.json')
+    # 커밋 전에 죽으면 완료 표시가 없음 → 다음 실행에서 다시 수집
+    state.conn.close()
+
+    with open_state(state_path) as state:
+        targets, _ = state.pending([url_info('1')])
+    assert [t['매물ID'] for t in targets] == ['1']
+
+def test_failed_retried_until_limit(state_path):
+    with open_state(state_path) as state:
+        for _ in range(MAX_ATTEMPTS):
+            state.mark_started('1')
+            state.mark_failed('1', 'timeout')
+        assert state.get('1')['상태'] == FAILED
+        targets, skipped = state.pending([url_info('1')])
+    assert targets == []
+    assert skipped['실패한도'] == 1
+
+def test_done_records_output_path(state_path):
+    with open_state(state_path) as state:
+        # 시작 기록 없이 바로 완료해도 저장경로/마지막수집이 남음
+        state.mark_done('1', 'data/article_1.json#3', summary_hash='abc')
+        row = state.get('1')
+    assert row['상태'] == DONE
+    assert row['저장경로'] == 'data/article_1.json#3'
+    assert row['요약해시'] == 'abc'
+    assert row['마지막수집'] is not None
+
+# ===== 증분 수집 =====
+
+def crawl(state, item):
+    state.mark_started(item['매물ID'])
+    state.mark_done(item['매물ID'], f"data/article_{item['매물ID']}.json", summary_hash=snippet_hash(item))
+
+def test_unchanged_snippet_skipped(state_path):
+    with open_state(state_path) as state:
+        crawl(state, url_info('1'))
+        # 공백만 다른 요약은 같은 것으로 봄
+        targets, plan = state.plan_incremental([url_info('1', '아파트  84㎡ 12층\n남향')])
+    assert targets == []
+    assert plan['동일'] == 1
+
+def test_changed_snippet_refetched(state_path):
+    with open_state(state_path) as state:
+        crawl(state, url_info('1'))
+        crawl(state, url_info('2'))
+        targets, plan = state.plan_incremental([url_info('1', '아파트 84㎡ 12층 남향 가격조정'), url_info('2'),
+                                                url_info('3')])
+    assert [t['매물ID'] for t in targets] == ['1', '3']
+    assert (plan['변경'], plan['동일'], plan['신규']) == (1, 1, 1)
+
+def test_relisted_article_refetched(state_path):
+    with open_state(state_path) as state:
+        crawl(state, url_info('1'))
+        crawl(state, url_info('2'))
+        _, plan = state.plan_incremental([url_info('2')])
+        assert plan[DELISTED] == 1
+        assert state.get('1')['상태'] == DELISTED
+
+        targets, plan = state.plan_incremental([url_info('1'), url_info('2')])
+    assert [t['매물ID'] for t in targets] == ['1']
+    assert plan['신규'] == 1
+
+def test_attempts_reset_after_success(state_path):
+    with open_state(state_path) as state:
+        for _ in range(MAX_ATTEMPTS):
+            crawl(state, url_info('1'))
+        assert state.get('1')['시도'] == 0
+        state.mark_started('1')
+        state.mark_failed('1', 'timeout')
+        # 성공을 여러 번 한 뒤 한 번 실패 → 실패한도가 아니라 재시도
+        targets, plan = state.plan_incremental([url_info('1')])
+        assert [t['매물ID'] for t in targets] == ['1']
+        assert plan['재시도'] == 1
+        assert state.pending([url_info('1')])[1]['실패한도'] == 0
+
+def test_attempts_reset_when_relisted(state_path):
+    with open_state(state_path) as state:
+        for _ in range(MAX_ATTEMPTS):
+            state.mark_started('1')
+            state.mark_failed('1', 'timeout')
+        state.plan_incremental([])
+        targets, plan = state.plan_incremental([url_info('1')])
+        assert [t['매물ID'] for t in targets] == ['1']
+        assert state.get('1')['시도'] == 0
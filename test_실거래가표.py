@@ -0,0 +1,65 @@
+"""
+실거래가 표 행 → 거래 확인 (python -m pytest test_실거래가표.py)
+- 행 픽스처: 테스트픽스처/실거래가표_행.json (실거래가.extract_trade_rows 가 읽는 셀 목록 형식)
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from 필드추출 import parse_trade_rows
+
+FIXTURE = json.loads((Path(__file__).parent / '테스트픽스처' / '실거래가표_행.json').read_text(encoding='utf-8'))
+
+def parse(tab_name):
+    return parse_trade_rows(FIXTURE[tab_name], tab_name, FIXTURE['수집시간'])
+
+def test_sale_rows():
+    rows = parse('매매')
+    assert [(r['계약일'], r['층'], r['가격_만원']) for r in rows] == [
+        ('2025-11-03', 2, 59500),
+        ('2025-10-30', 4, 60000),
+        ('2025-08-25', 18, 62000),
+        ('2024-12-20', -1, 48000),
+        ('2024-12-05', None, 51000),
+    ]
+
+def test_area_and_remark_cells():
+    rows = {r['계약일']: r for r in parse('매매')}
+    # 가격 앞의 면적 셀은 가격으로 보지 않음
+    assert rows['2025-10-30']['가격'] == '6억'
+    assert rows['2025-08-25']['비고'] == '직거래'
+
+def test_duplicate_header_and_malformed_rows_skipped():
+    dates = [r['계약일'] for r in parse('매매')]
+    assert dates.count('2025-08-25') == 1
+    # 머리글, 잘못된 날짜(13.45.), 가격 없는 행, 빈 셀만 있는 행
+    assert len(dates) == 5
+
+def test_jeonse_rows():
+    rows = parse('전세')
+    assert [(r['계약일'], r['층'], r['가격'], r['가격_만원']) for r in rows] == [
+        ('2025-10-02', 7, '3억 5,000', 35000),
+        ('2025-09-15', 11, '3억', 30000),
+        ('2025-09-01', None, '3억 2,000', 32000),
+    ]
+    assert all('월세_만원' not in r for r in rows)
+
+def test_monthly_rent_split():
+    rows = parse('월세')
+    assert [(r['가격'], r['가격_만원'], r['월세_만원']) for r in rows] == [
+        ('5,000/120', 5000, 120),
+        ('1억/80', 10000, 80),
+    ]
+
+@pytest.mark.parametrize('cells, expected', [
+    (['10.02.', '7층', '3억'], '2025-10-02'),
+    (['12.20.', '7층', '3억'], '2024-12-20'),
+])
+def test_year_from_collected_time(cells, expected):
+    # 'YYYY년' 행이 없으면 수집일(2025-11-18)보다 뒤의 월/일은 전년도
+    assert parse_trade_rows([cells], '매매', FIXTURE['수집시간'])[0]['계약일'] == expected
+
+@pytest.mark.parametrize('rows', [[], [[]], [['', None]], [['3층', '5억']], [['11.03.', '2층', '가격문의']]])
+def test_empty_or_malformed_cells(rows):
+    assert parse_trade_rows(rows, '매매', FIXTURE['수집시간']) == []
@@ -0,0 +1,104 @@
+"""
+출력 저장 확인 (python -m pytest test_출력저장소.py)
+- jsonl 샤드 왕복 / 끝이 잘린 샤드 (gzip, zstd), 묶음마다 콜백, parquet 일지 복구
+"""
+import gzip
+import json
+
+import pytest
+
+from 출력저장소 import JsonlShardSink, ParquetSink, iter_records, output_files
+
+def article(idx):
+    return {'메타정보': {'매물ID': str(idx), 'URL': f'https://fin.land.naver.com/articles/{idx}'},
+            '기본정보': {'매물명': f'테스트아파트 {idx}동', '층': f'{idx % 20}/20'}}
+
+def write_jsonl(folder, count, codec, shard_size=1000, batch_size=20):
+    saved = []
+    with JsonlShardSink(folder, shard_size=shard_size, batch_size=batch_size, codec=codec, fsync=False) as sink:
+        for idx in range(count):
+            sink.write(article(idx), on_saved=saved.append)
+    return saved
+
+def ids(records):
+    return [r['메타정보']['매물ID'] for r in records]
+
+@pytest.fixture(params=['gz', 'zst'])
+def codec(request):
+    if request.param == 'zst':
+        pytest.importorskip('zstandard')
+    return request.param
+
+def test_jsonl_round_trip(tmp_path, codec):
+    saved = write_jsonl(tmp_path, 45, codec, shard_size=30)
+    assert len(output_files(tmp_path)) == 2
+    assert ids(iter_records(tmp_path)) == [str(i) for i in range(45)]
+    assert saved[0].endswith(f'_0001.jsonl.{codec}#1')
+    assert saved[-1].endswith(f'_0002.jsonl.{codec}#15')
+
+def test_jsonl_callbacks_after_flush(tmp_path):
+    saved = []
+    sink = JsonlShardSink(tmp_path, batch_size=20, flush_interval=3600, codec='gz', fsync=False)
+    for idx in range(25):
+        sink.write(article(idx), on_saved=saved.append)
+    # 첫 묶음만 디스크에 씀 → 나머지 5개는 아직 완료 표시 없음
+    assert len(saved) == 20
+    sink.close()
+    assert len(saved) == 25
+
+@pytest.mark.parametrize('cut', [1, 7, 40])
+def test_jsonl_truncated_shard(tmp_path, codec, cut):
+    write_jsonl(tmp_path, 60, codec)
+    shard, = output_files(tmp_path)
+    data = shard.read_bytes()
+    # 마지막 묶음을 쓰다가 죽은 것처럼 끝을 자름
+    shard.write_bytes(data[:-cut])
+
+    records = ids(iter_records(tmp_path))
+    assert records == [str(i) for i in range(len(records))]
+    # 잘린 묶음 앞까지는 항상 읽힘 (gzip 꼬리만 잘리면 전부)
+    assert 40 <= len(records) <= 60
+
+def test_jsonl_truncated_inside_first_batch(tmp_path, codec):
+    write_jsonl(tmp_path, 20, codec)
+    shard, = output_files(tmp_path)
+    shard.write_bytes(shard.read_bytes()[:10])
+    assert list(iter_records(tmp_path)) == []
+
+def write_journal(folder, count, cut=0):
+    """죽은 프로세스(없는 pid)가 남긴 parquet 일지"""
+    journal = folder / 'article_20251118_045931_99999999_0001.parquet.part.jsonl.gz'
+    data = b''.join(gzip.compress(''.join(json.dumps(article(idx), ensure_ascii=False) + '\n'
+                                          for idx in range(start, min(start + 20, count))).encode('utf-8'))
+                    for start in range(0, count, 20))
+    journal.write_bytes(data[:len(data) - cut])
+    return journal
+
+def test_parquet_journal_read_before_recovery(tmp_path):
+    write_journal(tmp_path, 50, cut=3)
+    records = ids(iter_records(tmp_path))
+    assert records == [str(i) for i in range(len(records))]
+    assert len(records) >= 40
+
+def test_parquet_callbacks_per_batch(tmp_path):
+    pytest.importorskip('pyarrow')
+    saved = []
+    sink = ParquetSink(tmp_path, shard_size=1000, batch_size=20, fsync=False)
+    for idx in range(45):
+        sink.write(article(idx), on_saved=saved.append)
+    # 묶음(row group)마다 일지 fsync → 콜백, 일지로 이미 읽힘
+    assert len(saved) == 40
+    assert ids(iter_records(tmp_path)) == [str(i) for i in range(40)]
+    sink.close()
+    assert len(saved) == 45
+    assert [p.suffix for p in output_files(tmp_path)] == ['.parquet']
+    assert ids(iter_records(tmp_path)) == [str(i) for i in range(45)]
+
+def test_parquet_journal_recovered(tmp_path):
+    pytest.importorskip('pyarrow')
+    journal = write_journal(tmp_path, 50)
+    ParquetSink(tmp_path).close()
+    assert not journal.exists()
+    shard, = output_files(tmp_path)
+    assert shard.name == 'article_20251118_045931_99999999_0001.parquet'
+    assert ids(iter_records(tmp_path)) == [str(i) for i in range(50)]
@@ -5,14 +5,30 @@
 - 동적 크롤링 순서 명확화
 - 이미지 수집 기능 추가
 """
+import argparse
 import asyncio
 import json
 import base64
-from playwright.async_api import async_playwright
 from datetime import datetime
 import re
 import random
 import os
+import time
+from 페이지도구 import (click_button_with_text, print_click_stats, print_wait_stats, text_signature,
+                       wait_for_change, wait_for_section)
+from 브라우저풀 import BrowserPool, ThroughputMeter, run_worker_pool
+from 요청제한 import HostRateLimiter
+from 이미지수집 import save_images, print_image_stats
+from 응답수집 import API_PATHS, ResponseCapture, finish_capture
+from 원문보관 import SnapshotArchive, finish_snapshot, new_snapshot
+from 파싱풀 import ParsePool, parse_snapshot
+from 수집상태 import open_state, snippet_hash
+from 단지캐시 import complex_sections, has_coordinates, open_complex_cache
+from 실거래가 import extract_trade_rows
+from 단계계측 import StageLaps, print_stage_profile, timed, write_stage_profile
+from 위치좌표 import coordinate_keys, find_coordinates, print_coordinate_stats
+from 필드추출 import extract_field
+from 출력저장소 import OUTPUT_KINDS, open_sink
 
 # User-Agent 목록
 USER_AGENTS = [
@@ -27,6 +43,7 @@ async def random_sleep(min_sec=1, max_sec=3):
     """랜덤 대기"""
     await asyncio.sleep(random.uniform(min_sec, max_sec))
 
+@timed('human_like_scroll')
 async def human_like_scroll(page):
     """사람처럼 스크롤"""
     scroll_steps = random.randint(3, 5)
@@ -42,225 +59,57 @@ async def human_like_scroll(page):
     await page.evaluate("window.scrollTo(0, 0)")
     await random_sleep(0.8, 1.5)
 
-async def click_button_with_text(page, text_keywords, description="버튼"):
-    """텍스트로 버튼 찾아서 클릭"""
-    try:
-        buttons = await page.query_selector_all('button, a')
-        for btn in buttons:
-            try:
-                btn_text = await btn.inner_text()
-                if any(keyword in btn_text for keyword in text_keywords):
-                    is_visible = await btn.is_visible()
-                    if not is_visible:
-                        continue
-                    
-                    box = await btn.bounding_box()
-                    if box:
-                        await page.evaluate(f"window.scrollTo(0, {box['y'] - 200})")
-                        await random_sleep(0.3, 0.6)
-                        await page.mouse.move(
-                            box['x'] + box['width'] / 2,
-                            box['y'] + box['height'] / 2
-                        )
-                        await random_sleep(0.2, 0.4)
-                    
-                    await btn.click()
-                    await random_sleep(1, 2)
-                    print(f"     ✓ {description} 클릭 완료")
-                    return True
-            except:
-                continue
-        
-        print(f"     ℹ {description} 없음")
-        return False
-    except Exception as e:
-        print(f"     ℹ {description} 처리 실패: {e}")
-        return False
-
-async def save_images(page, article_id):
-    """매물 이미지 수집 및 파일로 저장 (개선 버전)"""
-    images_data = []
-    
-    # 이미지 저장 폴더 생성
-    image_folder = f'images_{article_id}'
-    if not os.path.exists(image_folder):
-        os.makedirs(image_folder)
-    
-    try:
-        print("     → 페이지 상단으로 스크롤...")
-        await page.evaluate("window.scrollTo(0, 0)")
-        await random_sleep(1, 2)
-        
-        # 방법 1: 페이지 상단의 큰 이미지들 수집 (메인 이미지 갤러리)
-        print("     → 메인 이미지 찾는 중...")
-        all_images = await page.query_selector_all('img')
-        
-        collected_urls = set()
-        saved_count = 0
-        
-        for img in all_images:
-            try:
-                # 이미지가 보이는지 확인
-                is_visible = await img.is_visible()
-                if not is_visible:
-                    continue
-                
-                img_box = await img.bounding_box()
-                # 큰 이미지만 수집 (최소 300x300)
-                if not img_box or img_box['width'] < 300 or img_box['height'] < 300:
-                    continue
-                
-                # 페이지 상단 영역의 이미지만 (Y 좌표 < 1500)
-                if img_box['y'] > 1500:
-                    continue
-                
-                src = await img.get_attribute('src')
-                
-                # 유효한 이미지 URL인지 확인
-                if not src or 'http' not in src:
-                    continue
-                
-                # 이미 수집한 URL은 스킵
-                if src in collected_urls:
-                    continue
-                
-                # 네이버 부동산 이미지인지 확인
-                if 'phinf' in src or 'land.naver' in src or 'naver.net' in src:
-                    saved_count += 1
-                    success = await download_and_save_image(page, src, image_folder, saved_count, images_data, img_box)
-                    if success:
-                        collected_urls.add(src)
-                        print(f"     ✓ {saved_count}번째 이미지 발견 ({int(img_box['width'])}x{int(img_box['height'])})")
-                    
-                    # 최대 10개까지만 수집
-                    if saved_count >= 10:
-                        break
-            
-            except Exception as e:
-                continue
-        
-        # 방법 2: 이미지가 없으면 페이지 소스에서 이미지 URL 추출
-        if len(images_data) == 0:
-            print("     → 페이지 소스에서 이미지 URL 추출 시도...")
-            page_content = await page.content()
-            
-            # 이미지 URL 패턴 찾기
-            image_url_patterns = [
-                r'https://[^"\']+phinf[^"\']+\.(?:jpg|jpeg|png|webp)',
-                r'https://[^"\']+land\.naver[^"\']+\.(?:jpg|jpeg|png|webp)',
-                r'https://[^"\']+naver\.net[^"\']+\.(?:jpg|jpeg|png|webp)'
-            ]
-            
-            for pattern in image_url_patterns:
-                urls = re.findall(pattern, page_content)
-                for url in urls:
-                    if url not in collected_urls:
-                        saved_count += 1
-                        # 임시 박스 정보
-                        temp_box = {'width': 800, 'height': 600}
-                        success = await download_and_save_image(page, url, image_folder, saved_count, images_data, temp_box)
-                        if success:
-                            collected_urls.add(url)
-                            print(f"     ✓ {saved_count}번째 이미지 URL 추출")
-                        
-                        if saved_count >= 10:
-                            break
-                
-                if saved_count >= 10:
-                    break
-        
-        print(f"     ✓ 총 {len(images_data)}개 이미지 파일 저장 완료")
-        return images_data
-    
-    except Exception as e:
-        print(f"     ℹ 이미지 수집 실패: {e}")
-        import traceback
-        traceback.print_exc()
-        return images_data
-
-
-
-async def download_and_save_image(page, src, image_folder, idx, images_data, img_box):
-    """이미지 다운로드 및 저장"""
-    try:
-        # URL 정리 (쿼리 파라미터 제거하지 않음)
-        clean_url = src.strip()
-        
-        response = await page.request.get(clean_url)
-        if response.ok:
-            image_data = await response.body()
-            
-            # 파일 크기 확인 (최소 3KB)
-            if len(image_data) < 3000:
-                return False
-            
-            # 파일 확장자 추출
-            ext = 'jpg'
-            if '.png' in src.lower():
-                ext = 'png'
-            elif '.jpeg' in src.lower() or '.jpg' in src.lower():
-                ext = 'jpg'
-            elif '.webp' in src.lower():
-                ext = 'webp'
-            elif '.gif' in src.lower():
-                ext = 'gif'
-            
-            # 파일 저장
-            filename = f'{image_folder}/image_{idx}.{ext}'
-            with open(filename, 'wb') as f:
-                f.write(image_data)
-            
-            images_data.append({
-                '순서': idx,
-                'URL': src,
-                '파일경로': filename,
-                '파일크기_bytes': len(image_data),
-                '이미지크기': f"{int(img_box['width'])}x{int(img_box['height'])}",
-                '수집시간': datetime.now().isoformat()
-            })
-            
-            return True
-    
-    except Exception as e:
-        # 에러 무시하고 계속 진행
-        return False
-
-async def crawl_article(url):
-    """매물 상세 페이지 크롤링"""
-    
-    user_agent = random.choice(USER_AGENTS)
-    
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=False,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-            ]
-        )
-        
-        context = await browser.new_context(
-            viewport={'width': random.randint(1366, 1920), 'height': random.randint(768, 1080)},
-            user_agent=user_agent,
-            locale='ko-KR',
-            timezone_id='Asia/Seoul',
-        )
-        
-        await context.set_extra_http_headers({
+def create_browser_pool(size=1, limiter=None, block_profile=None, headless=False):
+    """크롤러용 브라우저 풀 생성 (headless: 벤치마크 등 화면 없이 실행)"""
+    return BrowserPool(
+        USER_AGENTS,
+        size=size,
+        headless=headless,
+        limiter=limiter,
+        block_profile=block_profile,
+        launch_args=[
+            '--disable-blink-features=AutomationControlled',
+            '--disable-dev-shm-usage',
+            '--no-sandbox',
+        ],
+        extra_headers={
             'Accept-Language': 'ko-KR,ko;q=0.9',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        })
-        
-        page = await context.new_page()
-        
+        },
         # 자동화 감지 우회
-        await page.add_init_script("""
+        init_script="""
             Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
             window.chrome = {runtime: {}, loadTimes: function() {}, csi: function() {}};
             Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
             Object.defineProperty(navigator, 'languages', {get: () => ['ko-KR', 'ko']});
-        """)
+        """,
+    )
+
+async def crawl_article(url, pool, capture_api=False, response_folder=None, archive=None, parse_pool=None,
+                        complex_id=None, complex_cache=None, image_folder=''):
+    """
+    매물 상세 페이지 크롤링 (브라우저 풀에서 페이지 대여)
+    - 브라우저 단계에서는 원문만 모으고, 필드 파싱은 마지막에 한 번 (parse_pool이 있으면 프로세스 풀)
+    - capture_api: 페이지 JSON 응답 값을 정규식 결과보다 우선 사용
+    - response_folder: 수집한 응답을 픽스처로 저장
+    - image_folder: 이미지 저장 경로 (images_{매물ID} 폴더와 _store 저장소가 이 아래)
+    - archive: 원문 보관 파일 (원문보관.SnapshotArchive, 오프라인 재처리용)
+    - complex_cache/complex_id: 단지 캐시 (단지캐시.ComplexCache), 캐시에 좌표가 있으면 위치좌표 단계 생략
+      (단지 캐시가 없어도 좌표 캐시를 단지ID/주소로 먼저 조회)
+      같은 단지를 다른 워커가 수집하는 중이면 그 매물이 캐시에 저장할 때까지 기다림
+    """
+    article_started = time.perf_counter()
+    laps = StageLaps('매물 ', total='매물 전체')
+    laps.lap('페이지 대여')
+    coordinate_task = None
+    claimed = False
+    
+    async with pool.lease() as lease:
+        page = lease.page
+        user_agent = lease.user_agent
+        
+        # 페이지 JSON 응답 수집 (--capture-api)
+        capture = ResponseCapture(page, url_keywords=API_PATHS).start() if capture_api or response_folder else None
         
         try:
             print(f"\n{'='*80}")
@@ -279,6 +128,7 @@ async def crawl_article(url):
                 '메타정보': {
                     '매물ID': article_id,
                     'URL': url,
+                    '단지ID': complex_id,
                     '수집시간': datetime.now().isoformat(),
                     'User-Agent': user_agent
                 },
@@ -306,33 +156,46 @@ async def crawl_article(url):
                 '관리비': {},
                 '주변대중교통': {}
             }
+            # 읽은 원문 (--archive 이면 보관)
+            snapshot = new_snapshot(result['메타정보'], detect_options=True)
+            # 단지 캐시 (같은 단지에서 먼저 수집한 단지정보/개발예정/주변대중교통)
+            laps.lap('단지 캐시 조회')
+            cached = None
+            if complex_cache is not None and complex_id:
+                cached = await complex_cache.claim(complex_id)
+                claimed = cached is None
+            if cached is not None:
+                snapshot['단지캐시'] = cached
             
             # 1. 페이지 로드
+            laps.lap('1. 페이지 로드')
             print("1. 페이지 로딩...")
-            await page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            await random_sleep(2, 4)
+            await lease.goto(url, wait_until='domcontentloaded', timeout=60000)
+            await wait_for_section(page, '기본정보')
             print("   ✓ 완료\n")
             
             # 2. 스크롤
+            laps.lap('2. 스크롤')
             print("2. 콘텐츠 로딩...")
             await human_like_scroll(page)
             print("   ✓ 완료\n")
 
             # 3. 동적 크롤링 1단계: 소개말 더보기
+            laps.lap('3. 소개말 더보기')
             print("3. 소개말 더보기 클릭...")
+            # 소개말이 펼쳐질 때까지는 click_button_with_text가 대기
             intro_clicked = await click_button_with_text(page, ['소개말 더보기', '소개말더보기'], "소개말 더보기")
-            if intro_clicked:
-                await random_sleep(1, 2)  # 소개말 로딩 대기
             print()
             
             # 4. 동적 크롤링 2단계: 관리비 상세보기
+            laps.lap('4. 관리비 상세보기')
             print("4. 관리비 상세보기 클릭...")
             mgmt_clicked = await click_button_with_text(page, ['관리비', '상세보기'], "관리비 상세보기")
             
             # 관리비 상세 데이터 수집
             mgmt_detail_text = ""
             if mgmt_clicked:
-                await random_sleep(1, 1.5)
+                await wait_for_section(page, '관리비 팝업', timeout=3000)
                 # 관리비 상세 데이터 수집
                 mgmt_detail_text = await page.evaluate("() => document.body.innerText")
                 print("     ✓ 관리비 상세 데이터 수집 완료")
@@ -341,583 +204,55 @@ async def crawl_article(url):
                 close_clicked = await click_button_with_text(page, ['닫기', '닫기'], "관리비 닫기")
                 if not close_clicked:
                     # ESC 키로 닫기 시도
+                    signature = await text_signature(page)
                     await page.keyboard.press('Escape')
-                    await random_sleep(0.5, 1)
+                    await wait_for_change(page, signature, "관리비 팝업 닫힘")
                     print("     ✓ ESC로 닫기 완료")
             print()
             
-            # 5. 페이지 텍스트 수집 (소개말 더보기 클릭 후)
-            print("5. 기본 데이터 추출...")
-            page_text = await page.evaluate("() => document.body.innerText")
-            
-            # === 매물정보 추출 ===
-            # 기본정보에서 이미 수집된 데이터 활용
-            if '공급면적_제곱미터' in result['기본정보']:
-                result['매물정보']['공급면적_제곱미터'] = result['기본정보']['공급면적_제곱미터']
-            if '전용면적_제곱미터' in result['기본정보']:
-                result['매물정보']['전용면적_제곱미터'] = result['기본정보']['전용면적_제곱미터']
-            if '해당층' in result['기본정보']:
-                result['매물정보']['해당층'] = result['기본정보']['해당층']
-            if '총층수' in result['기본정보']:
-                result['매물정보']['총층수'] = result['기본정보']['총층수']
-            if '향' in result['기본정보']:
-                result['매물정보']['향'] = result['기본정보']['향']
-            
-            # 집주인확인매물
-            if '집주인확인매물' in page_text:
-                result['매물정보']['집주인확인매물'] = True
-                owner_match = re.search(r'집주인확인매물\s*(\d{4})\.\s*(\d{1,2})\.\s*(\d{1,2})\.', page_text)
-                if owner_match:
-                    result['매물정보']['집주인확인일'] = f"{owner_match.group(1)}-{owner_match.group(2).zfill(2)}-{owner_match.group(3).zfill(2)}"
-            
-            # === 대출정보 추출 ===
-            # 대출한도
-            ltv_match = re.search(r'(투기과열|조정대상|비규제)[,\s]*LTV\s*(\d+)%', page_text)
-            if ltv_match:
-                result['대출정보']['대출한도']['규제지역'] = ltv_match.group(1)
-                result['대출정보']['대출한도']['LTV_퍼센트'] = int(ltv_match.group(2))
-            
-            loan_amount_match = re.search(r'최대\s+([\d억,\s]+만?원)', page_text)
-            if loan_amount_match:
-                result['대출정보']['대출한도']['최대금액'] = loan_amount_match.group(1).strip()
-            
-            # 금리정보
-            bank_pattern = re.compile(r'([가-힣A-Z]+(?:은행|생명|저축은행))\s*([\d.]+%~[\d.]+%|[\d.]+%)')
-            for match in bank_pattern.finditer(page_text):
-                result['대출정보']['금리정보'].append({
-                    '은행명': match.group(1),
-                    '금리범위': match.group(2)
-                })
-            
-            # === 매물분포 추출 ===
-            dist_match = re.search(r'가격분포\s*매매\s*([\d억,\s~]+)', page_text)
-            if dist_match:
-                result['매물분포']['가격범위'] = dist_match.group(1).strip()
-            
-            count_match = re.search(r'매물수\s*(\d+)개', page_text)
-            if count_match:
-                result['매물분포']['총매물수'] = int(count_match.group(1))
-            
-            # === 대출계산기 추출 ===
-            calc_loan_match = re.search(r'대출 금액\s*최대\s*([\d억,\s]+만?원)', page_text)
-            if calc_loan_match:
-                result['대출계산기']['대출금액'] = calc_loan_match.group(1).strip()
-            
-            kb_match = re.search(r'KB시세\s+([\d억,\s]+만?원)', page_text)
-            if kb_match:
-                result['대출계산기']['KB시세'] = kb_match.group(1).strip()
-            
-            period_match = re.search(r'대출 기간\s*최대\s*(\d+)년', page_text)
-            if period_match:
-                result['대출계산기']['대출기간_년'] = int(period_match.group(1))
-            
-            if '원리금균등' in page_text:
-                result['대출계산기']['상환방법'] = ['원리금균등', '원금균등']
-            
-            lowest_rate_match = re.search(r'최저 금리[^\n]*?([가-힣]+(?:은행|생명))\s*([\d.]+%)', page_text)
-            if lowest_rate_match:
-                result['대출계산기']['최저금리_은행'] = lowest_rate_match.group(1)
-                result['대출계산기']['최저금리'] = lowest_rate_match.group(2)
-            
-            monthly_match = re.search(r'예상 월 원리금\s*([\d,]+)원', page_text)
-            if monthly_match:
-                result['대출계산기']['예상월원리금_원'] = int(monthly_match.group(1).replace(',', ''))
-            
-            # === 기본정보 추출 ===
-            # 매매가
-            sale_price_match = re.search(r'매매가\s*([\d억,\s]+만?원)', page_text)
-            if sale_price_match:
-                result['기본정보']['매매가'] = sale_price_match.group(1).strip()
-            
-            # 관리비부과기준
-            mgmt_basis_match = re.search(r'관리비부과기준\s*([^\n]+)', page_text)
-            if mgmt_basis_match:
-                result['기본정보']['관리비부과기준'] = mgmt_basis_match.group(1).strip()
-            
-            # 관리비 (기본)
-            mgmt_fee_match = re.search(r'관리비\s*(\d+)만원', page_text)
-            if mgmt_fee_match:
-                result['기본정보']['관리비_만원'] = int(mgmt_fee_match.group(1))
-            
-            # 관리비 상세 (상세보기 클릭 후)
-            mgmt_detail_match = re.search(r'관리비 합계\s*([\d,]+)원', page_text)
-            if mgmt_detail_match:
-                result['기본정보']['관리비합계_원'] = int(mgmt_detail_match.group(1).replace(',', ''))
-            
-            # 포함 항목
-            include_match = re.search(r'포함 항목\(사용료\)\s*:\s*([^\n]+)', page_text)
-            if include_match:
-                result['기본정보']['관리비포함항목'] = include_match.group(1).strip()
-            
-            # 관리비 기준
-            mgmt_standard_match = re.search(r'관리비 기준\s*:\s*([^\n]+)', page_text)
-            if mgmt_standard_match:
-                result['기본정보']['관리비기준'] = mgmt_standard_match.group(1).strip()
-            
-            # 공급/전용면적
-            supply_match = re.search(r'공급면적\s*([\d.]+)㎡', page_text)
-            if supply_match:
-                result['기본정보']['공급면적_제곱미터'] = float(supply_match.group(1))
-            
-            exclusive_match = re.search(r'전용면적\s*([\d.]+)㎡\s*\(전용률\s*(\d+)%\)', page_text)
-            if exclusive_match:
-                result['기본정보']['전용면적_제곱미터'] = float(exclusive_match.group(1))
-                result['기본정보']['전용률_퍼센트'] = int(exclusive_match.group(2))
-            
-            # 층
-            floor_match = re.search(r'층\s*(\d+)층/\s*총\s*(\d+)층', page_text)
-            if floor_match:
-                result['기본정보']['해당층'] = int(floor_match.group(1))
-                result['기본정보']['총층수'] = int(floor_match.group(2))
-            
-            # 방수/욕실수
-            room_match = re.search(r'방수/욕실수\s*(\d+)/(\d+)개', page_text)
-            if room_match:
-                result['기본정보']['방수'] = int(room_match.group(1))
-                result['기본정보']['욕실수'] = int(room_match.group(2))
-            
-            # 향
-            direction_match = re.search(r'향\s*\(거실 기준\)\s*([^\n]+)', page_text)
-            if direction_match:
-                result['기본정보']['향'] = direction_match.group(1).strip()
-            
-            # 복층여부
-            duplex_match = re.search(r'복층여부\s*([^\n]+)', page_text)
-            if duplex_match:
-                result['기본정보']['복층여부'] = duplex_match.group(1).strip()
-            
-            # 입주가능일
-            movein_match = re.search(r'입주가능일\s*([^\n]+)', page_text)
-            if movein_match:
-                result['기본정보']['입주가능일'] = movein_match.group(1).strip()
-            
-            # 매물번호
-            article_no_match = re.search(r'매물번호\s*([0-9-]+)', page_text)
-            if article_no_match:
-                result['기본정보']['매물번호'] = article_no_match.group(1)
-            
-            # 매물소개 (소개말 더보기 클릭 후 전체 내용)
-            intro_match = re.search(r'매물소개\s*\n((?:(?!최초게재|허위|단지 정보|로딩중).)+)', page_text, re.DOTALL)
-            if intro_match:
-                intro_text = intro_match.group(1).strip()
-                # 불필요한 부분 제거
-                intro_text = re.sub(r'\d+ 번째.*', '', intro_text)
-                intro_text = re.sub(r'선택됨.*', '', intro_text)
-                intro_lines = [line.strip() for line in intro_text.split('\n') if line.strip() and len(line.strip()) > 5]
-                result['기본정보']['매물소개'] = '\n'.join(intro_lines)
-            
-            # 최초게재일
-            first_post_match = re.search(r'(\d{4})\.\s*(\d{1,2})\.\s*(\d{1,2})\.\s*최초게재([가-힣]+)\s*제공', page_text)
-            if first_post_match:
-                result['기본정보']['최초게재일'] = f"{first_post_match.group(1)}-{first_post_match.group(2).zfill(2)}-{first_post_match.group(3).zfill(2)}"
-                result['기본정보']['제공업체'] = first_post_match.group(4)
-            
-            # === 시설정보 추출 ===
-            # 기본 시설 목록
-            facilities = {
-                '벽걸이에어컨': ['벽걸이에어컨', '벽걸이 에어컨', '에어컨'],
-                '신발장': ['신발장'],
-                '냉장고': ['냉장고'],
-                '세탁기': ['세탁기'],
-                '싱크대': ['싱크대'],
-                '인덕션': ['인덕션'],
-                '레인지': ['레인지', '가스레인지'],
-                '엘리베이터': ['엘리베이터', 'EV']
-            }
-            
-            # 기본 시설 체크
-            for facility_key, keywords in facilities.items():
-                for keyword in keywords:
-                    if keyword in page_text:
-                        result['시설정보'][facility_key] = True
-                        break
-                else:
-                    result['시설정보'][facility_key] = False
-            
-            # 추가 시설 자동 감지 (옵션/시설 섹션에서)
-            # "옵션" 또는 "시설" 키워드 근처의 텍스트에서 추가 항목 찾기
-            option_patterns = [
-                r'옵션[^\n]*?([가-힣]+(?:장|기|대|기기|시설))',
-                r'시설[^\n]*?([가-힣]+(?:장|기|대|기기|시설))',
-                r'포함[^\n]*?([가-힣]+(?:장|기|대|기기|시설))'
-            ]
-            
-            additional_facilities = set()
-            for pattern in option_patterns:
-                matches = re.finditer(pattern, page_text)
-                for match in matches:
-                    facility_name = match.group(1).strip()
-                    # 이미 있는 시설이 아니고, 2글자 이상인 경우만
-                    if facility_name not in facilities and len(facility_name) >= 2:
-                        additional_facilities.add(facility_name)
-            
-            # 추가 시설을 시설정보에 추가
-            for facility in additional_facilities:
-                if facility in page_text:
-                    result['시설정보'][facility] = True
-            
-            print("   ✓ 완료\n")
-            
-            # 6. 이미지 수집
-            print("6. 이미지 수집...")
-            result['기본정보']['이미지'] = await save_images(page, article_id)
+            # 5. 페이지 텍스트 수집 (소개말 더보기 클릭 후, 파싱은 마지막에 한 번)
+            laps.lap('5. 페이지 텍스트 수집')
+            print("5. 본문 텍스트 수집...")
+            snapshot['본문'] = await page.evaluate("() => document.body.innerText")
+            snapshot['관리비'] = mgmt_detail_text
+            print(f"   ✓ 완료 ({len(snapshot['본문']):,}자)\n")
+            
+            # 6. 위치좌표 수집 시작 (단지 캐시 → 좌표 캐시 → near 페이지 소스)
+            laps.lap('6. 위치좌표 수집 시작')
+            # 캐시에 없으면 같은 컨텍스트의 별도 요청/탭에서 진행 → 매물 페이지의 이미지/실거래가 단계와 동시에
+            print("6. 위치좌표 수집 시작...")
+            if cached is not None and has_coordinates(cached):
+                result['단지정보']['위도'] = cached['단지정보']['위도']
+                result['단지정보']['경도'] = cached['단지정보']['경도']
+                print(f"     ✓ 단지 캐시 사용 (단지ID {complex_id}): {result['단지정보']['위도']}, {result['단지정보']['경도']}")
+            else:
+                keys = coordinate_keys(complex_id, extract_field(snapshot['본문'], '단지정보.위치'))
+                coordinate_task = asyncio.ensure_future(find_coordinates(lease, article_id, keys, complex_cache))
+                print("     → 별도 작업으로 진행 (파싱 전에 결과 합침)")
             print()
-
-            # === 단지정보 추출 ===
-            print("7. 단지정보 추출...")
-            
-            # 위치
-            location_match = re.search(r'위치\s*([가-힣]+시\s+[가-힣]+구\s+[가-힣]+동\s+[\d-]+)', page_text)
-            if location_match:
-                result['단지정보']['위치'] = location_match.group(1).strip()
-            
-            # 위치좌표 추출 (모바일 페이지 → 로드뷰 버튼 클릭)
-            try:
-                print("     → 위치좌표 수집 중...")
-                
-                # 1. 모바일 near 페이지로 이동
-                near_url = f"https://m.land.naver.com/near/article/{article_id}"
-                print(f"     → 모바일 페이지 이동: {near_url}")
-                
-                await page.goto(near_url, wait_until='networkidle', timeout=30000)
-                await random_sleep(3, 4)
-                
-                # 2. 로드뷰 버튼 찾기 (button.btn_control._btn_roadview)
-                print("     → 로드뷰 버튼 찾는 중...")
-                
-                coord_found = False
-                
-                # 로드뷰 버튼 선택자들
-                roadview_selectors = [
-                    'button.btn_control._btn_roadview',
-                    'button._btn_roadview',
-                    'button[class*="roadview"]',
-                    'button[class*="btn_control"]',
-                ]
-                
-                for selector in roadview_selectors:
-                    try:
-                        buttons = await page.query_selector_all(selector)
-                        print(f"     → {selector} 버튼 {len(buttons)}개 발견")
-                        
-                        for btn in buttons:
-                            try:
-                                # 버튼이 보이는지 확인
-                                is_visible = await btn.is_visible()
-                                if not is_visible:
-                                    continue
-                                
-                                # 버튼 크기 확인 (40x40)
-                                box = await btn.bounding_box()
-                                if box:
-                                    print(f"     → 버튼 크기: {int(box['width'])}x{int(box['height'])}")
-                                    
-                                    # 40x40 근처 크기의 버튼 찾기
-                                    if 35 <= box['width'] <= 50 and 35 <= box['height'] <= 50:
-                                        print(f"     ✓ 로드뷰 버튼 발견!")
-                                        
-                                        # 버튼 위치로 스크롤
-                                        await page.evaluate(f"window.scrollTo(0, {box['y'] - 200})")
-                                        await random_sleep(0.5, 1)
-                                        
-                                        # 새 창 열림 감지
-                                        try:
-                                            async with page.expect_popup(timeout=5000) as popup_info:
-                                                await btn.click()
-                                                await random_sleep(1, 2)
-                                            
-                                            # 새 창에서 URL 가져오기
-                                            roadview_page = await popup_info.value
-                                            await roadview_page.wait_for_load_state('domcontentloaded')
-                                            await random_sleep(1, 2)
-                                            
-                                            roadview_url = roadview_page.url
-                                            print(f"     ✓ 로드뷰 URL: {roadview_url[:100]}...")
-                                            
-                                            # URL에서 좌표 추출
-                                            lat_match = re.search(r'lat=([0-9.]+)', roadview_url)
-                                            lng_match = re.search(r'lng=([0-9.]+)', roadview_url)
-                                            
-                                            if lat_match and lng_match:
-                                                lat = float(lat_match.group(1))
-                                                lng = float(lng_match.group(1))
-                                                
-                                                # 좌표 유효성 검증
-                                                if 33.0 <= lat <= 39.0 and 124.0 <= lng <= 132.0:
-                                                    result['단지정보']['위도'] = lat
-                                                    result['단지정보']['경도'] = lng
-                                                    print(f"     ✓ 좌표 수집 완료: {lat}, {lng}")
-                                                    coord_found = True
-                                                    
-                                                    # 로드뷰 페이지 닫기
-                                                    await roadview_page.close()
-                                                    break
-                                            
-                                            # 로드뷰 페이지 닫기
-                                            await roadview_page.close()
-                                            
-                                        except Exception as e:
-                                            print(f"     ℹ 팝업 처리 실패: {e}")
-                                            continue
-                            
-                            except Exception as e:
-                                continue
-                        
-                        if coord_found:
-                            break
-                    
-                    except Exception as e:
-                        continue
-                
-                # 3. 버튼 클릭 실패 시 페이지 소스에서 직접 추출
-                if not coord_found:
-                    print("     → 페이지 소스에서 좌표 검색...")
-                    page_content = await page.content()
-                    
-                    # 다양한 패턴으로 검색
-                    patterns = [
-                        r'map\.naver\.com/viewer/panorama[^"\']*lat=([0-9.]+)[^"\']*lng=([0-9.]+)',
-                        r'lat=([0-9.]+)[^"\'&]*lng=([0-9.]+)',
-                        r'"latitude"\s*:\s*([0-9.]+)[^}]{0,200}"longitude"\s*:\s*([0-9.]+)',
-                        r'"lat"\s*:\s*([0-9.]+)[^}]{0,200}"lng"\s*:\s*([0-9.]+)',
-                        r'"y"\s*:\s*([0-9.]+)[^}]{0,200}"x"\s*:\s*([0-9.]+)',
-                    ]
-                    
-                    for pattern in patterns:
-                        matches = re.findall(pattern, page_content)
-                        for match in matches:
-                            try:
-                                lat = float(match[0])
-                                lng = float(match[1])
-                                
-                                # 좌표 유효성 검증
-                                if 33.0 <= lat <= 39.0 and 124.0 <= lng <= 132.0:
-                                    result['단지정보']['위도'] = lat
-                                    result['단지정보']['경도'] = lng
-                                    print(f"     ✓ 좌표 수집 완료: {lat}, {lng}")
-                                    coord_found = True
-                                    break
-                            except:
-                                continue
-                        
-                        if coord_found:
-                            break
-                
-                if not coord_found:
-                    print("     ℹ 좌표 정보를 찾을 수 없음")
-                
-                # 원래 페이지로 돌아가기
-                print("     → 원래 페이지로 복귀...")
-                await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-                await random_sleep(1, 2)
-                    
-            except Exception as e:
-                print(f"     ℹ 좌표 추출 실패: {e}")
-                import traceback
-                traceback.print_exc()
-                # 실패해도 원래 페이지로 돌아가기 시도
-                try:
-                    await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-                    await random_sleep(1, 2)
-                except:
-                    pass
-            
-            # 건축물용도
-            building_match = re.search(r'건축물용도\s*([^\n]+)', page_text)
-            if building_match:
-                result['단지정보']['건축물용도'] = building_match.group(1).strip()
-            
-            # 사용승인일
-            approval_match = re.search(r'사용승인일\s*(\d{4})\.(\d{2})\.(\d{2})\s*\((\d+)년차\)', page_text)
-            if approval_match:
-                result['단지정보']['사용승인일'] = f"{approval_match.group(1)}-{approval_match.group(2)}-{approval_match.group(3)}"
-                result['단지정보']['건물연차'] = int(approval_match.group(4))
-            
-            # 세대수
-            household_match = re.search(r'세대수\s*(\d+(?:,\d+)?)\s*세대\s*\(해당 면적\s*(\d+(?:,\d+)?)\s*세대\)', page_text)
-            if household_match:
-                result['단지정보']['총세대수'] = int(household_match.group(1).replace(',', ''))
-                result['단지정보']['해당면적세대수'] = int(household_match.group(2).replace(',', ''))
-            
-            # 현관구조
-            entrance_match = re.search(r'현관구조\s*([^\n]+)', page_text)
-            if entrance_match:
-                result['단지정보']['현관구조'] = entrance_match.group(1).strip()
-            
-            # 난방
-            heating_match = re.search(r'난방\s*([^\n]+)', page_text)
-            if heating_match:
-                result['단지정보']['난방'] = heating_match.group(1).strip()
-            
-            # 주차
-            parking_match = re.search(r'주차\s*(\d+(?:,\d+)?)\s*대\s*\(세대당\s*([\d.]+)대\)', page_text)
-            if parking_match:
-                result['단지정보']['주차대수'] = int(parking_match.group(1).replace(',', ''))
-                result['단지정보']['세대당주차'] = float(parking_match.group(2))
-            
-            # 용적률/건폐율
-            ratio_match = re.search(r'용적률/건폐율\s*(\d+)%\s*/\s*(\d+)%', page_text)
-            if ratio_match:
-                result['단지정보']['용적률_퍼센트'] = int(ratio_match.group(1))
-                result['단지정보']['건폐율_퍼센트'] = int(ratio_match.group(2))
-            
-            # 관리사무소 전화
-            office_phone_match = re.search(r'관리사무소 전화\s*([\d-]+)', page_text)
-            if office_phone_match:
-                result['단지정보']['관리사무소전화'] = office_phone_match.group(1)
-            
-            # 건설사
-            builder_match = re.search(r'건설사\s*([^\n]+)', page_text)
-            if builder_match:
-                result['단지정보']['건설사'] = builder_match.group(1).strip()
-            
-            print("   ✓ 완료\n")
-            
-            # === 개발예정 추출 ===
-            print("8. 개발예정 추출...")
-            
-            station_pattern = re.compile(r'([가-힣]+역)\((\d{4})년예정\)\s*노선\s*([^\n]+)\s*개통\s*(\d{4})년 예정\s*거리\s*(\d+)m도보\s*(\d+)분')
-            for match in station_pattern.finditer(page_text):
-                result['개발예정'].append({
-                    '역명': match.group(1),
-                    '개통예정년도': int(match.group(2)),
-                    '노선': match.group(3).strip(),
-                    '거리_미터': int(match.group(5)),
-                    '도보_분': int(match.group(6))
-                })
-            
-            print(f"   ✓ {len(result['개발예정'])}개 역 정보 수집\n")
-            
-            # === 중개사 추출 ===
-            print("9. 중개사 정보 추출...")
-            
-            agent_match = re.search(r'중개소\s*중개사\s*([^\n]+)\s*([가-힣]+공인중개사사무소)', page_text)
-            if agent_match:
-                result['중개사']['중개사명'] = agent_match.group(1).strip()
-                result['중개사']['중개소명'] = agent_match.group(2).strip()
-            
-            agent_phone_match = re.search(r'중개사.*?전화\s*([\d-]+)', page_text, re.DOTALL)
-            if agent_phone_match:
-                result['중개사']['전화'] = agent_phone_match.group(1)
-            
-            agent_location_match = re.search(r'위치\s*([^\n]+(?:상가동|호)[^\n]*)', page_text)
-            if agent_location_match:
-                result['중개사']['위치'] = agent_location_match.group(1).strip()
-            
-            agent_reg_match = re.search(r'등록번호\s*([\d-]+)', page_text)
-            if agent_reg_match:
-                result['중개사']['등록번호'] = agent_reg_match.group(1)
-            
-            agent_record_match = re.search(r'최근\s*(\d+)개월\s*집주인확인\s*(\d+)건', page_text)
-            if agent_record_match:
-                result['중개사']['최근실적_개월'] = int(agent_record_match.group(1))
-                result['중개사']['최근실적_건수'] = int(agent_record_match.group(2))
-            
-            print("   ✓ 완료\n")
-            
-            # === 중개보수 추출 ===
-            print("10. 중개보수 추출...")
-            
-            brokerage_match = re.search(r'중개 보수\s*최대\s*([\d,]+)만원', page_text)
-            if brokerage_match:
-                result['중개보수']['최대금액_원'] = int(brokerage_match.group(1).replace(',', '')) * 10000
-            
-            rate_match = re.search(r'상한 요율\s*([\d.]+)%', page_text)
-            if rate_match:
-                result['중개보수']['상한요율_퍼센트'] = float(rate_match.group(1))
-            
-            print("   ✓ 완료\n")
             
-            # === 세금 추출 ===
-            print("11. 세금 정보 추출...")
-            
-            acquisition_match = re.search(r'취득세 합계\s*약\s*([\d,]+)만원', page_text)
-            if acquisition_match:
-                result['세금']['취득세_원'] = int(acquisition_match.group(1).replace(',', '')) * 10000
-            
-            property_match = re.search(r'재산세 합계\s*약\s*([\d,]+)만원', page_text)
-            if property_match:
-                result['세금']['재산세_원'] = int(property_match.group(1).replace(',', '')) * 10000
-            
-            if '종합부동산세' in page_text and '과세대상 아님' in page_text:
-                result['세금']['종합부동산세'] = '과세대상 아님'
-            
-            print("   ✓ 완료\n")
-            
-            # === 관리비 추출 ===
-            print("12. 관리비 상세 추출...")
-            
-            # 관리비 상세보기에서 수집한 데이터 사용
-            mgmt_source = mgmt_detail_text if mgmt_detail_text else page_text
-            
-            # 기본 관리비 정보 (기본정보에서 가져오기)
-            if '관리비_만원' in result['기본정보']:
-                result['관리비']['관리비_만원'] = result['기본정보']['관리비_만원']
-            
-            # 관리비 상세 정보 (더 유연한 패턴)
-            recent_mgmt_match = re.search(r'(\d{4})[.\s]*(\d{1,2})[.\s]*([\d,]+)\s*원', mgmt_source)
-            if recent_mgmt_match:
-                result['관리비']['기준년월'] = f"{recent_mgmt_match.group(1)}-{recent_mgmt_match.group(2).zfill(2)}"
-                result['관리비']['최근관리비_원'] = int(recent_mgmt_match.group(3).replace(',', ''))
-            
-            avg_match = re.search(r'월\s*평균[:\s]*([\d,]+)\s*원', mgmt_source)
-            if avg_match:
-                result['관리비']['월평균_원'] = int(avg_match.group(1).replace(',', ''))
-            
-            summer_match = re.search(r'여름[^\d]*([\d,]+)\s*원', mgmt_source)
-            if summer_match:
-                result['관리비']['여름평균_원'] = int(summer_match.group(1).replace(',', ''))
-            
-            winter_match = re.search(r'겨울[^\d]*([\d,]+)\s*원', mgmt_source)
-            if winter_match:
-                result['관리비']['겨울평균_원'] = int(winter_match.group(1).replace(',', ''))
-            
-            print("   ✓ 완료\n")
-            
-            # === 주변대중교통 추출 ===
-            print("13. 주변대중교통 추출...")
-            
-            result['주변대중교통']['버스'] = {}
-            
-            # 마을버스
-            bus_match = re.search(r'버스\s*마을\s*([^\n]+)', page_text)
-            if bus_match:
-                buses = [b.strip() for b in re.split(r'[,\s]+', bus_match.group(1)) if b.strip() and not b.strip() in ['지선', '간선']]
-                if buses:
-                    result['주변대중교통']['버스']['마을'] = buses
-            
-            # 지선
-            jiseon_match = re.search(r'지선\s*([\d,\s]+)', page_text)
-            if jiseon_match:
-                buses = [b.strip() for b in re.split(r'[,\s]+', jiseon_match.group(1)) if b.strip() and b.strip().isdigit()]
-                if buses:
-                    result['주변대중교통']['버스']['지선'] = buses
-            
-            # 간선
-            ganseon_match = re.search(r'간선\s*([\d,\s]+)', page_text)
-            if ganseon_match:
-                buses = [b.strip() for b in re.split(r'[,\s]+', ganseon_match.group(1)) if b.strip() and b.strip().isdigit()]
-                if buses:
-                    result['주변대중교통']['버스']['간선'] = buses
-            
-            print("   ✓ 완료\n")
+            # 7. 이미지 수집
+            laps.lap('7. 이미지 수집')
+            print("7. 이미지 수집...")
+            result['기본정보']['이미지'] = await save_images(page, article_id, image_folder, lease.limiter, scan_source=True, request=lease.request,
+                                                             blocker=lease.blocker)
+            print()
 
-            # === 실거래가 동적 크롤링 ===
-            print("14. 실거래가 수집 (동적 크롤링)...")
+            # 8. 실거래가 동적 크롤링
+            laps.lap('8. 실거래가 동적 크롤링')
+            print("8. 실거래가 수집 (동적 크롤링)...")
             print(f"{'-'*80}")
             
-            # 14-1. 실거래가 더보기
+            # 8-1. 실거래가 더보기
             print("  [1] 실거래가 더보기 클릭...")
             await click_button_with_text(page, ['실거래가', '더보기'], "실거래가 더보기")
             
-            # 14-2. 실거래가 상세보기
+            # 8-2. 실거래가 상세보기
             print("  [2] 실거래가 상세보기 클릭...")
-            detail_clicked = await click_button_with_text(page, ['실거래가', '상세보기'], "실거래가 상세보기")
-            
-            if detail_clicked:
-                await random_sleep(2, 3)
+            detail_clicked = await click_button_with_text(page, ['실거래가', '상세보기'], "실거래가 상세보기",
+                                                          change_timeout=5000)
             
-            # 14-3. 매매/전세/월세 탭 크롤링
+            # 8-3. 매매/전세/월세 탭 크롤링
             trade_types = [
                 ('매매', '매매'),
                 ('전세', '전세'),
@@ -928,113 +263,69 @@ async def crawl_article(url):
                 print(f"  [{idx+2}] {tab_name} 탭 크롤링...")
                 
                 try:
-                    # 탭 클릭 (첫 번째 탭은 이미 선택되어 있을 수 있음)
-                    if idx > 1:  # 매매 탭이 아닌 경우만 클릭
-                        buttons = await page.query_selector_all('button, a, div[role="tab"], span')
-                        tab_found = False
-                        
-                        for btn in buttons:
-                            try:
-                                text = await btn.inner_text()
-                                if text and text.strip() == tab_name:
-                                    is_visible = await btn.is_visible()
-                                    if not is_visible:
-                                        continue
-                                    
-                                    box = await btn.bounding_box()
-                                    if box:
-                                        await page.evaluate(f"window.scrollTo(0, {box['y'] - 200})")
-                                        await random_sleep(0.3, 0.6)
-                                        await page.mouse.move(
-                                            box['x'] + box['width'] / 2,
-                                            box['y'] + box['height'] / 2
-                                        )
-                                        await random_sleep(0.2, 0.4)
-                                    
-                                    await btn.click()
-                                    await random_sleep(2, 3)
-                                    tab_found = True
-                                    break
-                            except:
-                                continue
-                        
-                        if not tab_found:
-                            print(f"     ℹ {tab_name} 탭 없음")
-                            continue
-                    else:
-                        # 매매 탭은 기본 선택되어 있음
-                        await random_sleep(1, 1.5)
-                    
-                    # 데이터 추출
-                    await random_sleep(1, 1.5)
-                    trade_page_text = await page.evaluate("() => document.body.innerText")
-                    
-                    transactions = []
-                    # 더 유연한 패턴들
-                    patterns = [
-                        re.compile(r'(\d{1,2})[./](\d{1,2})[./]\s*(?:[\d.]+\s*)?(\d+)\s*층\s*([^\n]*?)([\d억,\s/]+)'),
-                        re.compile(r'(\d{4})[.-](\d{1,2})[.-](\d{1,2})\s*(\d+)\s*층\s*([^\n]*?)([\d억,\s/]+)'),
-                        re.compile(r'(\d{1,2})[./](\d{1,2})\s+(\d+)층\s+([\d억,\s/]+)'),
-                    ]
-                    
-                    for pattern in patterns:
-                        for match in pattern.finditer(trade_page_text):
-                            try:
-                                if len(match.groups()) >= 5:  # 전체 패턴
-                                    month = match.group(1) if len(match.group(1)) <= 2 else match.group(2)
-                                    day = match.group(2) if len(match.group(1)) <= 2 else match.group(3)
-                                    floor = int(match.group(3) if len(match.group(1)) <= 2 else match.group(4))
-                                    note = match.group(4) if len(match.group(1)) <= 2 else match.group(5)
-                                    price = match.group(5) if len(match.group(1)) <= 2 else match.group(6)
-                                else:  # 간단한 패턴
-                                    month = match.group(1)
-                                    day = match.group(2)
-                                    floor = int(match.group(3))
-                                    note = ""
-                                    price = match.group(4)
-                                
-                                month = month.zfill(2)
-                                day = day.zfill(2)
-                                price = price.strip()
-                                price = re.sub(r'\n.*', '', price)
-                                note = note.strip() if note else ""
-                                
-                                trans = {
-                                    '계약일': f"2025-{month}-{day}",
-                                    '층': floor,
-                                    '가격': price,
-                                    '비고': note
-                                }
-                                transactions.append(trans)
-                            except:
-                                continue
-                    
-                    # 중복 제거
-                    seen = set()
-                    unique_transactions = []
-                    for trans in transactions:
-                        key = (trans['계약일'], trans['층'], trans['가격'])
-                        if key not in seen:
-                            seen.add(key)
-                            unique_transactions.append(trans)
-                    
-                    result['실거래가'][result_key] = unique_transactions
-                    print(f"     ✓ {len(unique_transactions)}건 수집")
+                    # 탭 클릭 + 더보기/스크롤 끝까지 + 표 행 읽기 (한 번의 evaluate, 매매 탭은 이미 선택됨)
+                    table = await extract_trade_rows(page, tab_name if idx > 1 else None)
+                    if not table['found']:
+                        print(f"     ℹ {tab_name} 탭을 찾을 수 없음")
+                        continue
                     
-                    # 샘플 출력
-                    if unique_transactions:
-                        for i, trans in enumerate(unique_transactions[:2], 1):
-                            print(f"       {i}. {trans['계약일']} | {trans['층']}층 | {trans['가격']}")
-                        if len(unique_transactions) > 2:
-                            print(f"       ... 외 {len(unique_transactions)-2}건")
+                    if table['rows']:
+                        # 표 행만 모으고 파싱은 마지막에 한 번
+                        snapshot['실거래가표'][result_key] = table['rows']
+                        print(f"     ✓ {tab_name} 표 {len(table['rows'])}행 (더보기 {table['pages']}회, {table['ms']}ms)")
+                    else:
+                        # 표를 못 찾으면 탭 텍스트 (정규식 파싱)
+                        trade_page_text = await page.evaluate("() => document.body.innerText")
+                        snapshot['실거래가'][result_key] = trade_page_text
+                        print(f"     ℹ {tab_name} 표 없음 → 탭 텍스트 {len(trade_page_text):,}자")
                     
                 except Exception as e:
                     print(f"     ❌ {tab_name} 탭 처리 실패: {e}")
                 
-                await random_sleep(1, 1.5)
+                # 탭 전환 간격 (사람처럼 보이도록 짧은 지터만 유지)
+                await random_sleep(0.3, 0.8)
             
             print(f"{'-'*80}\n")
             
+            # JSON 응답 → 스키마 (--capture-api일 때만 정규식으로 찾은 값보다 우선)
+            laps.lap('응답 매핑')
+            captured = None
+            if capture is not None:
+                captured = await finish_capture(capture, result, article_id, response_folder, apply=capture_api)
+            
+            # 위치좌표 결과 합치기 (보통 실거래가 단계 동안 끝나 있음)
+            laps.lap('위치좌표 대기')
+            if coordinate_task is not None:
+                join_started = time.perf_counter()
+                try:
+                    coordinates = await coordinate_task
+                except Exception as e:
+                    print(f"     ℹ 좌표 추출 실패: {e}")
+                    coordinates = None
+                coordinate_task = None
+                if coordinates is not None:
+                    result['단지정보']['위도'], result['단지정보']['경도'] = coordinates
+                print(f"   ✓ 위치좌표 합침 (추가 대기 {(time.perf_counter() - join_started) * 1000:.0f}ms)\n")
+            
+            # 9. 파싱 (원문 → 매물 JSON, 프로세스 풀에서 실행)
+            laps.lap('9. 파싱')
+            print("9. 파싱...")
+            finish_snapshot(snapshot, result, captured)
+            result = await parse_snapshot(snapshot, parse_pool, article_started)
+            # 처음 수집한 단지, 또는 캐시에 없던 좌표를 이번에 찾은 단지 → 저장
+            if claimed or (cached is not None and not has_coordinates(cached) and has_coordinates(result)):
+                complex_cache.put(complex_id, complex_sections(result))
+            if claimed:
+                complex_cache.release(complex_id)
+                claimed = False
+            for tab_name, transactions in result['실거래가'].items():
+                for i, trans in enumerate(transactions[:2], 1):
+                    print(f"       {tab_name} {i}. {trans['계약일']} | {trans['층']}층 | {trans['가격']}")
+            
+            if archive is not None:
+                archive.write(snapshot)
+            print()
+            
             # 결과 출력
             print(f"{'='*80}")
             print("수집 완료")
@@ -1048,23 +339,53 @@ async def crawl_article(url):
             print(f"개발예정: {len(result['개발예정'])}개")
             print(f"{'='*80}\n")
             
+            laps.finish()
             return result
             
         except Exception as e:
             print(f"\n❌ 오류 발생: {e}")
             import traceback
             traceback.print_exc()
+            if capture is not None:
+                await capture.stop()
+            if coordinate_task is not None:
+                coordinate_task.cancel()
+            # 오류가 난 컨텍스트는 반납 시 재생성
+            lease.mark_broken()
+            laps.finish()
             return None
-            
         finally:
-            wait_time = 1  # 대기 시간 단축
-            print(f"브라우저를 {wait_time}초 후 종료합니다...")
-            await asyncio.sleep(wait_time)
-            await browser.close()
+            # 실패/취소여도 기다리던 같은 단지 매물이 이어서 수집하도록
+            if claimed:
+                complex_cache.release(complex_id)
+
+def parse_args():
+    """명령행 옵션"""
+    parser = argparse.ArgumentParser(description="네이버 부동산 매물 크롤러 v3")
+    parser.add_argument('--workers', type=int, default=1, help="동시에 크롤링할 매물 수 (기본 1)")
+    parser.add_argument('--rate-scale', type=float, default=1.0, help="호스트별 요청 예산 배율 (기본 1.0)")
+    parser.add_argument('--block-resources', action='store_true', help="이미지/폰트/광고/분석 요청 차단 (이미지 수집 단계만 이미지 허용)")
+    parser.add_argument('--capture-api', action='store_true', help="페이지 JSON 응답에서 필드 추출 (정규식은 보조)")
+    parser.add_argument('--save-responses', help="수집한 JSON 응답을 픽스처(JSONL)로 저장할 폴더 (저장만, 결과 반영은 --capture-api)")
+    parser.add_argument('--image-folder', help="이미지 저장 경로 (기본: 저장 경로/images)")
+    parser.add_argument('--state', help="수집 상태 DB 경로 (기본: 저장 경로/수집상태.db)")
+    parser.add_argument('--restart', action='store_true', help="수집 상태를 무시하고 처음부터 다시 수집")
+    parser.add_argument('--incremental', action='store_true', help="새 매물과 매물정보 요약이 바뀐 매물만 수집, 사라진 매물은 삭제 표시")
+    parser.add_argument('--complex-cache-ttl', type=float, default=7, help="단지 캐시 유효기간(일, 기본 7)")
+    parser.add_argument('--complex-cache', help="단지 캐시 DB 경로 (기본: 저장 경로/단지캐시.db, 여러 프로세스가 함께 사용 가능)")
+    parser.add_argument('--no-complex-cache', action='store_true', help="단지 캐시 사용 안 함 (매물마다 좌표/단지정보 다시 수집)")
+    parser.add_argument('--parse-workers', type=int, default=1, help="파싱 프로세스 수 (0: 이벤트 루프에서 파싱, 기본 1)")
+    parser.add_argument('--archive', help="원문(본문/관리비/실거래가 텍스트) 압축 보관 폴더 → python 원문보관.py 로 재처리")
+    parser.add_argument('--output', choices=OUTPUT_KINDS, default='json',
+                        help="저장 방식 (json: 매물마다 파일, jsonl: 압축 샤드, parquet: 열 표, 기본 json)")
+    parser.add_argument('--shard-size', type=int, help="jsonl/parquet 샤드당 매물 수 (기본 jsonl 5000, parquet 1000)")
+    return parser.parse_args()
 
 async def main():
     """메인 함수"""
     
+    args = parse_args()
+    
     print("\n" + "="*80)
     print("네이버 부동산 매물 크롤러 v3")
     print("크롤링방법.txt 기반 완전 재구성 버전")
@@ -1077,6 +398,7 @@ async def main():
     print("  ✓ 관리비 상세보기 동적 크롤링")
     print("  ✓ 실거래가 상세보기 → 매매/전세/월세 탭 크롤링")
     print("  ✓ 크롤링 방지 우회 (랜덤 User-Agent, 타임슬립, 사람처럼 스크롤)")
+    print("  ✓ 동시 크롤링 (--workers N) + 호스트별 요청 제한")
     print("="*80)
     print()
     
@@ -1095,6 +417,9 @@ async def main():
     if not os.path.exists(save_dir):
         os.makedirs(save_dir)
         print(f"✓ 저장 폴더 생성: {save_dir}")
+    # 이미지 저장 경로 (현재 폴더가 아니라 저장 경로 아래, 지정하면 그 경로)
+    image_folder = args.image_folder or os.path.join(save_dir, 'images')
+    os.makedirs(image_folder, exist_ok=True)
     
     # 3. URL 데이터 파일 읽기
     try:
@@ -1110,64 +435,124 @@ async def main():
         
         print(f"\n✓ URL 데이터 로드 완료")
         print(f"  - 총 URL 수: {total_urls}개")
-        print(f"  - 크롤링 대상: 상위 3개")
+        print(f"  - 크롤링 대상: 전체 {total_urls}개")
         print()
         
     except Exception as e:
         print(f"❌ URL 데이터 파일 읽기 실패: {e}")
         return
     
-    # 4. 상위 3개 URL 크롤링
-    target_urls = url_list[:3]
-    success_count = 0
-    fail_count = 0
+    # 4. 수집 상태 확인 (완료된 매물은 건너뛰고 이어서 수집)
+    state = open_state(save_dir, args.state)
+    if args.restart:
+        state.reset()
+    if args.incremental:
+        target_urls, plan = state.plan_incremental(url_list)
+        print(f"  - 증분 수집: {state.path} (신규 {plan['신규']}개, 변경 {plan['변경']}개, 재시도 {plan['재시도']}개, "
+              f"동일 {plan['동일']}개 건너뜀, 삭제 {plan['삭제']}개 표시)")
+    else:
+        target_urls, skipped = state.pending(url_list)
+        print(f"  - 수집 상태: {state.path} (완료 {skipped['완료']}개 건너뜀, 재시도 한도 초과 {skipped['실패한도']}개)")
+    total_urls = len(target_urls)
+    print(f"  - 이번 크롤링 대상: {total_urls}개")
+    
+    # 5. 전체 URL 크롤링 (브라우저 풀 + 워커 풀)
+    counts = {'성공': 0, '실패': 0}
+    meter = ThroughputMeter()
+    limiter = HostRateLimiter(scale=args.rate_scale)
     
-    for idx, url_info in enumerate(target_urls, 1):
+    print(f"  - 워커 수: {args.workers}개")
+    
+    archive = SnapshotArchive(args.archive) if args.archive else None
+    sink = open_sink(args.output, save_dir, prefix='article_v3', shard_size=args.shard_size)
+    print(f"  - 저장 방식: {args.output}")
+    print(f"  - 이미지 저장: {image_folder}")
+    complex_cache = None
+    if not args.no_complex_cache:
+        complex_cache = open_complex_cache(save_dir, args.complex_cache, ttl_days=args.complex_cache_ttl)
+    if complex_cache is not None and not any(u.get('단지ID') for u in target_urls):
+        print("  - URL 파일에 단지ID가 없어 단지 캐시를 쓰지 않습니다 (법정동별url정리.py 로 다시 만들면 사용)")
+    
+    async def crawl_one(idx, url_info):
         url = url_info.get('URL', '')
         article_id = url_info.get('매물ID', 'unknown')
         
         print(f"\n{'='*80}")
-        print(f"[{idx}/3] 매물 크롤링 시작")
+        print(f"[{idx}/{total_urls}] 매물 크롤링 시작")
         print(f"매물ID: {article_id}")
         print(f"URL: {url}")
         print(f"{'='*80}\n")
         
+        state.mark_started(article_id, url)
         try:
             # 크롤링 실행
-            result = await crawl_article(url)
+            result = await crawl_article(url, pool, args.capture_api, args.save_responses, archive, parse_pool,
+                                         url_info.get('단지ID'), complex_cache, image_folder)
             
             if result:
-                # 파일 저장
+                # 저장 (jsonl/parquet은 묶음을 디스크에 쓴 뒤 완료 표시)
                 filename = f'article_v3_{article_id}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-                filepath = os.path.join(save_dir, filename)
-                
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, ensure_ascii=False, indent=2)
+                summary_hash = snippet_hash(url_info)
+                location = sink.write(result, filename, on_saved=lambda location: state.mark_done(
+                    article_id, location, summary_hash=summary_hash))
                 
-                print(f"\n✅ [{idx}/3] 크롤링 성공!")
-                print(f"   저장 위치: {filepath}")
-                success_count += 1
+                print(f"\n✅ [{idx}/{total_urls}] 크롤링 성공!")
+                print(f"   저장 위치: {location}")
+                counts['성공'] += 1
             else:
-                print(f"\n❌ [{idx}/3] 크롤링 실패")
-                fail_count += 1
+                print(f"\n❌ [{idx}/{total_urls}] 크롤링 실패")
+                counts['실패'] += 1
+                state.mark_failed(article_id, '크롤링 실패')
         
         except Exception as e:
-            print(f"\n❌ [{idx}/3] 크롤링 중 오류 발생: {e}")
-            fail_count += 1
+            print(f"\n❌ [{idx}/{total_urls}] 크롤링 중 오류 발생: {e}")
+            counts['실패'] += 1
+            state.mark_failed(article_id, e)
         
-        # 다음 크롤링 전 대기 (마지막 URL이 아닌 경우)
-        if idx < len(target_urls):
-            wait_time = random.uniform(1, 2.5)
-            print(f"\n⏳ 다음 크롤링까지 {wait_time:.1f}초 대기...\n")
-            await asyncio.sleep(wait_time)
+        meter.add()
+        print(f"   처리속도: {meter.per_minute():.2f}건/분")
+    
+    # 요청 간격은 호스트별 토큰 버킷이 조절 (고정 대기 없음)
+    # 파싱은 프로세스 풀에서 (브라우저 I/O와 겹쳐서 진행)
+    async with ParsePool(args.parse_workers) as parse_pool, \
+            create_browser_pool(size=args.workers, limiter=limiter,
+                                block_profile='text' if args.block_resources else 'off') as pool:
+        await run_worker_pool(target_urls, crawl_one, args.workers)
+        pool.print_stats()
+        parse_pool.print_stats()
+    if archive is not None:
+        archive.close()
+    sink.close()
+    state_counts = state.counts()
+    state.close()
+    if complex_cache is not None:
+        complex_cache.close()
+    
+    success_count = counts['성공']
+    fail_count = counts['실패']
     
-    # 5. 최종 결과 출력
+    # 6. 최종 결과 출력
     print(f"\n{'='*80}")
     print("전체 크롤링 완료")
     print(f"{'='*80}")
     print(f"성공: {success_count}개")
     print(f"실패: {fail_count}개")
+    print(f"처리속도: {meter.summary()}")
     print(f"저장 위치: {save_dir}")
+    print(f"수집 상태: " + ', '.join(f"{k} {v}개" for k, v in state_counts.items()) + f" ({state.commits}회 커밋)")
+    sink.print_stats()
+    if complex_cache is not None:
+        complex_cache.print_stats()
+    print("요청 제한:")
+    limiter.print_stats()
+    print_click_stats()
+    print_wait_stats()
+    print_image_stats()
+    print_coordinate_stats()
+    print_stage_profile()
+    profile_path = write_stage_profile(save_dir)
+    if profile_path:
+        print(f"단계별 시간 저장: {profile_path}")
     print(f"{'='*80}\n")
 
 if __name__ == "__main__":
@@ -0,0 +1,214 @@
+"""
+가격/면적 문자열 정규화 (가격은 만원 단위 정수, 면적은 ㎡ 실수)
+- '12억 5,000' → 125000, '6억' → 60000, '8,500' → 8500, '최대 2억 4,800만원' → 24800, '1.5억' → 15000
+- 월세 '1억/200' → 보증금 10000, 월세 200
+- 가격범위 '5억 7,000 ~ 6억 9,000' → (57000, 69000)
+- 면적 '59.84㎡' → 59.84, '25평' → 82.64 (㎡로 환산)
+- 숫자 입력은 그대로 (NaN/무한대는 빈 값 → None, 판다스/NumPy 열의 빈 칸)
+- 열 단위(batch): parse_prices / parse_rents / parse_price_ranges / parse_areas
+  - 같은 문자열은 한 번만 파싱 (가격 열은 같은 값이 많음)
+  - list → list (없으면 None), NumPy 배열 → 마스크 배열(가격) / NaN 배열(면적),
+    pyarrow 배열 → dictionary_encode 후 고유값만 파싱해서 take (null 유지)
+- 속도 측정: python 가격정규화.py [--count 1000000] [--unique 20000]
+"""
+import argparse
+import math
+import random
+import re
+import time
+from 표시도구 import pad
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = pc = None
+
+# [N억] [N[만원]] (쉼표/소수 허용, 첫 숫자부터)
+PRICE_PATTERN = re.compile(r'(?P<eok>\d[\d,]*(?:\.\d+)?)\s*억\s*(?P<rest>\d[\d,]*)?|(?P<man>\d[\d,]*)')
+
+# 숫자 + 단위 (㎡/m²/m2/제곱미터/평, 단위가 없으면 ㎡)
+AREA_PATTERN = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*(㎡|m²|m2|제곱미터|평)?')
+
+# 1평 = 3.305785㎡
+PYEONG_M2 = 3.305785
+
+RANGE_SPLIT = re.compile(r'\s*~\s*')
+
+def is_missing(value):
+    """None, NaN, 무한대 → True"""
+    return value is None or (isinstance(value, float) and not math.isfinite(value))
+
+def parse_price(text):
+    """가격 문자열 → 만원 정수 (숫자가 없으면 None)"""
+    if is_missing(text):
+        return None
+    if isinstance(text, (int, float)):
+        return int(text)
+    match = PRICE_PATTERN.search(text)
+    if match is None:
+        return None
+    eok = match.group('eok')
+    if eok is None:
+        return int(match.group('man').replace(',', ''))
+    rest = match.group('rest')
+    value = round(float(eok.replace(',', '')) * 10000)
+    return int(value + int(rest.replace(',', ''))) if rest else int(value)
+
+def parse_rent(text):
+    """'보증금/월세' → (보증금 만원, 월세 만원), '/'가 없으면 (가격, None)"""
+    if is_missing(text):
+        return None, None
+    if not isinstance(text, str):
+        return parse_price(text), None
+    if '/' in text:
+        deposit, monthly = text.split('/', 1)
+        return parse_price(deposit), parse_price(monthly)
+    return parse_price(text), None
+
+def parse_price_range(text):
+    """'5억 7,000 ~ 6억 9,000' → (최저, 최고) 만원 ('~'가 없으면 같은 값 두 개)"""
+    if is_missing(text) or not text:
+        return None, None
+    if not isinstance(text, str):
+        return parse_price(text), parse_price(text)
+    parts = RANGE_SPLIT.split(text, maxsplit=1)
+    low = parse_price(parts[0])
+    return low, parse_price(parts[1]) if len(parts) > 1 else low
+
+def parse_area(text):
+    """면적 문자열 → ㎡ 실수 (평은 ㎡로 환산, 숫자가 없으면 None)"""
+    if is_missing(text):
+        return None
+    if isinstance(text, (int, float)):
+        return float(text)
+    match = AREA_PATTERN.search(text)
+    if match is None:
+        return None
+    value = float(match.group(1).replace(',', ''))
+    return round(value * PYEONG_M2, 2) if match.group(2) == '평' else value
+
+# ===== 열 단위 =====
+
+def memo_map(values, parse):
+    """값 목록 → parse 결과 목록 (같은 값은 한 번만 파싱)"""
+    cache = {None: parse(None)}
+    get = cache.get
+    results = []
+    append = results.append
+    for value in values:
+        result = get(value, cache)
+        if result is cache:
+            result = cache[value] = parse(value)
+        append(result)
+    return results
+
+def arrow_map(array, parse, arrow_type):
+    """pyarrow 배열 → 고유값만 파싱 → take (ChunkedArray는 조각마다)"""
+    if isinstance(array, pa.ChunkedArray):
+        return pa.chunked_array([arrow_map(chunk, parse, arrow_type) for chunk in array.chunks], type=arrow_type)
+    encoded = pc.dictionary_encode(array)
+    dictionary = pa.array([parse(value) for value in encoded.dictionary.to_pylist()], type=arrow_type)
+    return dictionary.take(encoded.indices)
+
+def is_arrow(values):
+    return pa is not None and isinstance(values, (pa.Array, pa.ChunkedArray))
+
+def is_numpy(values):
+    return np is not None and isinstance(values, np.ndarray)
+
+def to_int_column(results, like):
+    """파싱 결과(None 포함) → 입력과 같은 종류의 정수 열"""
+    if is_numpy(like):
+        mask = np.fromiter((r is None for r in results), dtype=bool, count=len(results))
+        data = np.fromiter((0 if r is None else r for r in results), dtype=np.int64, count=len(results))
+        return np.ma.MaskedArray(data, mask=mask)
+    return results
+
+def map_column(values, parse, kind):
+    """열 하나 정규화 (kind: 'int' → 마스크 배열, 'float' → NaN 배열)"""
+    if is_arrow(values):
+        return arrow_map(values, parse, pa.int64() if kind == 'int' else pa.float64())
+    source = values.tolist() if is_numpy(values) else values
+    results = memo_map(source, parse)
+    if kind == 'float' and is_numpy(values):
+        return np.fromiter((np.nan if r is None else r for r in results), dtype=np.float64, count=len(results))
+    return to_int_column(results, values)
+
+def map_pair_column(values, parse):
+    """값 하나 → (값, 값) 파싱 → 열 두 개"""
+    if is_arrow(values):
+        pairs = memo_map(values.to_pylist(), parse)
+        return tuple(pa.array([pair[i] for pair in pairs], type=pa.int64()) for i in (0, 1))
+    pairs = memo_map(values.tolist() if is_numpy(values) else values, parse)
+    return tuple(to_int_column([pair[i] for pair in pairs], values) for i in (0, 1))
+
+def parse_prices(values):
+    """가격 열 → 만원 정수 열"""
+    return map_column(values, parse_price, 'int')
+
+def parse_rents(values):
+    """'보증금/월세' 열 → (보증금 열, 월세 열)"""
+    return map_pair_column(values, parse_rent)
+
+def parse_price_ranges(values):
+    """가격범위 열 → (최저 열, 최고 열)"""
+    return map_pair_column(values, parse_price_range)
+
+def parse_areas(values):
+    """면적 열 → ㎡ 실수 열"""
+    return map_column(values, parse_area, 'float')
+
+# ===== 속도 측정 =====
+
+def sample_prices(count, unique, seed=0):
+    """실제 형식을 섞은 가격 문자열 count개 (고유값 unique개)"""
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(unique):
+        eok, man = rng.randint(0, 30), rng.choice([0, rng.randint(1, 99) * 100])
+        text = (f"{eok}억" if eok else '') + (f" {man:,}" if man else '')
+        text = text.strip() or f"{rng.randint(1, 99) * 100:,}"
+        pool.append(rng.choice([text, text + '만원', f"최대 {text}만원", f"{text}/{rng.randint(3, 300)}"]))
+    return [rng.choice(pool) for _ in range(count)]
+
+def measure(label, func, count):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"   - {pad(label, 24)}: {elapsed * 1000:8.1f}ms ({count / elapsed / 1e6:6.2f}M개/초)")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="가격 정규화 속도 측정 (한 개씩 ↔ 열 단위)")
+    parser.add_argument('--count', type=int, default=1_000_000, help="문자열 수 (기본 1,000,000)")
+    parser.add_argument('--unique', type=int, default=20_000, help="고유 문자열 수 (기본 20,000)")
+    parser.add_argument('--seed', type=int, default=0, help="생성 시드 (기본 0)")
+    args = parser.parse_args()
+
+    values = sample_prices(args.count, args.unique, args.seed)
+    print(f"\n가격 정규화: 문자열 {args.count:,}개 (고유 {args.unique:,}개)")
+    expected = measure('한 개씩 parse_price', lambda: [parse_price(v) for v in values], args.count)
+    result = measure('parse_prices (list)', lambda: parse_prices(values), args.count)
+    assert result == expected
+    measure('parse_rents (list)', lambda: parse_rents(values), args.count)
+    if np is not None:
+        array = np.array(values, dtype=object)
+        result = measure('parse_prices (NumPy)', lambda: parse_prices(array), args.count)
+        assert result.filled(-1).tolist() == [-1 if v is None else v for v in expected]
+    else:
+        print("   - NumPy: 설치 안 됨 (건너뜀)")
+    if pa is not None:
+        array = pa.array(values)
+        result = measure('parse_prices (Arrow)', lambda: parse_prices(array), args.count)
+        assert result.to_pylist() == expected
+    else:
+        print("   - pyarrow: 설치 안 됨 (건너뜀)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+단계별 시간 계측
+- stage(이름): with 블록 시간 기록 (async 코드 안에서도 사용)
+- timed(이름): 함수(코루틴 포함) 호출 시간 기록 데코레이터
+- StageLaps: 번호 붙은 단계가 이어지는 흐름(crawl_article 등)에서 lap(다음 단계) 호출 시 이전 단계 기록
+  (기존 블록을 들여쓰기 하지 않고 단계 경계에만 한 줄씩)
+- 실행이 끝나면 단계별 횟수/합계/p50/p95/최대 → 터미널 표(print_stage_profile) + JSON(write_stage_profile)
+"""
+import functools
+import inspect
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from 표시도구 import display_width, pad
+
+# 단계 이름 → 소요 시간(초) 목록
+STAGE_TIMES = {}
+
+def record_stage(name, elapsed):
+    STAGE_TIMES.setdefault(name, []).append(elapsed)
+
+@contextmanager
+def stage(name):
+    """with stage('이름'): ... → 블록 시간 기록 (예외가 나도 기록)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - started)
+
+def timed(name):
+    """함수 호출 시간 기록 (코루틴 함수면 await 끝날 때까지)"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class StageLaps:
+    """이어지는 단계 계측 (lap → lap → ... → finish)"""
+
+    def __init__(self, prefix='', total=None):
+        self.prefix = prefix
+        self.total = total
+        self.started = time.perf_counter()
+        self._name = None
+        self._lap_started = None
+
+    def lap(self, name):
+        """이전 단계를 끝내고 새 단계 시작"""
+        now = time.perf_counter()
+        self._close(now)
+        self._name = name
+        self._lap_started = now
+
+    def _close(self, now):
+        if self._name is not None:
+            record_stage(self.prefix + self._name, now - self._lap_started)
+            self._name = None
+
+    def finish(self):
+        """마지막 단계와 전체 시간 기록 (여러 번 불러도 한 번만)"""
+        if self.started is None:
+            return
+        now = time.perf_counter()
+        self._close(now)
+        if self.total:
+            record_stage(self.total, now - self.started)
+        self.started = None
+
+def percentile(values, q):
+    """정렬한 값에서 q(0~1) 위치 값 (가장 가까운 순위)"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+def stage_summary():
+    """단계별 {'횟수', '합계', 'p50', 'p95', '최대'} (초, 기록 순서대로)"""
+    return {
+        name: {
+            '횟수': len(times),
+            '합계': sum(times),
+            'p50': percentile(times, 0.5),
+            'p95': percentile(times, 0.95),
+            '최대': max(times),
+        }
+        for name, times in STAGE_TIMES.items() if times
+    }
+
+def print_stage_profile():
+    """단계별 시간 표 출력"""
+    summary = stage_summary()
+    if not summary:
+        return
+    width = max(display_width(name) for name in summary) + 2
+    print("단계별 시간 (ms):")
+    print("   " + pad('단계', width) + ''.join(pad(h, 10, True) for h in ['횟수', 'p50', 'p95', '최대', '합계(초)']))
+    for name, s in summary.items():
+        values = [str(s['횟수']), f"{s['p50'] * 1000:.0f}", f"{s['p95'] * 1000:.0f}",
+                  f"{s['최대'] * 1000:.0f}", f"{s['합계']:.1f}"]
+        print("   " + pad(name, width) + ''.join(pad(v, 10, True) for v in values))
+
+def write_stage_profile(folder, name='단계계측', extra=None):
+    """단계별 시간 JSON 저장 → 파일 경로 (기록이 없으면 None)"""
+    summary = stage_summary()
+    if not summary:
+        return None
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    report = {
+        '생성시간': datetime.now().isoformat(),
+        '단위': '초',
+        '단계': summary,
+        **(extra or {}),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
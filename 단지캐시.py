@@ -0,0 +1,132 @@
+"""
+단지 캐시 (SQLite, WAL)
+- 단지정보(위치, 사용승인일, 세대수, 주차, 용적률, 건설사, 좌표), 개발예정, 주변대중교통은
+  같은 단지 매물이면 모두 같음 → 단지ID(법정동별url수집.py 단지 목록) 기준으로 한 번만 수집
+- 캐시가 있는 단지의 매물은 위치좌표 단계를 건너뛰고 (캐시에 좌표가 없으면 좌표만 다시 찾음),
+  파싱에서도 해당 섹션 추출 대신 캐시 값 사용 (해당면적세대수처럼 매물마다 다른 값은 매물에서 추출)
+- 같은 단지 매물이 동시에 캐시를 놓치면 claim() 한 매물만 수집, 나머지는 release() 까지 기다렸다가 캐시 사용
+  (한 프로세스 안의 워커끼리, 샤드 프로세스끼리는 먼저 저장한 값을 다음 매물부터 사용)
+- ttl(초)이 지난 항목은 없는 것으로 보고 다시 수집해서 덮어씀
+- 좌표만 따로 키(단지:{단지ID}, 주소:{위치})별로 저장 (유효기간 없음, 위치좌표.find_coordinates)
+- 적중률 출력: print_stats()
+- 여러 프로세스(샤드크롤러)가 --complex-cache 로 같은 파일을 함께 사용 가능 (WAL, 잠금 대기 30초)
+"""
+import asyncio
+import json
+import sqlite3
+import time
+from pathlib import Path
+from 필드추출 import ARTICLE_COMPLEX_FIELDS, COMPLEX_GROUPS
+
+CACHE_FILE_NAME = '단지캐시.db'
+
+# 기본 유효기간 (7일)
+DEFAULT_TTL = 7 * 24 * 3600
+
+def complex_sections(result):
+    """매물 결과 → 캐시할 단지 섹션 (매물마다 다른 필드 제외)"""
+    article_fields = {path.split('.', 1)[1] for path in ARTICLE_COMPLEX_FIELDS}
+    sections = {section: result.get(section) for section in COMPLEX_GROUPS}
+    sections['단지정보'] = {k: v for k, v in (sections['단지정보'] or {}).items() if k not in article_fields}
+    return sections
+
+def has_coordinates(sections):
+    """단지 섹션(또는 매물 결과)에 좌표가 있는지"""
+    complex_info = sections.get('단지정보') or {}
+    return complex_info.get('위도') is not None and complex_info.get('경도') is not None
+
+class ComplexCache:
+    """단지ID → 단지 섹션 캐시"""
+
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        # 샤드 프로세스들이 같은 파일을 함께 쓸 수 있도록 잠금 대기를 길게
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS complexes '
+                          '("단지ID" TEXT PRIMARY KEY, "값" TEXT NOT NULL, "저장시각" REAL NOT NULL)')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS coordinates '
+                          '("키" TEXT PRIMARY KEY, "위도" REAL NOT NULL, "경도" REAL NOT NULL, "저장시각" REAL NOT NULL)')
+        self.conn.commit()
+        self.stats = {'적중': 0, '없음': 0, '만료': 0, '저장': 0, '대기': 0}
+        # 수집 중인 단지ID → 끝나면 결과가 정해지는 future (같은 이벤트 루프의 워커끼리)
+        self._inflight = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def get(self, complex_id):
+        """유효한 캐시 값 (dict) 또는 None"""
+        row = self.conn.execute('SELECT "값", "저장시각" FROM complexes WHERE "단지ID" = ?',
+                                (str(complex_id),)).fetchone()
+        if row is None:
+            self.stats['없음'] += 1
+            return None
+        if time.time() - row[1] > self.ttl:
+            self.stats['만료'] += 1
+            return None
+        self.stats['적중'] += 1
+        return json.loads(row[0])
+
+    async def claim(self, complex_id):
+        """유효한 캐시 값, 없으면 None → 이 매물이 단지 섹션을 수집 (끝나면 put/release)
+        - 같은 단지를 다른 매물이 수집하는 중이면 끝날 때까지 기다렸다가 다시 조회
+        """
+        key = str(complex_id)
+        while key in self._inflight:
+            self.stats['대기'] += 1
+            await asyncio.shield(self._inflight[key])
+        cached = self.get(complex_id)
+        if cached is None:
+            self._inflight[key] = asyncio.get_running_loop().create_future()
+        return cached
+
+    def release(self, complex_id):
+        """claim 으로 맡은 단지 수집 끝 (실패해도 호출) → 기다리던 매물이 다시 조회"""
+        future = self._inflight.pop(str(complex_id), None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    def put(self, complex_id, sections):
+        """단지 섹션 저장 (좌표가 없어도 저장, 다음 매물은 좌표만 다시 찾아서 채움)"""
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO complexes ("단지ID", "값", "저장시각") VALUES (?, ?, ?)',
+                              (str(complex_id), json.dumps(sections, ensure_ascii=False), time.time()))
+        self.stats['저장'] += 1
+
+    def get_coordinates(self, keys):
+        """키 중 처음 찾은 좌표 (위도, 경도) 또는 None"""
+        for key in keys:
+            row = self.conn.execute('SELECT "위도", "경도" FROM coordinates WHERE "키" = ?', (key,)).fetchone()
+            if row is not None:
+                return row[0], row[1]
+        return None
+
+    def put_coordinates(self, keys, coordinates):
+        """좌표를 모든 키로 저장"""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO coordinates ("키", "위도", "경도", "저장시각") VALUES (?, ?, ?, ?)',
+                                  [(key, coordinates[0], coordinates[1], now) for key in keys])
+
+    def close(self):
+        self.conn.close()
+
+    def print_stats(self):
+        lookups = self.stats['적중'] + self.stats['없음'] + self.stats['만료']
+        if not lookups:
+            return
+        print(f"단지 캐시: 적중 {self.stats['적중']}/{lookups} ({self.stats['적중'] / lookups * 100:.0f}%), "
+              f"없음 {self.stats['없음']}, 만료 {self.stats['만료']}, 저장 {self.stats['저장']}, "
+              f"수집 대기 {self.stats['대기']}")
+
+def open_complex_cache(save_folder, path=None, ttl_days=None):
+    """저장 경로 아래 단지캐시.db (path를 지정하면 그 파일)"""
+    ttl = ttl_days * 24 * 3600 if ttl_days is not None else DEFAULT_TTL
+    return ComplexCache(path or Path(save_folder) / CACHE_FILE_NAME, ttl=ttl)
@@ -4,14 +4,19 @@
 - 지역의 모든 단지를 자동으로 순회
 - 각 단지의 매물 URL 자동 수집
 - Playwright 기반
+- --block-resources: 이미지/폰트/광고/분석 요청 차단 (요청차단.py)
 """
+import argparse
 import asyncio
 import json
+import time
 import random
 from playwright.async_api import async_playwright
 from datetime import datetime
 import re
-import os
+from 단계계측 import StageLaps, print_stage_profile, timed, write_stage_profile
+from 요청차단 import RequestBlocker, print_block_stats
+from 출력저장소 import open_sink
 
 # User-Agent 목록
 USER_AGENTS = [
@@ -20,10 +25,14 @@ USER_AGENTS = [
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
 ]
 
+# 매물 상세 페이지 주소 (벤치마크에서는 픽스처 서버 주소로 바꿈)
+ARTICLE_BASE_URL = 'https://fin.land.naver.com'
+
 async def random_sleep(min_sec=1, max_sec=3):
     """랜덤 대기"""
     await asyncio.sleep(random.uniform(min_sec, max_sec))
 
+@timed('collect_complex_urls')
 async def collect_complex_urls(page):
     """단지 URL 수집"""
     
@@ -114,14 +123,20 @@ async def collect_complex_urls(page):
     
     return complex_list
 
-async def collect_articles_from_complex(page, complex_url, complex_name, is_first_complex=False, article_button_selector=None):
+async def collect_articles_from_complex(page, complex_url, complex_name, is_first_complex=False, article_button_selector=None,
+                                        blocker=None):
     """단지에서 매물 URL 수집"""
+    laps = StageLaps('단지 ', total='단지 전체')
     
     try:
         # 단지 페이지로 이동 (자동으로 tab=transaction으로 이동됨)
+        laps.lap('단지 페이지 이동')
         print(f"      → 단지 페이지 이동...")
         
+        started = time.perf_counter()
         await page.goto(complex_url, wait_until='domcontentloaded', timeout=60000)
+        if blocker is not None:
+            await blocker.wait_for_text(page, started)
         await random_sleep(2, 3)
         await page.wait_for_load_state('networkidle', timeout=30000)
         
@@ -130,6 +145,7 @@ async def collect_articles_from_complex(page, complex_url, complex_name, is_firs
         print(f"         URL: {current_url[:80]}...")
         
         # 매물 탭으로 이동 - URL 변경
+        laps.lap('매물 탭 이동')
         print(f"      → 매물 탭 URL로 변경 중...")
         
         # URL 변경 규칙: tab=transaction → tab=article
@@ -144,7 +160,10 @@ async def collect_articles_from_complex(page, complex_url, complex_name, is_firs
         print(f"      → 변경된 URL: {article_url[:80]}...")
         
         # 새 URL로 이동
+        started = time.perf_counter()
         await page.goto(article_url, wait_until='domcontentloaded', timeout=60000)
+        if blocker is not None:
+            await blocker.wait_for_text(page, started)
         await random_sleep(2, 3)
         await page.wait_for_load_state('networkidle', timeout=30000)
         
@@ -152,6 +171,7 @@ async def collect_articles_from_complex(page, complex_url, complex_name, is_firs
         print(f"      ✓ 매물 탭 이동 완료: {final_url[:80]}...\n")
         
         # 3단계: 실제 단지명 추출
+        laps.lap('단지명 추출')
         print(f"      → 3단계: 실제 단지명 추출...")
         
         real_complex_name = await page.evaluate("""
@@ -203,6 +223,7 @@ async def collect_articles_from_complex(page, complex_url, complex_name, is_firs
             print(f"      ℹ 단지명 추출 실패, 기존 이름 사용: {complex_name}")
         
         # "매물목록 펼치기" 버튼 클릭
+        laps.lap('매물목록 펼치기')
         print(f"      → 매물목록 펼치기 버튼 찾는 중...")
         
         expand_buttons = await page.query_selector_all('button.ArticleCard_button-expand__Tpi_1, button:has-text("매물목록 펼치기"), button:has-text("펼치기")')
@@ -228,6 +249,7 @@ async def collect_articles_from_complex(page, complex_url, complex_name, is_firs
             await random_sleep(2, 3)
         
         # 매물 URL 수집
+        laps.lap('매물 URL 수집')
         print(f"      → 매물 URL 수집 중...")
         
         all_article_links = await page.evaluate("""
@@ -265,23 +287,25 @@ async def collect_articles_from_complex(page, complex_url, complex_name, is_firs
                     visited_ids.add(article_id)
                     property_urls.append({
                         '매물ID': article_id,
-                        'URL': f"https://fin.land.naver.com/articles/{article_id}",
+                        'URL': f"{ARTICLE_BASE_URL}/articles/{article_id}",
                         '매물정보': link['text'][:50] if link['text'] else ''
                     })
         
         print(f"      ✓ {len(property_urls)}개 매물 URL 수집 완료")
         
         # 매물 URL 리스트와 실제 단지명을 함께 반환
+        laps.finish()
         return (property_urls, complex_name)
         
     except Exception as e:
         print(f"      ❌ 오류: {e}")
         import traceback
         traceback.print_exc()
+        laps.finish()
         return ([], complex_name) if not is_first_complex else ('CLICK_INFO', None)
 
-async def collect_all_properties(start_url, save_base_folder):
-    """모든 단지의 매물 URL 수집"""
+async def collect_all_properties(start_url, save_base_folder, block_resources=False, output='json'):
+    """모든 단지의 매물 URL 수집 (output: 단지별 결과 저장 방식, jsonl이면 단지 폴더 대신 압축 샤드 하나)"""
     
     user_agent = random.choice(USER_AGENTS)
     
@@ -316,6 +340,14 @@ async def collect_all_properties(start_url, save_base_folder):
             Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
             Object.defineProperty(navigator, 'languages', {get: () => ['ko-KR', 'ko']});
         """)
+
+        # 요청 차단 (단지 목록/매물 URL 수집에는 이미지가 필요 없음)
+        # 차단하지 않을 때도 off 프로필로 전송량/본문 표시 시간 집계 (차단 전/후 비교)
+        blocker = RequestBlocker('text' if block_resources else 'off')
+        await blocker.install(page, context)
+        
+        # 단지별 결과 저장 (jsonl은 묶음 단위로 이어쓰기)
+        sink = open_sink(output, save_base_folder, prefix='property_urls')
         
         try:
             print(f"\n{'='*80}")
@@ -355,7 +387,7 @@ async def collect_all_properties(start_url, save_base_folder):
                 print(f"   URL: {complex_url}")
                 
                 # 매물 URL 수집 (모든 단지에서 자동 클릭)
-                property_urls = await collect_articles_from_complex(page, complex_url, complex_name, False, None)
+                property_urls = await collect_articles_from_complex(page, complex_url, complex_name, False, None, blocker)
                 
                 if property_urls:
                     # 결과 저장 (collect_articles_from_complex에서 반환된 complex_name 사용)
@@ -377,16 +409,12 @@ async def collect_all_properties(start_url, save_base_folder):
                     all_results.append(complex_result)
                     total_properties += len(actual_urls)
                     
-                    # 개별 단지 파일 저장 (실제 단지명 사용)
+                    # 개별 단지 결과 저장 (json: 실제 단지명 폴더에 파일 하나)
                     safe_name = re.sub(r'[\\/:*?"<>|]', '_', actual_complex_name)
-                    folder_path = f"{save_base_folder}/{safe_name}"
-                    os.makedirs(folder_path, exist_ok=True)
-                    
-                    filename = f"{folder_path}/property_urls_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        json.dump(complex_result, f, ensure_ascii=False, indent=2)
+                    filename = f"{safe_name}/property_urls_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                    location = sink.write(complex_result, filename)
                     
-                    print(f"   ✓ 저장: {filename}")
+                    print(f"   ✓ 저장: {location}")
                 else:
                     print(f"   ℹ 매물 없음")
                 
@@ -396,12 +424,19 @@ async def collect_all_properties(start_url, save_base_folder):
                 await random_sleep(2, 4)
             
             # 4. 전체 결과 저장
+            sink.close()
             print(f"\n{'='*80}")
             print(f"전체 수집 완료")
             print(f"{'='*80}")
             print(f"전체 단지 수: {len(complex_list)}개")
             print(f"매물 수집 단지: {len(all_results)}개")
             print(f"총 매물 수: {total_properties}개")
+            print_block_stats(blocker.stats)
+            sink.print_stats()
+            print_stage_profile()
+            profile_path = write_stage_profile(save_base_folder)
+            if profile_path:
+                print(f"단계별 시간 저장: {profile_path}")
             print(f"{'='*80}\n")
             
             # 전체 요약 파일 저장
@@ -436,6 +471,7 @@ async def collect_all_properties(start_url, save_base_folder):
             print(f"\n❌ 오류 발생: {e}")
             import traceback
             traceback.print_exc()
+            sink.close()
             
             await asyncio.sleep(5)
             await browser.close()
@@ -443,6 +479,11 @@ async def collect_all_properties(start_url, save_base_folder):
 
 async def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="법정동별 매물 URL 수집기")
+    parser.add_argument('--block-resources', action='store_true', help="이미지/폰트/광고/분석 요청 차단")
+    parser.add_argument('--output', choices=['json', 'jsonl'], default='json',
+                        help="단지별 결과 저장 방식 (json: 단지 폴더마다 파일, jsonl: 압축 샤드, 기본 json)")
+    args = parser.parse_args()
     
     print("\n" + "="*80)
     print("법정동별 매물 URL 수집기")
@@ -487,7 +528,7 @@ async def main():
     print("="*80)
     print()
     
-    result = await collect_all_properties(start_url, save_base_folder)
+    result = await collect_all_properties(start_url, save_base_folder, args.block_resources, args.output)
     
     if result:
         print("\n✅ 전체 수집 성공!")
@@ -2,6 +2,7 @@
 법정동별 매물 URL 정리
 - 전체요약 JSON 파일에서 매물 URL만 추출
 - 중복 제거 및 정렬
+- 매물정보(목록 요약 문구)와 단지ID/단지명 유지 → 증분 수집(--incremental)에서 변경 여부 비교
 """
 import json
 import re
@@ -9,7 +10,7 @@ from datetime import datetime
 import os
 
 def extract_urls_from_summary(input_path):
-    """전체요약 파일에서 URL 추출"""
+    """전체요약 파일에서 URL 추출 (반환값: URL 정렬 목록, {URL: 매물정보/단지ID/단지명})"""
     
     print(f"\n{'='*80}")
     print(f"파일 읽기 중...")
@@ -26,18 +27,23 @@ def extract_urls_from_summary(input_path):
         # URL 추출
         print(f"URL 추출 중...\n")
         
-        all_urls = set()  # 중복 제거를 위해 set 사용
+        all_urls = {}  # 중복 제거 (URL → 매물정보/단지ID/단지명, 처음 나온 값 유지)
         
         # 단지목록에서 URL 추출
         if '단지목록' in data:
             for complex_data in data['단지목록']:
+                complex_info = complex_data.get('단지정보', {})
                 if '매물URL목록' in complex_data:
                     for item in complex_data['매물URL목록']:
                         if 'URL' in item:
                             url = item['URL']
                             # https://fin.land.naver.com/articles/{숫자} 패턴 확인
-                            if re.match(r'https://fin\.land\.naver\.com/articles/\d{5,}', url):
-                                all_urls.add(url)
+                            if re.match(r'https://fin\.land\.naver\.com/articles/\d{5,}', url) and url not in all_urls:
+                                all_urls[url] = {
+                                    '매물정보': item.get('매물정보', ''),
+                                    '단지ID': complex_info.get('단지ID'),
+                                    '단지명': complex_info.get('단지명'),
+                                }
         
         # URL 정렬 (숫자 순서대로)
         sorted_urls = sorted(list(all_urls), key=lambda x: int(re.search(r'/articles/(\d+)', x).group(1)))
@@ -57,22 +63,22 @@ def extract_urls_from_summary(input_path):
             if len(sorted_urls) > 10:
                 print(f"... 외 {len(sorted_urls) - 10}개\n")
         
-        return sorted_urls
+        return sorted_urls, all_urls
         
     except FileNotFoundError:
         print(f"❌ 파일을 찾을 수 없습니다: {input_path}")
-        return None
+        return None, None
     except json.JSONDecodeError:
         print(f"❌ JSON 파일 형식이 올바르지 않습니다")
-        return None
+        return None, None
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
         import traceback
         traceback.print_exc()
-        return None
+        return None, None
 
-def save_urls(urls, output_path):
-    """URL 목록을 JSON 파일로 저장"""
+def save_urls(urls, output_path, url_details=None):
+    """URL 목록을 JSON 파일로 저장 (url_details: {URL: 매물정보/단지ID/단지명})"""
     
     print(f"\n{'='*80}")
     print(f"파일 저장 중...")
@@ -92,7 +98,8 @@ def save_urls(urls, output_path):
             url_list.append({
                 '순번': idx,
                 '매물ID': article_id,
-                'URL': url
+                'URL': url,
+                **(url_details or {}).get(url, {})
             })
         
         # JSON 데이터 생성
@@ -147,7 +154,7 @@ def main():
         return
     
     # URL 추출
-    urls = extract_urls_from_summary(input_path)
+    urls, url_details = extract_urls_from_summary(input_path)
     
     if not urls:
         print("\n❌ URL을 추출할 수 없습니다")
@@ -167,7 +174,7 @@ def main():
         return
     
     # 파일 저장
-    success = save_urls(urls, output_path)
+    success = save_urls(urls, output_path, url_details)
     
     if success:
         print("✅ 완료!")
@@ -0,0 +1,316 @@
+"""
+크롤러 벤치마크 (로컬 픽스처 사이트, 실제 사이트에 요청 없음)
+- 픽스처 폴더에 매물이 없으면 고정 시드로 생성 (픽스처생성.py) → 실행마다 같은 코퍼스
+- 픽스처 서버(응답 지연 latency ± jitter)를 띄우고 매물/near 페이지 주소를 서버로 돌림
+- --collect-urls: 단지 목록 → collect_complex_urls → collect_articles_from_complex 로 매물 URL 수집부터 측정
+  (없으면 픽스처 매물 목록을 그대로 사용)
+- 매물은 법정동별매물수집.crawl_article 을 워커 풀로 실행 (--workers, --repeat), 저장은 --output 방식 (출력저장소.py)
+- 결과: 매물/분, 매물 지연 p50/p95, 서버 전송 바이트, 최대 메모리
+  (psutil이 있으면 브라우저 포함 프로세스 트리 RSS, 없으면 이 프로세스 최대 RSS)
+  + 요청 차단 프로필별 전송량/본문 표시 시간 (차단하지 않아도 off 로 집계)
+  + 단계별 시간 표 → 결과 폴더/벤치마크_{시각}.json
+- --block-resources both: 차단 없음(off) → 차단(text) 차례로 실행하고 두 결과를 나란히 출력
+- 실행: python 벤치마크.py [--fixture 폴더] [--workers 2] [--latency 0.08 --jitter 0.04] [--collect-urls]
+        [--block-resources off|text|both]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+import 법정동별url수집
+import 위치좌표
+from 단계계측 import STAGE_TIMES, percentile, print_stage_profile, stage_summary, write_stage_profile
+from 법정동별매물수집 import crawl_article, create_browser_pool
+from 브라우저풀 import run_worker_pool
+from 요청제한 import HostRateLimiter
+from 요청차단 import print_block_stats
+from 표시도구 import pad
+from 출력저장소 import OUTPUT_KINDS, open_sink
+from 파싱풀 import ParsePool
+from 픽스처생성 import generate_fixture_site
+from 픽스처서버 import fixture_url_list, start_fixture_server
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    # Windows에는 resource 모듈이 없음
+    resource = None
+
+# 메모리 측정 간격 (초)
+MEMORY_INTERVAL = 0.5
+
+# --block-resources 값 → 차례로 실행할 차단 프로필
+BLOCK_RUNS = {'off': ['off'], 'text': ['text'], 'both': ['off', 'text']}
+
+class MemorySampler:
+    """실행 중 최대 메모리 (psutil: 이 프로세스 + 자식 프로세스 RSS 합)"""
+
+    def __init__(self, interval=MEMORY_INTERVAL):
+        self.interval = interval
+        self.peak = 0
+        self._task = None
+
+    def sample(self):
+        process = psutil.Process()
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        self.peak = max(self.peak, total)
+
+    async def _run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if psutil is not None:
+            self._task = asyncio.ensure_future(self._run())
+        return self
+
+    async def stop(self):
+        """측정 종료 → {'전체_MB', '파이썬_MB', '방법'}"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        return {
+            '전체_MB': round(self.peak / 1024 / 1024, 1) if psutil is not None else None,
+            '파이썬_MB': python_peak_mb(),
+            '방법': 'psutil 프로세스 트리' if psutil is not None else 'resource (이 프로세스만)',
+        }
+
+def python_peak_mb():
+    """이 프로세스 최대 RSS (MB, 측정할 수 없으면 None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB
+    return round(peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024, 1)
+
+def latency_summary(values):
+    """지연 목록(초) → {'p50', 'p95', '최대'} (없으면 None)"""
+    if not values:
+        return None
+    return {'p50': round(percentile(values, 0.5), 3), 'p95': round(percentile(values, 0.95), 3),
+            '최대': round(max(values), 3)}
+
+def point_crawlers_at(base_url):
+    """매물/near 페이지 주소를 픽스처 서버로"""
+    위치좌표.NEAR_BASE_URL = base_url
+    법정동별url수집.ARTICLE_BASE_URL = base_url
+
+async def collect_fixture_urls(pool, base_url, complex_latencies):
+    """픽스처 단지 목록에서 매물 URL 수집 (법정동별url수집과 같은 함수)"""
+    url_list = []
+    async with pool.lease() as lease:
+        await lease.goto(f"{base_url}/regions", wait_until='domcontentloaded', timeout=60000)
+        complexes = await 법정동별url수집.collect_complex_urls(lease.page)
+        for complex_info in complexes:
+            started = time.perf_counter()
+            urls, _ = await 법정동별url수집.collect_articles_from_complex(
+                lease.page, complex_info['href'], complex_info['text'], blocker=lease.blocker)
+            complex_latencies.append(time.perf_counter() - started)
+            for url_info in urls:
+                url_list.append({**url_info, '단지ID': complex_info['complexId']})
+    return url_list
+
+async def run_benchmark(args, save_folder, image_folder, block_profile='off'):
+    """픽스처 서버 + 크롤러 실행 → 결과 dict (block_profile: 요청 차단 프로필, off 도 전송량 집계)"""
+    server, base_url = start_fixture_server(args.fixture, latency=args.latency, jitter=args.jitter)
+    point_crawlers_at(base_url)
+    limiter = HostRateLimiter(scale=args.rate_scale) if args.rate_limit else None
+    article_latencies = []
+    complex_latencies = []
+    counts = {'성공': 0, '실패': 0}
+    sink = open_sink(args.output, save_folder)
+    memory = MemorySampler().start()
+    started = time.perf_counter()
+    url_elapsed = 0.0
+
+    try:
+        async with ParsePool(args.parse_workers) as parse_pool, \
+                create_browser_pool(size=args.workers, limiter=limiter, block_profile=block_profile,
+                                    headless=not args.headed) as pool:
+            if args.collect_urls:
+                url_started = time.perf_counter()
+                url_list = await collect_fixture_urls(pool, base_url, complex_latencies)
+                url_elapsed = time.perf_counter() - url_started
+            else:
+                url_list = fixture_url_list(args.fixture, base_url)
+            targets = url_list * args.repeat
+            crawl_started = time.perf_counter()
+
+            async def crawl_one(idx, url_info):
+                article_started = time.perf_counter()
+                result = await crawl_article(url_info['URL'], save_folder, image_folder, pool, parse_pool=parse_pool)
+                article_latencies.append(time.perf_counter() - article_started)
+                if result:
+                    sink.write(result, f"article_{url_info['매물ID']}_{idx}.json")
+                    counts['성공'] += 1
+                else:
+                    counts['실패'] += 1
+
+            await run_worker_pool(targets, crawl_one, args.workers)
+            sink.close()
+            crawl_elapsed = time.perf_counter() - crawl_started
+            block_stats = pool.block_stats
+    finally:
+        server.shutdown()
+        memory_peak = await memory.stop()
+
+    processed = counts['성공'] + counts['실패']
+    return {
+        '설정': {
+            '픽스처': str(args.fixture),
+            '워커': args.workers,
+            '반복': args.repeat,
+            '응답지연_초': args.latency,
+            '지연흔들림_초': args.jitter,
+            '요청제한': args.rate_limit,
+            'URL수집': args.collect_urls,
+            '출력': args.output,
+            '요청차단': block_profile,
+        },
+        '매물': {**counts, '경과_초': round(crawl_elapsed, 2),
+                 '매물_분': round(processed / crawl_elapsed * 60, 2) if crawl_elapsed > 0 else 0.0,
+                 '지연_초': latency_summary(article_latencies)},
+        '출력': {**sink.stats, '저장바이트': sink.stored_bytes()},
+        '단지': {'수': len(complex_latencies), '매물URL': len(url_list), '경과_초': round(url_elapsed, 2),
+                 '지연_초': latency_summary(complex_latencies)} if args.collect_urls else None,
+        '전송': dict(server.traffic),
+        '요청차단': {name: {**s, '본문시간': round(s['본문시간'], 3)} for name, s in block_stats.items()},
+        '최대메모리': memory_peak,
+        '전체_초': round(time.perf_counter() - started, 2),
+    }
+
+def print_report(report):
+    """벤치마크 결과 출력"""
+    articles = report['매물']
+    print(f"\n{'='*80}")
+    print("벤치마크 결과")
+    print(f"{'='*80}")
+    print(f"매물: 성공 {articles['성공']}개, 실패 {articles['실패']}개, {articles['경과_초']}초 "
+          f"→ {articles['매물_분']}건/분 (워커 {report['설정']['워커']}개)")
+    if articles['지연_초']:
+        print(f"매물 지연: p50 {articles['지연_초']['p50']}초, p95 {articles['지연_초']['p95']}초, "
+              f"최대 {articles['지연_초']['최대']}초")
+    if report['단지']:
+        complexes = report['단지']
+        line = f"단지: {complexes['수']}개 → 매물 URL {complexes['매물URL']}개, {complexes['경과_초']}초"
+        if complexes['지연_초']:
+            line += f" (단지당 p50 {complexes['지연_초']['p50']}초, p95 {complexes['지연_초']['p95']}초)"
+        print(line)
+    traffic = report['전송']
+    output = report['출력']
+    print(f"출력 ({report['설정']['출력']}): {output['기록']}개 → 파일 {output['파일']}개, "
+          f"{output['저장바이트'] / 1024 / 1024:.2f}MB, 쓰기 {output['쓰기시간']:.2f}초")
+    print(f"전송: 요청 {traffic['요청']}회 (오류 {traffic['오류']}회), {traffic['바이트'] / 1024 / 1024:.2f}MB")
+    print_block_stats(report['요청차단'])
+    memory = report['최대메모리']
+    print(f"최대 메모리: 전체 {memory['전체_MB']}MB, 파이썬 {memory['파이썬_MB']}MB ({memory['방법']})")
+    print_stage_profile()
+
+def print_block_comparison(reports):
+    """차단 프로필별 실행 결과 나란히 (--block-resources both)"""
+    headers = ['매물/분', 'p50(초)', '서버MB', '브라우저MB', '본문(초)', '차단/요청']
+    print(f"\n요청 차단 비교 (같은 픽스처, 워커 {next(iter(reports.values()))['설정']['워커']}개):")
+    print("   " + pad('실행', 8) + ''.join(pad(h, 12, True) for h in headers))
+    for name, report in reports.items():
+        stats = report['요청차단'].values()
+        requests = sum(s['요청'] for s in stats)
+        blocked = sum(s['차단'] for s in stats)
+        measured = sum(s['본문측정'] for s in stats)
+        text_time = sum(s['본문시간'] for s in stats) / measured if measured else None
+        latency = report['매물']['지연_초']
+        values = [
+            f"{report['매물']['매물_분']}",
+            f"{latency['p50']}" if latency else '-',
+            f"{report['전송']['바이트'] / 1024 / 1024:.2f}",
+            f"{sum(s['전송바이트'] for s in stats) / 1024 / 1024:.2f}",
+            f"{text_time:.2f}" if text_time is not None else '-',
+            f"{blocked}/{requests}",
+        ]
+        print("   " + pad(name, 8) + ''.join(pad(v, 12, True) for v in values))
+
+def parse_args():
+    """명령행 옵션"""
+    parser = argparse.ArgumentParser(description="로컬 픽스처 사이트로 크롤러 벤치마크")
+    parser.add_argument('--fixture', default='벤치마크픽스처', help="픽스처 폴더 (매물이 없으면 생성, 기본 벤치마크픽스처)")
+    parser.add_argument('--complexes', type=int, default=4, help="생성할 단지 수 (기본 4)")
+    parser.add_argument('--articles', type=int, default=5, help="생성할 단지당 매물 수 (기본 5)")
+    parser.add_argument('--seed', type=int, default=0, help="픽스처 생성 시드 (기본 0)")
+    parser.add_argument('--latency', type=float, default=0.08, help="응답 지연(초, 기본 0.08)")
+    parser.add_argument('--jitter', type=float, default=0.04, help="응답 지연 흔들림(초, 기본 0.04)")
+    parser.add_argument('--workers', type=int, default=1, help="동시에 크롤링할 매물 수 (기본 1)")
+    parser.add_argument('--repeat', type=int, default=1, help="코퍼스 반복 횟수 (기본 1)")
+    parser.add_argument('--parse-workers', type=int, default=1, help="파싱 프로세스 수 (0: 이벤트 루프에서 파싱, 기본 1)")
+    parser.add_argument('--collect-urls', action='store_true', help="단지 목록에서 매물 URL 수집 단계부터 측정")
+    parser.add_argument('--rate-limit', action='store_true', help="호스트별 요청 제한 사용 (기본: 끔)")
+    parser.add_argument('--rate-scale', type=float, default=1.0, help="호스트별 요청 예산 배율 (기본 1.0)")
+    parser.add_argument('--headed', action='store_true', help="브라우저 창 표시 (기본: headless)")
+    parser.add_argument('--output', choices=OUTPUT_KINDS, default='json', help="매물 저장 방식 (기본 json)")
+    parser.add_argument('--block-resources', choices=list(BLOCK_RUNS), default='off',
+                        help="요청 차단 (off: 차단 없이 측정만, text: 차단, both: 두 가지를 차례로 실행해서 비교, 기본 off)")
+    parser.add_argument('--out', help="결과 폴더 (기본: 임시 폴더, 보고서는 현재 폴더)")
+    parser.add_argument('--verbose', action='store_true', help="크롤러 로그 출력")
+    return parser.parse_args()
+
+def main():
+    """메인 함수"""
+    args = parse_args()
+
+    if not list(Path(args.fixture, 'articles').glob('*.html')):
+        counts = generate_fixture_site(args.fixture, args.complexes, args.articles, args.seed)
+        print(f"✓ 픽스처 생성: {args.fixture} (단지 {counts['단지']}개, 매물 {counts['매물']}개, "
+              f"이미지 {counts['이미지']}장)")
+
+    work_folder = args.out or tempfile.mkdtemp(prefix='벤치마크_')
+    profiles = BLOCK_RUNS[args.block_resources]
+    print(f"벤치마크 시작: 워커 {args.workers}개, 응답 지연 {args.latency * 1000:.0f}ms ± {args.jitter * 1000:.0f}ms, "
+          f"요청 차단 {'/'.join(profiles)} (결과: {work_folder})")
+
+    reports = {}
+    for block_profile in profiles:
+        # 실행마다 따로 (이미지 중복 제거/단계 시간이 앞 실행과 섞이지 않도록)
+        run_folder = os.path.join(work_folder, block_profile) if len(profiles) > 1 else work_folder
+        save_folder = os.path.join(run_folder, '매물데이터')
+        image_folder = os.path.join(run_folder, '매물이미지데이터')
+        os.makedirs(save_folder, exist_ok=True)
+        os.makedirs(image_folder, exist_ok=True)
+        STAGE_TIMES.clear()
+
+        if args.verbose:
+            report = asyncio.run(run_benchmark(args, save_folder, image_folder, block_profile))
+        else:
+            with open(os.devnull, 'w', encoding='utf-8') as devnull, redirect_stdout(devnull):
+                report = asyncio.run(run_benchmark(args, save_folder, image_folder, block_profile))
+
+        if len(profiles) > 1:
+            print(f"\n[요청 차단: {block_profile}]")
+        print_report(report)
+        if len(profiles) > 1:
+            report['단계'] = stage_summary()
+        reports[block_profile] = report
+
+    if len(profiles) > 1:
+        print_block_comparison(reports)
+    report_path = write_stage_profile(args.out or '.', name='벤치마크',
+                                      extra={'벤치마크': reports if len(profiles) > 1 else report})
+    print(f"결과 저장: {report_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,559 @@
+"""
+분석용 표 저장소 (매물 JSON → 열 단위 표 + 집계 질의)
+- build: 매물 출력 폴더(하위 폴더 포함, json/jsonl/parquet 모두) → 표 두 개
+  - listings: 매물 한 행 (가격은 만원 정수, 면적/층/좌표/관리비는 숫자 열, 주소는 시도/구/동으로 분리)
+  - trades: 실거래 한 행 (단지 + 종류 + 계약일 + 층 + 가격 기준 중복 제거, 월세는 보증금/월세 따로)
+    → 빈 값(NULL)도 같은 값으로 보도록 거래키 문자열 열(기본 키)로 비교
+    → 단지는 단지ID, 없으면 구/동 + 단지명, 그것도 없으면 단지 주소 (모두 없는 매물의 실거래는 넣지 않고 셈)
+  - 같은 매물ID는 수집시간이 더 늦은 기록만 남김 (다시 build 하면 새 파일만 반영)
+- 저장 형식: duckdb 패키지가 있으면 DuckDB(열 저장) 파일, 없으면 SQLite (구/동/단지 인덱스) → 질의는 같은 SQL
+  - 쓰기는 명시 트랜잭션(BEGIN/COMMIT, DuckDB는 자동 커밋 모드), 매물은 ON CONFLICT 갱신, 거래는 ON CONFLICT 무시
+- export: listings/trades 표 → parquet 파일 (DuckDB는 COPY, SQLite는 pyarrow) → 다른 열 저장 도구에서 바로 읽음
+- query: 구/동/단지별 매물수, 평균 매매가, 평당가, 전용률, 관리비 (실거래는 --trades)
+- 실행:
+  python 분석저장소.py build 매물데이터 [--store 분석저장소.db]
+  python 분석저장소.py query --by 단지 --where 구=금천구 [--order 평당가_만원] [--top 20]
+  python 분석저장소.py query --trades 매매 --by 동
+  python 분석저장소.py query --sql "SELECT ..."
+  python 분석저장소.py export --folder 분석parquet
+"""
+import argparse
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from 가격정규화 import parse_price, parse_price_range, parse_rent
+from 표시도구 import display_width, pad
+from 출력저장소 import iter_records, output_files
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# 질의 오류 (잘못된 --sql 등)
+QUERY_ERRORS = (ValueError, sqlite3.Error) + ((duckdb.Error,) if duckdb is not None else ())
+
+STORE_FILE_NAME = '분석저장소.db'
+
+# 1평 = 3.305785㎡
+PYEONG_M2 = 3.305785
+
+# 한 번에 넣는 행 수
+INSERT_BATCH = 2000
+
+# 표 열 타입 → parquet 타입 (SQLite에서 내보낼 때)
+ARROW_TYPES = {'TEXT': 'string', 'BIGINT': 'int64', 'DOUBLE': 'float64'}
+
+# 시/군/구, 읍/면/동 으로 끝나는 주소 토큰
+DISTRICT_SUFFIXES = ('시', '군', '구')
+TOWN_SUFFIXES = ('동', '읍', '면', '가', '리')
+
+# ===== 값 정리 =====
+
+def get_path(record, path):
+    """'섹션.필드' 경로 값 (없으면 None)"""
+    value = record
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+def first_value(record, *paths):
+    """여러 경로 중 처음으로 값이 있는 것"""
+    for path in paths:
+        value = get_path(record, path)
+        if value not in (None, ''):
+            return value
+    return None
+
+def to_number(value, kind=float):
+    if value in (None, ''):
+        return None
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        return None
+
+def split_address(text):
+    """'서울시 금천구 가산동 769' → ('서울시', '금천구', '가산동') (시/군/구가 여러 개면 이어붙임)"""
+    if not text:
+        return None, None, None
+    tokens = text.split()
+    districts = []
+    town = None
+    for token in tokens[1:]:
+        if town is None and token.endswith(TOWN_SUFFIXES) and districts:
+            town = token
+            break
+        if token.endswith(DISTRICT_SUFFIXES):
+            districts.append(token)
+    return tokens[0], ' '.join(districts) or None, town
+
+def management_fee(record):
+    """관리비(만원, 소수): 관리비 합계(원)가 있으면 그것, 없으면 기본정보 관리비_만원"""
+    total = to_number(get_path(record, '관리비.관리비합계_원'))
+    if total:
+        return round(total / 10000, 1)
+    return to_number(get_path(record, '기본정보.관리비_만원'))
+
+# ===== 표 구조 =====
+
+def listing_row(record):
+    """매물 JSON → listings 한 행 {열: 값}"""
+    address = get_path(record, '단지정보.위치')
+    sido, district, town = split_address(address)
+    supply = to_number(first_value(record, '기본정보.공급면적_제곱미터', '매물정보.공급면적_제곱미터'))
+    exclusive = to_number(first_value(record, '기본정보.전용면적_제곱미터', '매물정보.전용면적_제곱미터'))
+    price = parse_price(first_value(record, '기본정보.매매가_만원', '기본정보.매매가'))
+    low, high = (first_value(record, '매물분포.가격범위_최저_만원'), first_value(record, '매물분포.가격범위_최고_만원'))
+    if low is None:
+        low, high = parse_price_range(get_path(record, '매물분포.가격범위'))
+    ratio = to_number(get_path(record, '기본정보.전용률_퍼센트'))
+    if ratio is None and supply and exclusive:
+        ratio = round(exclusive / supply * 100, 1)
+    return {
+        '매물ID': str(get_path(record, '메타정보.매물ID') or ''),
+        '수집시간': get_path(record, '메타정보.수집시간'),
+        '시도': sido,
+        '구': district,
+        '동': town,
+        '단지': address,
+        '단지ID': str(get_path(record, '메타정보.단지ID') or '') or None,
+        '단지명': get_path(record, '매물정보.단지명'),
+        '매매가_만원': price,
+        'KB시세_만원': parse_price(first_value(record, '대출계산기.KB시세_만원', '대출계산기.KB시세')),
+        '대출최대금액_만원': parse_price(first_value(record, '대출정보.대출한도.최대금액_만원',
+                                                   '대출정보.대출한도.최대금액')),
+        '가격범위_최저_만원': low,
+        '가격범위_최고_만원': high,
+        '공급면적_제곱미터': supply,
+        '전용면적_제곱미터': exclusive,
+        '전용률_퍼센트': ratio,
+        '평당가_만원': round(price / (supply / PYEONG_M2)) if price and supply else None,
+        '관리비_만원': management_fee(record),
+        '해당층': to_number(first_value(record, '기본정보.해당층', '매물정보.해당층'), int),
+        '총층수': to_number(first_value(record, '기본정보.총층수', '매물정보.총층수'), int),
+        '방수': to_number(get_path(record, '기본정보.방수'), int),
+        '욕실수': to_number(get_path(record, '기본정보.욕실수'), int),
+        '향': first_value(record, '기본정보.향', '매물정보.향'),
+        '위도': to_number(get_path(record, '단지정보.위도')),
+        '경도': to_number(get_path(record, '단지정보.경도')),
+        '건물연차': to_number(get_path(record, '단지정보.건물연차'), int),
+        '총세대수': to_number(get_path(record, '단지정보.총세대수'), int),
+    }
+
+def complex_identity(row):
+    """거래키의 단지 구분 값: 단지ID → 구/동 + 단지명 → 단지 주소 (모두 없으면 None)"""
+    if row['단지ID']:
+        return f"단지ID {row['단지ID']}"
+    if row['단지명'] and (row['구'] or row['동']):
+        return ' '.join(value for value in (row['구'], row['동'], row['단지명']) if value)
+    return row['단지'] or None
+
+def trade_rows(record, listing):
+    """매물 JSON의 실거래가 → trades 행 목록 (단지를 구분할 수 없으면 빈 목록)"""
+    rows = []
+    if complex_identity(listing) is None:
+        return rows
+    for kind in ('매매', '전세', '월세'):
+        for trans in get_path(record, f'실거래가.{kind}') or []:
+            if kind == '월세':
+                deposit, monthly = parse_rent(trans.get('가격'))
+                price = trans.get('가격_만원', deposit)
+                monthly = trans.get('월세_만원', monthly)
+            else:
+                price, monthly = trans.get('가격_만원') or parse_price(trans.get('가격')), None
+            row = {
+                '단지': listing['단지'],
+                '단지ID': listing['단지ID'],
+                '단지명': listing['단지명'],
+                '구': listing['구'],
+                '동': listing['동'],
+                '종류': kind,
+                '계약일': trans.get('계약일'),
+                '층': to_number(trans.get('층'), int),
+                '가격_만원': price,
+                '월세_만원': monthly,
+                '전용면적_제곱미터': listing['전용면적_제곱미터'],
+            }
+            row['거래키'] = trade_key(row)
+            rows.append(row)
+    return rows
+
+# 열 이름 → 타입 (DuckDB/SQLite 공통)
+LISTING_COLUMNS = {
+    '매물ID': 'TEXT PRIMARY KEY', '수집시간': 'TEXT', '시도': 'TEXT', '구': 'TEXT', '동': 'TEXT', '단지': 'TEXT',
+    '단지ID': 'TEXT', '단지명': 'TEXT', '매매가_만원': 'BIGINT', 'KB시세_만원': 'BIGINT', '대출최대금액_만원': 'BIGINT',
+    '가격범위_최저_만원': 'BIGINT', '가격범위_최고_만원': 'BIGINT', '공급면적_제곱미터': 'DOUBLE',
+    '전용면적_제곱미터': 'DOUBLE', '전용률_퍼센트': 'DOUBLE', '평당가_만원': 'BIGINT', '관리비_만원': 'DOUBLE',
+    '해당층': 'BIGINT', '총층수': 'BIGINT', '방수': 'BIGINT', '욕실수': 'BIGINT', '향': 'TEXT',
+    '위도': 'DOUBLE', '경도': 'DOUBLE', '건물연차': 'BIGINT', '총세대수': 'BIGINT',
+}
+TRADE_COLUMNS = {
+    '거래키': 'TEXT PRIMARY KEY', '단지': 'TEXT', '단지ID': 'TEXT', '단지명': 'TEXT', '구': 'TEXT', '동': 'TEXT',
+    '종류': 'TEXT', '계약일': 'TEXT', '층': 'BIGINT',
+    '가격_만원': 'BIGINT', '월세_만원': 'BIGINT', '전용면적_제곱미터': 'DOUBLE',
+}
+# 같은 단지 매물은 실거래가 목록이 같음 → 단지 구분 값(complex_identity) + 이 열 기준으로 한 번만
+# (UNIQUE는 NULL끼리 다르다고 보므로 빈 값을 ''로 바꾼 문자열로 비교)
+TRADE_KEY = ('종류', '계약일', '층', '가격_만원', '월세_만원')
+
+def trade_key(row):
+    """단지 구분 값 + TRADE_KEY 열 → 거래키 문자열 (빈 값은 '')"""
+    values = [complex_identity(row)] + ['' if row[name] is None else str(row[name]) for name in TRADE_KEY]
+    return '\x1f'.join(values)
+
+# 집계 항목 (--metrics 이름 → SQL)
+LISTING_METRICS = {
+    '매물수': 'COUNT(*)',
+    '매매가_만원': 'ROUND(AVG("매매가_만원"))',
+    '평당가_만원': 'ROUND(AVG("평당가_만원"))',
+    '전용률_퍼센트': 'ROUND(AVG("전용률_퍼센트"), 1)',
+    '관리비_만원': 'ROUND(AVG("관리비_만원"), 1)',
+    '전용면적_제곱미터': 'ROUND(AVG("전용면적_제곱미터"), 1)',
+}
+TRADE_METRICS = {
+    '거래수': 'COUNT(*)',
+    '평균가격_만원': 'ROUND(AVG("가격_만원"))',
+    '최저가격_만원': 'MIN("가격_만원")',
+    '최고가격_만원': 'MAX("가격_만원")',
+    '평균월세_만원': 'ROUND(AVG("월세_만원"))',
+    '최근계약일': 'MAX("계약일")',
+}
+
+# --by 이름 → 묶는 열
+GROUPS = {'구': ['구'], '동': ['구', '동'], '단지': ['구', '동', '단지']}
+
+# ===== 저장소 =====
+
+def quote(name):
+    return f'"{name}"'
+
+def detect_backend(path):
+    """이미 있는 파일은 머리글로 (SQLite 파일은 'SQLite format 3'), 새 파일은 duckdb 있으면 duckdb"""
+    path = Path(path)
+    if path.exists() and path.stat().st_size:
+        with open(path, 'rb') as f:
+            return 'sqlite' if f.read(16).startswith(b'SQLite format 3') else 'duckdb'
+    return 'duckdb' if duckdb is not None else 'sqlite'
+
+class AnalyticsStore:
+    """listings/trades 표 (DuckDB 또는 SQLite, with 문 또는 close())"""
+
+    def __init__(self, path=STORE_FILE_NAME, backend=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.backend = backend or detect_backend(self.path)
+        if self.backend == 'duckdb':
+            if duckdb is None:
+                raise RuntimeError("duckdb 패키지가 필요합니다 (pip install duckdb)")
+            self.conn = duckdb.connect(str(self.path))
+        else:
+            self.conn = sqlite3.connect(str(self.path))
+            self.conn.execute('PRAGMA journal_mode=WAL')
+        self._create()
+
+    def _create(self):
+        listing_columns = ', '.join(f'{quote(name)} {spec}' for name, spec in LISTING_COLUMNS.items())
+        trade_columns = ', '.join(f'{quote(name)} {spec}' for name, spec in TRADE_COLUMNS.items())
+        if self._outdated():
+            # 이전 형식(거래키 없음 / 단지 주소만으로 만든 거래키) → 표를 비우고 다시 만듦
+            print("     ℹ 이전 형식 저장소 → 표를 다시 만듭니다 (build를 다시 실행하세요)")
+            self.conn.execute('DROP TABLE IF EXISTS trades')
+            self.conn.execute('DROP TABLE IF EXISTS listings')
+        self.conn.execute(f'CREATE TABLE IF NOT EXISTS listings ({listing_columns})')
+        self.conn.execute(f'CREATE TABLE IF NOT EXISTS trades ({trade_columns})')
+        if self.backend == 'sqlite':
+            # DuckDB는 열 단위로 훑으므로 인덱스 없음
+            for name in ('구', '동', '단지'):
+                self.conn.execute(f'CREATE INDEX IF NOT EXISTS listings_{name} ON listings ({quote(name)})')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS trades_group ON trades ("구", "동", "단지")')
+            self.conn.commit()
+
+    def _outdated(self):
+        """listings/trades 표가 있는데 지금 형식의 열(거래키, 단지ID 등)이 빠져 있으면 True"""
+        for table, columns in (('listings', LISTING_COLUMNS), ('trades', TRADE_COLUMNS)):
+            if self._has_table(table):
+                cursor = self.conn.execute(f'SELECT * FROM {table} LIMIT 0')
+                if set(columns) - {d[0] for d in cursor.description}:
+                    return True
+        return False
+
+    def _has_table(self, name):
+        sql = ("SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?" if self.backend == 'sqlite'
+               else "SELECT table_name FROM information_schema.tables WHERE table_name = ?")
+        return self.conn.execute(sql, (name,)).fetchone() is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        if self.backend == 'sqlite':
+            self.conn.commit()
+        self.conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """쓰기 묶음 (SQLite는 with conn, DuckDB는 자동 커밋 모드라 BEGIN/COMMIT을 직접)"""
+        if self.backend == 'sqlite':
+            with self.conn:
+                yield
+            return
+        self.conn.execute('BEGIN TRANSACTION')
+        try:
+            yield
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        self.conn.execute('COMMIT')
+
+    def collected_times(self):
+        """매물ID → 저장된 수집시간"""
+        return dict(self.conn.execute('SELECT "매물ID", "수집시간" FROM listings').fetchall())
+
+    def _insert(self, table, columns, rows, key, replace=False):
+        """행 넣기 (같은 key가 있으면 replace=True는 나머지 열 갱신, False는 건너뜀)"""
+        if not rows:
+            return
+        names = ', '.join(quote(name) for name in columns)
+        marks = ', '.join('?' for _ in columns)
+        if replace:
+            updates = ', '.join(f'{quote(name)} = excluded.{quote(name)}' for name in columns if name != key)
+            conflict = f'ON CONFLICT ({quote(key)}) DO UPDATE SET {updates}'
+        else:
+            conflict = f'ON CONFLICT ({quote(key)}) DO NOTHING'
+        self.conn.executemany(f'INSERT INTO {table} ({names}) VALUES ({marks}) {conflict}',
+                              [tuple(row[name] for name in columns) for row in rows])
+
+    def ingest(self, records):
+        """매물 기록 → 표 (수집시간이 같거나 이전인 매물은 건너뜀) → {'매물', '거래', '건너뜀', '단지없음'}
+        - 거래: 실제로 새로 들어간 거래 수 (이미 있는 거래키는 넣지 않음)
+        - 단지없음: 단지ID/단지명/주소가 모두 없어 실거래를 넣지 않은 매물 수 (다른 단지 거래와 섞이지 않도록)
+        """
+        known = self.collected_times()
+        trades_before = self.table_counts()['trades']
+        counts = {'매물': 0, '거래': 0, '건너뜀': 0, '단지없음': 0}
+        # 한 묶음 안에서도 키가 겹치지 않게 (DuckDB는 한 번에 같은 행을 두 번 갱신하지 못함)
+        listings, trades = {}, {}
+        for record in records:
+            listing = listing_row(record)
+            article_id = listing['매물ID']
+            if not article_id or (article_id in known and (listing['수집시간'] or '') <= (known[article_id] or '')):
+                counts['건너뜀'] += 1
+                continue
+            known[article_id] = listing['수집시간']
+            listings[article_id] = listing
+            if complex_identity(listing) is None and any((get_path(record, '실거래가') or {}).values()):
+                counts['단지없음'] += 1
+            for trade in trade_rows(record, listing):
+                trades.setdefault(trade['거래키'], trade)
+            if len(listings) >= INSERT_BATCH:
+                counts['매물'] += len(listings)
+                self._flush(list(listings.values()), list(trades.values()))
+                listings, trades = {}, {}
+        counts['매물'] += len(listings)
+        self._flush(list(listings.values()), list(trades.values()))
+        counts['거래'] = self.table_counts()['trades'] - trades_before
+        return counts
+
+    def _flush(self, listings, trades):
+        with self.transaction():
+            self._insert('listings', list(LISTING_COLUMNS), listings, '매물ID', replace=True)
+            self._insert('trades', list(TRADE_COLUMNS), trades, '거래키')
+
+    def table_counts(self):
+        return {table: self.conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                for table in ('listings', 'trades')}
+
+    def execute(self, sql, params=()):
+        """SQL → (열 이름 목록, 행 목록)"""
+        cursor = self.conn.execute(sql, params)
+        columns = [d[0] for d in cursor.description] if cursor.description else []
+        return columns, cursor.fetchall()
+
+    def aggregate(self, by='구', metrics=None, where=None, trades=None, order=None, top=None):
+        """
+        구/동/단지별 집계 → (열 이름 목록, 행 목록)
+        - metrics: 집계 항목 이름 (기본: 전부)
+        - where: {'열': 값} 같음 조건
+        - trades: '매매'/'전세'/'월세' 이면 실거래 표 집계
+        - order: 정렬 열 (기본: 첫 번째 집계 항목, 큰 값부터)
+        """
+        table, table_metrics = ('trades', TRADE_METRICS) if trades else ('listings', LISTING_METRICS)
+        metrics = metrics or list(table_metrics)
+        unknown = [name for name in metrics if name not in table_metrics]
+        if unknown:
+            raise ValueError(f"알 수 없는 집계 항목: {', '.join(unknown)} ({', '.join(table_metrics)})")
+        keys = GROUPS[by]
+        conditions = dict(where or {})
+        if trades:
+            conditions['종류'] = trades
+        select = [quote(key) for key in keys] + [f'{table_metrics[name]} AS {quote(name)}' for name in metrics]
+        sql = f'SELECT {", ".join(select)} FROM {table}'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(f'{quote(name)} = ?' for name in conditions)
+        sql += f' GROUP BY {", ".join(quote(key) for key in keys)}'
+        sql += f' ORDER BY {quote(order or metrics[0])} DESC'
+        if top:
+            sql += f' LIMIT {int(top)}'
+        return self.execute(sql, tuple(conditions.values()))
+
+    def export_parquet(self, folder):
+        """listings/trades 표 → folder/{표}.parquet → {표: 경로}"""
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        paths = {}
+        for table, columns in (('listings', LISTING_COLUMNS), ('trades', TRADE_COLUMNS)):
+            path = folder / f'{table}.parquet'
+            if self.backend == 'duckdb':
+                target = str(path).replace("'", "''")
+                self.conn.execute(f"COPY {table} TO '{target}' (FORMAT PARQUET, COMPRESSION ZSTD)")
+            else:
+                self._write_parquet(table, columns, path)
+            paths[table] = path
+        return paths
+
+    def _write_parquet(self, table, columns, path):
+        """SQLite 표 → parquet (INSERT_BATCH 행씩)"""
+        if pa is None:
+            raise RuntimeError("SQLite 저장소를 parquet로 내보내려면 pyarrow 패키지가 필요합니다 (pip install pyarrow)")
+        schema = pa.schema([(name, getattr(pa, ARROW_TYPES[spec.split()[0]])()) for name, spec in columns.items()])
+        cursor = self.conn.execute(f'SELECT {", ".join(quote(name) for name in columns)} FROM {table}')
+        with pq.ParquetWriter(str(path), schema, compression='zstd') as writer:
+            while True:
+                rows = cursor.fetchmany(INSERT_BATCH)
+                if not rows:
+                    break
+                writer.write_table(pa.Table.from_pylist([dict(zip(columns, row)) for row in rows], schema=schema))
+
+# ===== 만들기 =====
+
+def source_folders(root):
+    """출력 파일이 있는 폴더 (root 포함 하위 전체)"""
+    root = Path(root)
+    folders = [root] + sorted(p for p in root.rglob('*') if p.is_dir())
+    return [folder for folder in folders if output_files(folder)]
+
+def build_store(roots, store_path=STORE_FILE_NAME, backend=None):
+    """매물 출력 폴더들 → 분석 저장소 → (집계, 표 행 수, 초)"""
+    started = time.perf_counter()
+    totals = {'매물': 0, '거래': 0, '건너뜀': 0, '단지없음': 0}
+    with AnalyticsStore(store_path, backend) as store:
+        for root in roots:
+            for folder in source_folders(root):
+                counts = store.ingest(iter_records(folder))
+                for key, value in counts.items():
+                    totals[key] += value
+                print(f"   ✓ {folder}: 매물 {counts['매물']}개, 거래 {counts['거래']}건 (건너뜀 {counts['건너뜀']}개)")
+                if counts['단지없음']:
+                    print(f"     ℹ 단지를 구분할 수 없는 매물 {counts['단지없음']}개 → 실거래 제외")
+        table_counts = store.table_counts()
+    return totals, table_counts, time.perf_counter() - started
+
+# ===== 출력 =====
+
+def format_cell(value):
+    if value is None:
+        return '-'
+    if isinstance(value, float):
+        return f"{value:,.1f}" if not value.is_integer() else f"{int(value):,}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
+
+def print_table(columns, rows):
+    """표 출력 (한글 폭 맞춤, 숫자는 오른쪽 정렬)"""
+    cells = [[format_cell(value) for value in row] for row in rows]
+    numeric = [all(isinstance(row[i], (int, float)) or row[i] is None for row in rows) for i in range(len(columns))]
+    widths = [max([display_width(name)] + [display_width(row[i]) for row in cells]) for i, name in enumerate(columns)]
+    print("   " + '  '.join(pad(name, widths[i], numeric[i]) for i, name in enumerate(columns)))
+    for row in cells:
+        print("   " + '  '.join(pad(value, widths[i], numeric[i]) for i, value in enumerate(row)))
+
+def parse_where(items):
+    """['구=금천구', ...] → {'구': '금천구'}"""
+    conditions = {}
+    for item in items or []:
+        name, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f"조건은 열=값 형식: {item}")
+        conditions[name.strip()] = value.strip()
+    return conditions
+
+def main():
+    parser = argparse.ArgumentParser(description="매물 분석 저장소 만들기/집계")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="매물 출력 폴더 → 분석 저장소")
+    build.add_argument('folders', nargs='+', help="매물 데이터 폴더 (하위 폴더 포함)")
+    build.add_argument('--store', default=STORE_FILE_NAME, help=f"저장소 파일 (기본 {STORE_FILE_NAME})")
+    build.add_argument('--backend', choices=['duckdb', 'sqlite'], help="저장 형식 (기본: duckdb 있으면 duckdb)")
+
+    query = commands.add_parser('query', help="구/동/단지별 집계")
+    query.add_argument('--store', default=STORE_FILE_NAME, help=f"저장소 파일 (기본 {STORE_FILE_NAME})")
+    query.add_argument('--by', choices=list(GROUPS), default='구', help="묶는 단위 (기본 구)")
+    query.add_argument('--metrics', nargs='+', help=f"집계 항목 (매물: {', '.join(LISTING_METRICS)} / "
+                                                     f"실거래: {', '.join(TRADE_METRICS)})")
+    query.add_argument('--where', nargs='+', help="조건 (예: 구=금천구 동=가산동)")
+    query.add_argument('--trades', choices=['매매', '전세', '월세'], help="실거래 표 집계")
+    query.add_argument('--order', help="정렬 열 (기본: 첫 집계 항목)")
+    query.add_argument('--top', type=int, help="상위 N개만")
+    query.add_argument('--sql', help="직접 SQL (listings, trades 표)")
+
+    export = commands.add_parser('export', help="listings/trades 표 → parquet 파일")
+    export.add_argument('--store', default=STORE_FILE_NAME, help=f"저장소 파일 (기본 {STORE_FILE_NAME})")
+    export.add_argument('--folder', required=True, help="parquet 파일을 쓸 폴더")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        print(f"\n분석 저장소 만들기: {args.store}")
+        totals, table_counts, elapsed = build_store(args.folders, args.store, args.backend)
+        print(f"\n✅ 매물 {totals['매물']}개, 거래 {totals['거래']}건 추가 (건너뜀 {totals['건너뜀']}개), {elapsed:.1f}초")
+        print(f"   표: listings {table_counts['listings']}행, trades {table_counts['trades']}행 (중복 거래 제외)")
+        if totals['단지없음']:
+            print(f"   ℹ 단지를 구분할 수 없어 실거래를 넣지 않은 매물 {totals['단지없음']}개")
+        return
+
+    if not Path(args.store).exists():
+        print(f"❌ 저장소가 없습니다: {args.store} (먼저 build)")
+        return
+    if args.command == 'export':
+        with AnalyticsStore(args.store) as store:
+            try:
+                paths = store.export_parquet(args.folder)
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                return
+            table_counts = store.table_counts()
+        for table, path in paths.items():
+            print(f"   ✓ {path}: {table_counts[table]}행 ({path.stat().st_size / 1024:.0f}KB)")
+        return
+
+    with AnalyticsStore(args.store) as store:
+        started = time.perf_counter()
+        try:
+            if args.sql:
+                columns, rows = store.execute(args.sql)
+            else:
+                columns, rows = store.aggregate(args.by, args.metrics, parse_where(args.where), args.trades,
+                                                args.order, args.top)
+        except QUERY_ERRORS as e:
+            print(f"❌ {e}")
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        print_table(columns, rows)
+        print(f"\n{len(rows)}행, {elapsed:.1f}ms ({store.backend})")
+
+if __name__ == "__main__":
+    main()
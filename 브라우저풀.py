@@ -0,0 +1,283 @@
+"""
+브라우저 풀
+- Chromium을 한 번만 실행하고 컨텍스트/페이지를 재사용
+- 일정 건수(max_uses) 처리 후 또는 오류 발생 시 컨텍스트 재생성
+- 브라우저가 죽으면 자동으로 재실행
+- 수집기(crawl_article)는 pool.lease()로 워밍된 페이지를 빌려서 사용
+- run_worker_pool()로 여러 매물을 동시에 처리 (워커 수 = 풀 크기)
+- 이미지 다운로드용 요청 컨텍스트(keep-alive)를 풀 전체에서 공유
+- block_profile 지정 시 페이지마다 요청 차단기(요청차단.py) 설치
+"""
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright
+from 단계계측 import record_stage
+from 요청차단 import RequestBlocker, print_block_stats
+
+# 기본 브라우저 실행 옵션
+DEFAULT_LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+]
+
+# 이미지 다운로드 요청 헤더
+IMAGE_REQUEST_HEADERS = {
+    'Accept': 'image/avif,image/webp,image/apng,image/*,*/*;q=0.8',
+    'Accept-Language': 'ko-KR,ko;q=0.9',
+}
+
+class PageLease:
+    """풀에서 빌려준 페이지 (컨텍스트 + 페이지 + User-Agent + 공유 요청 컨텍스트)"""
+
+    def __init__(self, context, page, user_agent, limiter=None, request=None, blocker=None):
+        self.context = context
+        self.page = page
+        self.user_agent = user_agent
+        self.limiter = limiter
+        self.request = request
+        self.blocker = blocker
+        self.uses = 0
+        self.broken = False
+
+    async def goto(self, url, **kwargs):
+        """요청 제한(토큰 버킷)을 거쳐 페이지 이동 (차단기가 있으면 본문 표시 시간 기록)"""
+        if self.limiter is not None:
+            waited = time.perf_counter()
+            await self.limiter.acquire(url)
+            record_stage('요청 제한 대기', time.perf_counter() - waited)
+        started = time.perf_counter()
+        response = await self.page.goto(url, **kwargs)
+        if self.blocker is not None:
+            await self.blocker.wait_for_text(self.page, started)
+        record_stage('page.goto', time.perf_counter() - started)
+        return response
+
+    def mark_broken(self):
+        """오류 발생 표시 (반납 시 컨텍스트 재생성)"""
+        self.broken = True
+
+class BrowserPool:
+    """장기 실행 브라우저 풀"""
+
+    def __init__(self, user_agents, size=1, max_uses=20, headless=False,
+                 launch_args=None, context_options=None, extra_headers=None,
+                 init_script=None, random_viewport=True, limiter=None, block_profile=None):
+        self.user_agents = user_agents
+        self.size = size
+        self.max_uses = max_uses
+        self.headless = headless
+        self.launch_args = launch_args or DEFAULT_LAUNCH_ARGS
+        self.context_options = context_options or {}
+        self.extra_headers = extra_headers
+        self.init_script = init_script
+        self.random_viewport = random_viewport
+        self.limiter = limiter
+        self.block_profile = block_profile
+        self.block_stats = {}
+
+        self.browser = None
+        self.request = None
+        self._playwright = None
+        self._idle = None
+        self._created = 0
+        self._launch_lock = None
+        self.stats = {
+            '브라우저실행': 0,
+            '컨텍스트생성': 0,
+            '재활용': 0,
+            '오류재생성': 0,
+            '대여': 0,
+        }
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """Playwright 시작 및 브라우저 실행"""
+        self._idle = asyncio.Queue()
+        self._launch_lock = asyncio.Lock()
+        self._playwright = await async_playwright().start()
+        await self._ensure_browser()
+        # 이미지 다운로드용 공유 요청 컨텍스트 (연결 재사용)
+        self.request = await self._playwright.request.new_context(
+            user_agent=random.choice(self.user_agents),
+            extra_http_headers=IMAGE_REQUEST_HEADERS,
+        )
+
+    async def close(self):
+        """모든 컨텍스트와 브라우저 종료"""
+        while self._idle is not None and not self._idle.empty():
+            lease = self._idle.get_nowait()
+            if lease is not None:
+                await self._close_lease(lease)
+        if self.request is not None:
+            try:
+                await self.request.dispose()
+            except Exception:
+                pass
+            self.request = None
+        if self.browser is not None:
+            try:
+                await self.browser.close()
+            except Exception:
+                pass
+            self.browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _ensure_browser(self):
+        """브라우저가 없거나 죽었으면 (재)실행"""
+        async with self._launch_lock:
+            if self.browser is not None and self.browser.is_connected():
+                return
+            if self.browser is not None:
+                print("   ⚠ 브라우저 연결 끊김 → 재실행")
+            self.browser = await self._playwright.chromium.launch(
+                headless=self.headless,
+                args=self.launch_args,
+            )
+            self.stats['브라우저실행'] += 1
+
+    async def _new_lease(self):
+        """새 컨텍스트/페이지 생성"""
+        await self._ensure_browser()
+
+        user_agent = random.choice(self.user_agents)
+        options = dict(self.context_options)
+        if self.random_viewport and 'viewport' not in options:
+            options['viewport'] = {'width': random.randint(1366, 1920), 'height': random.randint(768, 1080)}
+
+        context = await self.browser.new_context(
+            user_agent=user_agent,
+            locale='ko-KR',
+            timezone_id='Asia/Seoul',
+            **options,
+        )
+        if self.extra_headers:
+            await context.set_extra_http_headers(self.extra_headers)
+
+        page = await context.new_page()
+        if self.init_script:
+            await page.add_init_script(self.init_script)
+
+        blocker = None
+        if self.block_profile:
+            blocker = RequestBlocker(self.block_profile, self.block_stats)
+            await blocker.install(page, context)
+
+        self.stats['컨텍스트생성'] += 1
+        return PageLease(context, page, user_agent, self.limiter, self.request, blocker)
+
+    async def _close_lease(self, lease):
+        """컨텍스트 종료 (오류 무시)"""
+        try:
+            await lease.context.close()
+        except Exception:
+            pass
+
+    async def _acquire(self):
+        """유휴 페이지를 꺼내거나 여유가 있으면 새로 생성"""
+        while True:
+            if self._idle.empty() and self._created < self.size:
+                self._created += 1
+                try:
+                    return await self._new_lease()
+                except Exception:
+                    self._created -= 1
+                    raise
+            lease = await self._idle.get()
+            # None은 슬롯이 비었다는 신호 → 다시 생성 시도
+            if lease is not None:
+                return lease
+
+    async def _release(self, lease):
+        """반납: 사용 횟수 초과/오류 시 폐기, 아니면 유휴 큐로"""
+        lease.uses += 1
+        expired = lease.uses >= self.max_uses
+        if lease.broken or expired or lease.page.is_closed():
+            if lease.broken:
+                self.stats['오류재생성'] += 1
+            else:
+                self.stats['재활용'] += 1
+            await self._close_lease(lease)
+            self._created -= 1
+            self._idle.put_nowait(None)
+        else:
+            self._idle.put_nowait(lease)
+
+    @asynccontextmanager
+    async def lease(self):
+        """워밍된 페이지 대여 (async with pool.lease() as lease: ...)"""
+        lease = await self._acquire()
+        self.stats['대여'] += 1
+        if lease.blocker is not None:
+            lease.blocker.set_profile(self.block_profile)
+            lease.blocker.begin_article()
+        try:
+            yield lease
+        except BaseException:
+            lease.mark_broken()
+            raise
+        finally:
+            if lease.blocker is not None:
+                lease.blocker.print_article()
+            await self._release(lease)
+
+    def print_stats(self):
+        """풀 사용 통계 출력"""
+        print(f"브라우저 풀: " + ", ".join(f"{k} {v}회" for k, v in self.stats.items()))
+        if self.block_stats:
+            print_block_stats(self.block_stats)
+
+async def run_worker_pool(items, handle, workers=1):
+    """
+    items를 N개의 워커가 나눠서 처리
+    - handle(idx, item)은 코루틴, idx는 1부터 시작
+    - 한 워커에서 예외가 나도 나머지 워커는 계속 진행
+    """
+    queue = asyncio.Queue()
+    for idx, item in enumerate(items, 1):
+        queue.put_nowait((idx, item))
+
+    async def worker():
+        while True:
+            try:
+                idx, item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                await handle(idx, item)
+            except Exception as e:
+                print(f"\n❌ [{idx}] 워커 처리 중 오류: {e}")
+
+    await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+
+class ThroughputMeter:
+    """처리속도(건/분) 측정"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.count = 0
+
+    def add(self, n=1):
+        self.count += n
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def per_minute(self):
+        """분당 처리 건수"""
+        elapsed = self.elapsed
+        return self.count * 60 / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        return f"{self.count}건 / {self.elapsed:.1f}초 → {self.per_minute():.2f}건/분"
@@ -7,12 +7,26 @@
 """
 import asyncio
 import json
-from playwright.async_api import async_playwright
 from datetime import datetime
 import re
 import random
 import os
 from pathlib import Path
+from 페이지도구 import click_button_with_text, print_click_stats, print_wait_stats, wait_for_section
+from 브라우저풀 import BrowserPool, ThroughputMeter
+from 이미지수집 import save_images, print_image_stats
+from 필드추출 import PageSections, fill_fields
+
+# 상세 수집에서 추출하는 필드
+SUMMARY_FIELDS = [
+    '단지정보.위치',
+    '매물정보.단지명',
+    '매물정보.동',
+    '기본정보.매매가',
+    '기본정보.공급면적_제곱미터',
+    '기본정보.해당층',
+    '기본정보.총층수',
+]
 
 # Mozilla User-Agent 목록
 USER_AGENTS = [
@@ -47,80 +61,9 @@ async def human_like_scroll(page):
 async def wait_for_rendering(page, timeout=30000):
     """
     페이지 렌더링 완료 대기
-    - DOM 로드 완료
-    - 네트워크 idle 상태
-    - 주요 요소 로드 확인
+    - 매물 기본정보 텍스트가 보이면 바로 진행 (networkidle/고정 대기 없음)
     """
-    try:
-        print("  → 렌더링 상태 확인 중...")
-        
-        # 1. 네트워크 idle 대기
-        await page.wait_for_load_state('networkidle', timeout=timeout)
-        print("  ✓ 네트워크 idle 완료")
-        
-        # 2. 주요 요소 로드 대기 (매물 정보가 있는지 확인)
-        try:
-            await page.wait_for_selector('body', timeout=5000)
-            print("  ✓ Body 요소 로드 완료")
-        except:
-            pass
-        
-        # 3. JavaScript 실행 완료 대기
-        await page.evaluate("""
-            () => new Promise(resolve => {
-                if (document.readyState === 'complete') {
-                    resolve();
-                } else {
-                    window.addEventListener('load', resolve);
-                }
-            })
-        """)
-        print("  ✓ JavaScript 실행 완료")
-        
-        # 4. 추가 대기 (동적 콘텐츠 로딩)
-        await random_sleep(2, 3)
-        print("  ✓ 렌더링 완료")
-        
-        return True
-    
-    except Exception as e:
-        print(f"  ℹ 렌더링 대기 중 오류: {e}")
-        return False
-
-async def click_button_with_text(page, text_keywords, description="버튼"):
-    """텍스트로 버튼 찾아서 클릭"""
-    try:
-        buttons = await page.query_selector_all('button, a')
-        for btn in buttons:
-            try:
-                btn_text = await btn.inner_text()
-                if any(keyword in btn_text for keyword in text_keywords):
-                    is_visible = await btn.is_visible()
-                    if not is_visible:
-                        continue
-                    
-                    box = await btn.bounding_box()
-                    if box:
-                        await page.evaluate(f"window.scrollTo(0, {box['y'] - 200})")
-                        await random_sleep(0.3, 0.6)
-                        await page.mouse.move(
-                            box['x'] + box['width'] / 2,
-                            box['y'] + box['height'] / 2
-                        )
-                        await random_sleep(0.2, 0.4)
-                    
-                    await btn.click()
-                    await random_sleep(1, 2)
-                    print(f"     ✓ {description} 클릭 완료")
-                    return True
-            except:
-                continue
-        
-        print(f"     ℹ {description} 없음")
-        return False
-    except Exception as e:
-        print(f"     ℹ {description} 처리 실패: {e}")
-        return False
+    return await wait_for_section(page, '기본정보', timeout)
 
 def parse_location(location_text):
     """위치 텍스트에서 시/구/동 추출"""
@@ -143,152 +86,38 @@ def create_folder_structure(city, district, dong, base_folder="매물데이터")
     folder_path.mkdir(parents=True, exist_ok=True)
     return folder_path
 
-async def download_and_save_image(page, src, image_folder, idx, images_data, img_box):
-    """이미지 다운로드 및 저장"""
-    try:
-        clean_url = src.strip()
-        response = await page.request.get(clean_url)
-        if response.ok:
-            image_data = await response.body()
-            
-            if len(image_data) < 3000:
-                return False
-            
-            ext = 'jpg'
-            if '.png' in src.lower():
-                ext = 'png'
-            elif '.jpeg' in src.lower() or '.jpg' in src.lower():
-                ext = 'jpg'
-            elif '.webp' in src.lower():
-                ext = 'webp'
-            elif '.gif' in src.lower():
-                ext = 'gif'
-            
-            filename = f'{image_folder}/image_{idx}.{ext}'
-            with open(filename, 'wb') as f:
-                f.write(image_data)
-            
-            images_data.append({
-                '순서': idx,
-                'URL': src,
-                '파일경로': filename,
-                '파일크기_bytes': len(image_data),
-                '이미지크기': f"{int(img_box['width'])}x{int(img_box['height'])}",
-                '수집시간': datetime.now().isoformat()
-            })
-            
-            return True
-    
-    except Exception as e:
-        return False
-
-async def save_images(page, article_id, image_base_folder):
-    """매물 이미지 수집 및 파일로 저장"""
-    images_data = []
-    
-    image_folder = f'{image_base_folder}/images_{article_id}'
-    if not os.path.exists(image_folder):
-        os.makedirs(image_folder)
-    
-    try:
-        print("     → 페이지 상단으로 스크롤...")
-        await page.evaluate("window.scrollTo(0, 0)")
-        await random_sleep(1, 2)
-        
-        print("     → 메인 이미지 찾는 중...")
-        all_images = await page.query_selector_all('img')
-        
-        collected_urls = set()
-        saved_count = 0
-        
-        for img in all_images:
-            try:
-                is_visible = await img.is_visible()
-                if not is_visible:
-                    continue
-                
-                img_box = await img.bounding_box()
-                if not img_box or img_box['width'] < 300 or img_box['height'] < 300:
-                    continue
-                
-                if img_box['y'] > 1500:
-                    continue
-                
-                src = await img.get_attribute('src')
-                
-                if not src or 'http' not in src:
-                    continue
-                
-                if src in collected_urls:
-                    continue
-                
-                if 'phinf' in src or 'land.naver' in src or 'naver.net' in src:
-                    saved_count += 1
-                    success = await download_and_save_image(page, src, image_folder, saved_count, images_data, img_box)
-                    if success:
-                        collected_urls.add(src)
-                        print(f"     ✓ {saved_count}번째 이미지 발견")
-                    
-                    if saved_count >= 10:
-                        break
-            
-            except Exception as e:
-                continue
-        
-        print(f"     ✓ 총 {len(images_data)}개 이미지 파일 저장 완료")
-        return images_data
-    
-    except Exception as e:
-        print(f"     ℹ 이미지 수집 실패: {e}")
-        return images_data
-
-async def crawl_article(url):
-    """매물 상세 페이지 크롤링"""
-    
-    # 랜덤 User-Agent 선택
-    user_agent = random.choice(USER_AGENTS)
-    
-    async with async_playwright() as p:
-        # 브라우저 실행 (강력한 우회 설정)
-        browser = await p.chromium.launch(
-            headless=False,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-web-security',
-                '--disable-features=IsolateOrigins,site-per-process',
-                '--disable-infobars',
-                '--window-size=1920,1080',
-            ]
-        )
-        
-        # 컨텍스트 생성 (프록시 우회 설정)
-        context = await browser.new_context(
-            viewport={'width': random.randint(1366, 1920), 'height': random.randint(768, 1080)},
-            user_agent=user_agent,
-            locale='ko-KR',
-            timezone_id='Asia/Seoul',
-            # 추가 설정
-            java_script_enabled=True,
-            bypass_csp=True,
-            ignore_https_errors=True,
-        )
-        
+def create_browser_pool(size=1, limiter=None):
+    """크롤러용 브라우저 풀 생성 (강력한 우회 설정)"""
+    return BrowserPool(
+        USER_AGENTS,
+        size=size,
+        limiter=limiter,
+        launch_args=[
+            '--disable-blink-features=AutomationControlled',
+            '--disable-dev-shm-usage',
+            '--no-sandbox',
+            '--disable-setuid-sandbox',
+            '--disable-web-security',
+            '--disable-features=IsolateOrigins,site-per-process',
+            '--disable-infobars',
+            '--window-size=1920,1080',
+        ],
+        # 컨텍스트 설정 (프록시 우회 설정)
+        context_options={
+            'java_script_enabled': True,
+            'bypass_csp': True,
+            'ignore_https_errors': True,
+        },
         # HTTP 헤더 설정
-        await context.set_extra_http_headers({
+        extra_headers={
             'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Encoding': 'gzip, deflate, br',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
-        })
-        
-        page = await context.new_page()
-        
+        },
         # 강력한 자동화 감지 우회 스크립트
-        await page.add_init_script("""
+        init_script="""
             // WebDriver 감지 우회
             Object.defineProperty(navigator, 'webdriver', {
                 get: () => undefined
@@ -339,7 +168,15 @@ async def crawl_article(url):
             setInterval(() => {
                 checkStatus = false;
             }, 1000);
-        """)
+        """,
+    )
+
+async def crawl_article(url, pool):
+    """매물 상세 페이지 크롤링 (브라우저 풀에서 페이지 대여)"""
+    
+    async with pool.lease() as lease:
+        page = lease.page
+        user_agent = lease.user_agent
         
         try:
             print(f"\n{'='*80}")
@@ -372,8 +209,8 @@ async def crawl_article(url):
             
             # 1. 페이지 로드
             print("1. 페이지 로딩...")
-            await page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            await random_sleep(2, 4)
+            await lease.goto(url, wait_until='domcontentloaded', timeout=60000)
+            await wait_for_section(page, '본문')
             print("   ✓ 완료\n")
             
             # 2. 렌더링 완료 대기
@@ -395,32 +232,10 @@ async def crawl_article(url):
             print("5. 기본 데이터 추출...")
             page_text = await page.evaluate("() => document.body.innerText")
             
-            # 위치 정보 추출
-            location_match = re.search(r'위치\s*([가-힣]+시\s+[가-힣]+구\s+[가-힣]+동\s+[\d-]+)', page_text)
-            if location_match:
-                result['단지정보']['위치'] = location_match.group(1).strip()
-            
-            # 단지명 추출
-            complex_match = re.search(r'([가-힣\s]+(?:아파트|빌라|오피스텔))\s*(\d+동)', page_text)
-            if complex_match:
-                result['단지정보']['단지명'] = complex_match.group(1).strip()
-                result['매물정보']['동'] = complex_match.group(2)
-            
-            # 매매가 추출
-            sale_price_match = re.search(r'매매가\s*([\d억,\s]+만?원)', page_text)
-            if sale_price_match:
-                result['기본정보']['매매가'] = sale_price_match.group(1).strip()
-            
-            # 면적 정보
-            area_match = re.search(r'공급면적\s*([\d.]+)㎡', page_text)
-            if area_match:
-                result['기본정보']['공급면적_제곱미터'] = float(area_match.group(1))
-            
-            # 층 정보
-            floor_match = re.search(r'층\s*(\d+)층/\s*총\s*(\d+)층', page_text)
-            if floor_match:
-                result['기본정보']['해당층'] = int(floor_match.group(1))
-                result['기본정보']['총층수'] = int(floor_match.group(2))
+            # 요약 필드만 필드 표(필드추출.py)로 추출
+            fill_fields(result, PageSections(page_text), fields=SUMMARY_FIELDS)
+            if '단지명' in result['매물정보']:
+                result['단지정보']['단지명'] = result['매물정보'].pop('단지명')
             
             print("   ✓ 완료\n")
             
@@ -430,7 +245,7 @@ async def crawl_article(url):
             city, district, dong = parse_location(location_text)
             image_folder = create_folder_structure(city, district, dong, "매물이미지데이터")
             
-            result['기본정보']['이미지'] = await save_images(page, article_id, str(image_folder))
+            result['기본정보']['이미지'] = await save_images(page, article_id, str(image_folder), lease.limiter, request=lease.request)
             print()
             
             # 7. 결과 출력
@@ -459,13 +274,8 @@ async def crawl_article(url):
             print(f"\n❌ 오류 발생: {e}")
             import traceback
             traceback.print_exc()
+            lease.mark_broken()
             return None
-            
-        finally:
-            wait_time = random.randint(3, 5)
-            print(f"브라우저를 {wait_time}초 후 종료합니다...")
-            await asyncio.sleep(wait_time)
-            await browser.close()
 
 async def main():
     """메인 함수"""
@@ -491,12 +301,19 @@ async def main():
         return
     
     # 크롤링 실행
-    result = await crawl_article(url)
+    meter = ThroughputMeter()
+    async with create_browser_pool() as pool:
+        result = await crawl_article(url, pool)
+    meter.add()
     
     if result:
         print("\n✅ 크롤링 성공!")
     else:
         print("\n❌ 크롤링 실패")
+    print(f"처리속도: {meter.summary()}")
+    print_click_stats()
+    print_wait_stats()
+    print_image_stats()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,323 @@
+"""
+구 단위 샤드 크롤러
+- 구 폴더 아래 동별 URL 파일(URL목록)을 모아 하나의 목록으로 병합 (매물ID 중복 제거)
+- 매물ID 기준으로 N개 샤드로 분할 → 샤드마다 법정동별매물수집.py 프로세스 1개 (각자 브라우저 풀)
+- 샤드별 결과 폴더를 마지막에 하나로 병합
+- --shard i/n 으로 같은 샤드를 여러 대의 머신에 나눠서 실행
+- 수집 상태는 샤드 폴더마다 따로(_shards/shard_XXXofNNN/수집상태.db) → 같은 샤드 수로 다시 실행하면 이어서 수집,
+  --incremental/--restart/--capture-api/--parse-workers 는 샤드 프로세스에 그대로 전달
+  - 샤드 수는 처음 실행 때 _shards/샤드설정.json 에 저장하고 이후 실행(다른 머신, URL 수 변화 포함)에서 그대로 사용
+    (다른 샤드 수로 바꾸려면 --reshard → 수집 상태가 새 샤드 폴더로 시작되므로 전체 다시 수집)
+  - 병합 때 출력 파일을 저장 경로로 옮기면 샤드 수집 상태의 저장경로도 새 위치로 갱신
+- 단지 캐시는 저장 경로/단지캐시.db 하나를 모든 샤드 프로세스가 함께 사용
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from 단지캐시 import CACHE_FILE_NAME
+from 수집상태 import STATE_FILE_NAME, CrawlState
+from 출력저장소 import OUTPUT_KINDS, output_files, recover_parquet_shards
+
+CRAWLER_SCRIPT = Path(__file__).with_name('법정동별매물수집.py')
+
+# 샤드 작업 폴더 (저장 경로 아래)
+SHARD_DIR_NAME = '_shards'
+
+# 샤드 수 기록 파일 (샤드 작업 폴더 안)
+SHARD_CONFIG_NAME = '샤드설정.json'
+
+def find_url_files(target):
+    """대상 경로에서 URL목록이 들어있는 JSON 파일 찾기"""
+    target = Path(target)
+    if target.is_file():
+        return [target]
+
+    url_files = []
+    for path in sorted(target.rglob('*.json')):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            continue
+        if isinstance(data, dict) and data.get('URL목록'):
+            url_files.append(path)
+    return url_files
+
+def load_merged_urls(target):
+    """URL 파일들을 병합하고 매물ID로 중복 제거"""
+    merged = {}
+    for path in find_url_files(target):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for item in data.get('URL목록', []):
+            article_id = str(item.get('매물ID') or '')
+            if not article_id:
+                id_match = re.search(r'/articles/(\d+)', item.get('URL', ''))
+                if not id_match:
+                    continue
+                article_id = id_match.group(1)
+            if article_id not in merged:
+                merged[article_id] = dict(item, 매물ID=article_id, 출처파일=str(path))
+
+    return sorted(merged.values(), key=lambda x: int(x['매물ID']) if x['매물ID'].isdigit() else 0)
+
+def shard_of(article_id, shard_count):
+    """매물ID → 샤드 번호 (0부터, 머신이 달라도 항상 같은 결과)"""
+    article_id = str(article_id)
+    if article_id.isdigit():
+        return int(article_id) % shard_count
+    return zlib.crc32(article_id.encode('utf-8')) % shard_count
+
+def split_shards(url_list, shard_count):
+    """URL 목록을 샤드별로 분할"""
+    shards = [[] for _ in range(shard_count)]
+    for item in url_list:
+        shards[shard_of(item['매물ID'], shard_count)].append(item)
+    return shards
+
+def parse_shard_spec(spec):
+    """'2/8' → (1, 8)  (샤드 번호는 1부터 입력, 내부는 0부터)"""
+    match = re.fullmatch(r'\s*(\d+)\s*/\s*(\d+)\s*', spec or '')
+    if not match:
+        raise ValueError(f"샤드 형식이 올바르지 않습니다: {spec} (예: 2/8)")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"샤드 번호 범위 오류: {spec}")
+    return index - 1, count
+
+def load_shard_count(save_folder):
+    """저장된 샤드 수 (없으면 None)"""
+    path = Path(save_folder) / SHARD_DIR_NAME / SHARD_CONFIG_NAME
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return int(json.load(f)['샤드수'])
+
+def save_shard_count(save_folder, count):
+    path = Path(save_folder) / SHARD_DIR_NAME / SHARD_CONFIG_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'샤드수': count, '저장시간': datetime.now().isoformat()}, f, ensure_ascii=False, indent=2)
+
+def resolve_shard_count(save_folder, requested=None, spec_count=None, reshard=False):
+    """
+    이번 실행의 샤드 수 (저장된 값 우선, 처음이면 requested 또는 CPU 코어 수로 정해서 저장)
+    - requested: --processes, spec_count: --shard i/n 의 n
+    - 저장된 값과 다르면 ValueError (reshard=True면 새 값으로 덮어씀)
+    """
+    saved = load_shard_count(save_folder)
+    wanted = spec_count or requested
+    if saved is not None and not reshard:
+        if wanted is not None and wanted != saved:
+            raise ValueError(f"샤드 수 {wanted}개가 저장된 샤드 수 {saved}개와 다릅니다 "
+                             f"(같은 값으로 실행하거나 --reshard 로 새로 분할)")
+        return saved
+    count = wanted or os.cpu_count() or 1
+    save_shard_count(save_folder, count)
+    return count
+
+def shard_folder(save_folder, index, count):
+    """샤드 작업 폴더 경로"""
+    return Path(save_folder) / SHARD_DIR_NAME / f"shard_{index + 1:03d}of{count:03d}"
+
+def write_shard_url_file(urls, folder, index, count):
+    """샤드 URL 데이터 파일 저장 (법정동별매물수집.py 입력 형식)"""
+    folder.mkdir(parents=True, exist_ok=True)
+    url_file = folder / 'urls.json'
+    result = {
+        '수집정보': {
+            '생성시간': datetime.now().isoformat(),
+            '총URL수': len(urls),
+            '설명': f'샤드 {index + 1}/{count} 매물 URL 목록'
+        },
+        'URL목록': [dict(item, 순번=idx) for idx, item in enumerate(urls, 1)]
+    }
+    with open(url_file, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    return url_file
+
+def run_shards(shards, shard_ids, count, save_folder, image_folder, workers=1, block_resources=False,
+               archive_folder=None, output='json', incremental=False, restart=False, capture_api=False,
+               parse_workers=1):
+    """샤드마다 크롤러 프로세스 실행 후 모두 끝날 때까지 대기 (수집 상태는 샤드 폴더/수집상태.db)"""
+    processes = []
+    for index in shard_ids:
+        urls = shards[index]
+        if not urls:
+            print(f"   ℹ 샤드 {index + 1}/{count}: 매물 없음")
+            continue
+
+        folder = shard_folder(save_folder, index, count)
+        url_file = write_shard_url_file(urls, folder, index, count)
+        log_file = open(folder / 'crawl.log', 'w', encoding='utf-8')
+
+        command = [
+            sys.executable, str(CRAWLER_SCRIPT),
+            '--url-file', str(url_file),
+            '--save-folder', str(folder / 'data'),
+            '--image-folder', str(image_folder),
+            '--workers', str(workers),
+            '--output', output,
+            '--state', str(folder / STATE_FILE_NAME),
+            # 단지 캐시는 모든 샤드가 함께 사용
+            '--complex-cache', str(Path(save_folder) / CACHE_FILE_NAME),
+            '--parse-workers', str(parse_workers),
+        ]
+        if block_resources:
+            command.append('--block-resources')
+        if incremental:
+            command.append('--incremental')
+        if restart:
+            command.append('--restart')
+        if capture_api:
+            command.append('--capture-api')
+        if archive_folder:
+            # 프로세스마다 따로 보관 파일 생성 (파일 이름에 PID)
+            command.extend(['--archive', str(archive_folder)])
+        env = dict(os.environ, PYTHONIOENCODING='utf-8')
+        process = subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT,
+                                   stdin=subprocess.DEVNULL, env=env)
+        processes.append((index, process, log_file, len(urls)))
+        print(f"   → 샤드 {index + 1}/{count} 시작: {len(urls)}개 매물 (PID {process.pid}, 로그 {folder / 'crawl.log'})")
+
+    failed = []
+    for index, process, log_file, url_count in processes:
+        return_code = process.wait()
+        log_file.close()
+        if return_code == 0:
+            print(f"   ✓ 샤드 {index + 1}/{count} 완료")
+        else:
+            print(f"   ❌ 샤드 {index + 1}/{count} 종료 코드 {return_code}")
+            failed.append(index)
+    return failed
+
+def merge_shard_outputs(save_folder):
+    """샤드별 결과(article_*.json, jsonl/parquet 샤드)를 저장 경로로 모으고 병합 요약 저장
+    - 옮긴 파일은 샤드 수집 상태의 저장경로도 새 위치로 갱신
+    """
+    save_folder = Path(save_folder)
+    shard_root = save_folder / SHARD_DIR_NAME
+    per_shard = {}
+    total = 0
+
+    for folder in sorted(shard_root.glob('shard_*')):
+        moves = {}
+        # 죽은 샤드의 parquet 일지는 옮기기 전에 .parquet 으로 (저장경로가 .parquet 을 가리킴)
+        recover_parquet_shards(folder / 'data')
+        for path in output_files(folder / 'data'):
+            destination = save_folder / path.name
+            shutil.move(str(path), str(destination))
+            moves[str(path)] = str(destination)
+        state_path = folder / STATE_FILE_NAME
+        if moves and state_path.exists():
+            with CrawlState(state_path) as state:
+                state.relocate(moves)
+        per_shard[folder.name] = len(moves)
+        total += len(moves)
+
+    summary = {
+        '병합정보': {
+            '병합시간': datetime.now().isoformat(),
+            '병합파일수': total,
+            '샤드별파일수': per_shard
+        }
+    }
+    summary_file = save_folder / f"병합요약_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    return total, summary_file
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="구 단위 샤드 크롤러")
+    parser.add_argument('target', nargs='?', help="URL 파일 또는 구 폴더 (예: 매물url데이터/서울시/강서구)")
+    parser.add_argument('--save-folder', help="매물 데이터 저장 경로 (예: 매물데이터/서울시/강서구)")
+    parser.add_argument('--image-folder', help="이미지 저장 경로 (예: 매물이미지데이터/서울시/강서구)")
+    parser.add_argument('--processes', type=int, help="샤드(프로세스) 수 (처음 실행 때만, 기본: CPU 코어 수, 이후는 저장된 값)")
+    parser.add_argument('--reshard', action='store_true', help="저장된 샤드 수를 버리고 새로 분할 (수집 상태 새로 시작)")
+    parser.add_argument('--shard', help="이 머신에서 실행할 샤드 (예: 2/8)")
+    parser.add_argument('--workers', type=int, default=1, help="프로세스당 동시 크롤링 수")
+    parser.add_argument('--block-resources', action='store_true', help="이미지/폰트/광고/분석 요청 차단")
+    parser.add_argument('--archive', help="원문 압축 보관 폴더 (샤드 프로세스 공용)")
+    parser.add_argument('--output', choices=OUTPUT_KINDS, default='json', help="저장 방식 (기본 json, 샤드 프로세스 공용)")
+    parser.add_argument('--incremental', action='store_true', help="샤드마다 새 매물/요약이 바뀐 매물만 수집 (같은 샤드 수로 실행)")
+    parser.add_argument('--restart', action='store_true', help="샤드 수집 상태를 무시하고 처음부터 다시 수집")
+    parser.add_argument('--capture-api', action='store_true', help="페이지 JSON 응답에서 필드 추출 (샤드 프로세스 공용)")
+    parser.add_argument('--parse-workers', type=int, default=1, help="샤드 프로세스당 파싱 프로세스 수 (기본 1)")
+    parser.add_argument('--merge-only', action='store_true', help="크롤링 없이 샤드 결과만 병합")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("구 단위 샤드 크롤러")
+    print("="*80)
+
+    save_folder = args.save_folder or input("매물 데이터를 저장할 경로를 입력하세요: ").strip()
+    if not save_folder:
+        print("\n❌ 저장 경로를 입력하지 않았습니다.")
+        return
+    Path(save_folder).mkdir(parents=True, exist_ok=True)
+
+    if not args.merge_only:
+        target = args.target or input("URL 파일 또는 구 폴더 경로를 입력하세요: ").strip()
+        if not target or not os.path.exists(target):
+            print(f"\n❌ 경로를 찾을 수 없습니다: {target}")
+            return
+
+        image_folder = args.image_folder or input("이미지를 저장할 경로를 입력하세요: ").strip()
+        if not image_folder:
+            print("\n❌ 이미지 저장 경로를 입력하지 않았습니다.")
+            return
+        Path(image_folder).mkdir(parents=True, exist_ok=True)
+
+        # 1. URL 병합
+        print("\n1. URL 목록 병합...")
+        url_list = load_merged_urls(target)
+        if not url_list:
+            print("❌ URL목록이 비어있습니다.")
+            return
+        print(f"   ✓ 총 {len(url_list)}개 매물 (중복 제거)")
+
+        # 2. 샤드 분할 (샤드 수는 저장된 값 → 다시 실행해도 같은 샤드 폴더/수집 상태)
+        try:
+            shard_index, spec_count = parse_shard_spec(args.shard) if args.shard else (None, None)
+            shard_count = resolve_shard_count(save_folder, args.processes, spec_count, args.reshard)
+        except ValueError as e:
+            print(f"\n❌ {e}")
+            return
+        shard_ids = [shard_index] if args.shard else list(range(shard_count))
+
+        shards = split_shards(url_list, shard_count)
+        print(f"\n2. 샤드 분할: {shard_count}개 (실행: {', '.join(str(i + 1) for i in shard_ids)})")
+        for index in shard_ids:
+            print(f"   - 샤드 {index + 1}/{shard_count}: {len(shards[index])}개")
+
+        # 3. 샤드별 프로세스 실행
+        print("\n3. 크롤러 프로세스 실행...")
+        started = time.perf_counter()
+        failed = run_shards(shards, shard_ids, shard_count, save_folder, image_folder, args.workers,
+                            args.block_resources, args.archive, args.output, incremental=args.incremental,
+                            restart=args.restart, capture_api=args.capture_api, parse_workers=args.parse_workers)
+        elapsed = time.perf_counter() - started
+        crawled = sum(len(shards[i]) for i in shard_ids)
+        print(f"   ✓ {crawled}개 매물 / {elapsed:.1f}초 → {crawled * 60 / elapsed if elapsed > 0 else 0:.2f}건/분")
+        if failed:
+            print(f"   ⚠ 실패한 샤드: {', '.join(str(i + 1) for i in failed)} (로그 확인 후 --shard 로 재실행)")
+
+    # 4. 결과 병합
+    print("\n4. 샤드 결과 병합...")
+    total, summary_file = merge_shard_outputs(save_folder)
+    print(f"   ✓ 출력 파일 {total}개 병합")
+    print(f"   ✓ 병합 요약: {summary_file}")
+    print("="*80 + "\n")
+
+if __name__ == "__main__":
+    main()
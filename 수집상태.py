@@ -0,0 +1,278 @@
+"""
+수집 상태 저장소 (SQLite, WAL)
+- 매물ID별 상태(대기/진행/완료/실패), 시도 횟수, 마지막 수집 시각, 저장 경로, 오류 기록
+  (시도는 마지막 성공 이후 연속 시도 횟수 → 성공하면 0, 실패 재시도 한도는 이 값으로 판단)
+- 다시 실행하면 완료된 매물은 건너뛰고 나머지부터 이어서 수집
+- 상태 변경은 모아서 batch_size개 또는 flush_interval초마다 한 번에 커밋
+  (비정상 종료 시 커밋 전 변경은 잃을 수 있음 → 해당 매물은 다음 실행에서 다시 수집)
+- 증분 수집(plan_incremental): 새 URL 목록의 매물정보 요약 문구를 지난 수집 때와 비교
+  → 새 매물과 요약이 바뀐 매물만 다시 수집, 목록에서 사라진 매물은 '삭제'로 표시
+- 상태 확인: python 수집상태.py 수집상태.db
+"""
+import argparse
+import hashlib
+import re
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+STATE_FILE_NAME = '수집상태.db'
+
+# 상태 값
+PENDING = '대기'
+RUNNING = '진행'
+DONE = '완료'
+FAILED = '실패'
+DELISTED = '삭제'
+
+# 기본 실패 재시도 한도
+MAX_ATTEMPTS = 3
+
+# 테이블 컬럼 (없는 컬럼은 열 때 추가)
+COLUMNS = {
+    '매물ID': 'TEXT PRIMARY KEY',
+    'URL': 'TEXT',
+    '상태': "TEXT NOT NULL DEFAULT '대기'",
+    '시도': 'INTEGER NOT NULL DEFAULT 0',
+    '마지막수집': 'TEXT',
+    '저장경로': 'TEXT',
+    '오류': 'TEXT',
+    '갱신시간': 'TEXT',
+    '요약해시': 'TEXT',
+    '목록확인': 'TEXT',
+    '삭제시간': 'TEXT',
+}
+
+def snippet_hash(url_info):
+    """URL 목록 항목의 매물정보 요약 문구 해시 (공백 정리, 문구가 없으면 None)"""
+    text = re.sub(r'\s+', ' ', url_info.get('매물정보') or '').strip()
+    if not text:
+        return None
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+class CrawlState:
+    """매물 수집 상태 (with 문 또는 close()로 마지막 변경까지 커밋)"""
+
+    def __init__(self, path, batch_size=20, flush_interval=5.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._migrate()
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self.commits = 0
+
+    def _migrate(self):
+        """테이블 생성 + 빠진 컬럼 추가"""
+        columns = ', '.join(f'"{name}" {spec}' for name, spec in COLUMNS.items())
+        self.conn.execute(f'CREATE TABLE IF NOT EXISTS articles ({columns})')
+        existing = {row[1] for row in self.conn.execute('PRAGMA table_info(articles)')}
+        for name, spec in COLUMNS.items():
+            if name not in existing:
+                self.conn.execute(f'ALTER TABLE articles ADD COLUMN "{name}" {spec.replace("PRIMARY KEY", "")}')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS articles_state ON articles ("상태")')
+        # 이전 버전은 성공해도 시도를 누적 → 완료 매물은 0부터
+        self.conn.execute('UPDATE articles SET "시도" = 0 WHERE "상태" = ? AND "시도" != 0', (DONE,))
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ===== 쓰기 (모아서 커밋) =====
+
+    def _queue(self, sql, params):
+        self._buffer.append((sql, params))
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """모인 변경을 한 트랜잭션으로 커밋"""
+        if self._buffer:
+            with self.conn:
+                for sql, params in self._buffer:
+                    self.conn.execute(sql, params)
+            self._buffer = []
+            self.commits += 1
+        self._last_flush = time.monotonic()
+
+    def _upsert(self, article_id, url, state, extra_sql='', extra_params=(), attempts=0):
+        """상태 기록 (행이 없으면 먼저 만들고 갱신 → extra_sql 값도 처음부터 반영)"""
+        now = datetime.now().isoformat()
+        sql = (
+            'INSERT INTO articles ("매물ID", "URL", "상태", "시도", "갱신시간") VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT("매물ID") DO UPDATE SET "URL" = COALESCE(excluded."URL", "URL"), '
+            f'"상태" = excluded."상태", "갱신시간" = excluded."갱신시간"{extra_sql}'
+        )
+        if extra_sql:
+            # 새 행이면 INSERT만 실행되어 extra_sql이 빠지므로 빈 행(시도 0)을 먼저 만듦
+            self._queue('INSERT OR IGNORE INTO articles ("매물ID") VALUES (?)', (article_id,))
+        self._queue(sql, (article_id, url, state, attempts, now, *extra_params))
+
+    def mark_started(self, article_id, url=None):
+        """크롤링 시작 (시도 횟수 +1)"""
+        self._upsert(article_id, url, RUNNING, ', "시도" = "시도" + 1', attempts=1)
+
+    def mark_done(self, article_id, output_path=None, url=None, summary_hash=None):
+        """크롤링 성공 (시도 0으로, summary_hash: 수집한 시점의 매물정보 요약 해시 → 증분 수집 때 비교)"""
+        self._upsert(article_id, url, DONE,
+                     ', "시도" = 0, "마지막수집" = ?, "저장경로" = ?, "오류" = NULL, "삭제시간" = NULL, '
+                     '"요약해시" = COALESCE(?, "요약해시")',
+                     (datetime.now().isoformat(), str(output_path) if output_path else None, summary_hash))
+
+    def mark_failed(self, article_id, error=None, url=None):
+        """크롤링 실패"""
+        self._upsert(article_id, url, FAILED, ', "오류" = ?', (str(error)[:500] if error else None,))
+
+    def relocate(self, moves):
+        """저장 파일을 옮긴 뒤 저장경로 갱신 ({이전 경로: 새 경로}, '경로#번호' 위치 포함) → 바뀐 매물 수"""
+        self.flush()
+        updates = []
+        for article_id, location in self.conn.execute('SELECT "매물ID", "저장경로" FROM articles '
+                                                      'WHERE "저장경로" IS NOT NULL'):
+            path, sep, record = location.partition('#')
+            if path in moves:
+                updates.append((moves[path] + sep + record, article_id))
+        with self.conn:
+            self.conn.executemany('UPDATE articles SET "저장경로" = ? WHERE "매물ID" = ?', updates)
+        return len(updates)
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    # ===== 읽기 =====
+
+    def get(self, article_id):
+        """매물 상태 행 (dict) 또는 None"""
+        self.flush()
+        cursor = self.conn.execute('SELECT * FROM articles WHERE "매물ID" = ?', (article_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([c[0] for c in cursor.description], row))
+
+    def rows(self):
+        """전체 상태 {매물ID: 행}"""
+        self.flush()
+        cursor = self.conn.execute('SELECT * FROM articles')
+        names = [c[0] for c in cursor.description]
+        return {row[0]: dict(zip(names, row)) for row in cursor}
+
+    def pending(self, url_list, max_attempts=MAX_ATTEMPTS):
+        """
+        URL 목록에서 수집할 항목만 (완료 건너뜀, 실패는 max_attempts회까지 재시도)
+        - 반환값: (수집할 목록, {'완료': n, '실패한도': n})
+        """
+        rows = self.rows()
+        targets = []
+        skipped = {DONE: 0, '실패한도': 0}
+        for url_info in url_list:
+            row = rows.get(str(url_info.get('매물ID')))
+            if row is not None and row['상태'] == DONE:
+                skipped[DONE] += 1
+            elif row is not None and row['상태'] == FAILED and row['시도'] >= max_attempts:
+                skipped['실패한도'] += 1
+            else:
+                targets.append(url_info)
+        return targets, skipped
+
+    def plan_incremental(self, url_list, max_attempts=MAX_ATTEMPTS):
+        """
+        증분 수집 계획 (새 URL 목록 ↔ 지난 수집 비교)
+        - 새 매물(삭제 후 다시 올라온 매물 포함)과 매물정보 요약이 바뀐 완료 매물만 수집 대상
+          (다시 올라온 매물은 시도 0부터)
+        - 요약해시가 없는 완료 매물(이전 버전에서 수집)은 지금 요약을 기준값으로 기록하고 건너뜀
+        - 목록에서 사라진 매물은 '삭제'로 바로 표시, 목록에 있는 매물은 목록확인 시각 갱신
+        - 반환값: (수집할 목록, {'신규', '변경', '재시도', '동일', '실패한도', '삭제'} 개수)
+        """
+        rows = self.rows()
+        now = datetime.now().isoformat()
+        targets = []
+        plan = {'신규': 0, '변경': 0, '재시도': 0, '동일': 0, '실패한도': 0, DELISTED: 0}
+        seen = []
+        baselines = []
+        relisted = []
+        for url_info in url_list:
+            article_id = str(url_info.get('매물ID'))
+            current = snippet_hash(url_info)
+            seen.append((now, article_id))
+            row = rows.get(article_id)
+            if row is None or row['상태'] in (DELISTED, PENDING):
+                plan['신규'] += 1
+                targets.append(url_info)
+                if row is not None and row['상태'] == DELISTED:
+                    relisted.append((article_id,))
+            elif row['상태'] == DONE:
+                if row['요약해시'] is None or current is None:
+                    plan['동일'] += 1
+                    if current is not None:
+                        baselines.append((current, article_id))
+                elif row['요약해시'] != current:
+                    plan['변경'] += 1
+                    targets.append(url_info)
+                else:
+                    plan['동일'] += 1
+            elif row['상태'] == FAILED and row['시도'] >= max_attempts:
+                plan['실패한도'] += 1
+            else:
+                plan['재시도'] += 1
+                targets.append(url_info)
+
+        listed = {article_id for _, article_id in seen}
+        delisted = [(DELISTED, now, now, article_id) for article_id, row in rows.items()
+                    if article_id not in listed and row['상태'] != DELISTED]
+        plan[DELISTED] = len(delisted)
+
+        with self.conn:
+            self.conn.executemany('UPDATE articles SET "목록확인" = ? WHERE "매물ID" = ?', seen)
+            self.conn.executemany('UPDATE articles SET "요약해시" = ? WHERE "매물ID" = ?', baselines)
+            self.conn.executemany('UPDATE articles SET "시도" = 0 WHERE "매물ID" = ?', relisted)
+            self.conn.executemany('UPDATE articles SET "상태" = ?, "삭제시간" = ?, "갱신시간" = ? '
+                                  'WHERE "매물ID" = ?', delisted)
+        return targets, plan
+
+    def counts(self):
+        """상태별 매물 수"""
+        self.flush()
+        return dict(self.conn.execute('SELECT "상태", COUNT(*) FROM articles GROUP BY "상태"').fetchall())
+
+    def reset(self):
+        """전체 상태를 대기로 (처음부터 다시 수집)"""
+        self.flush()
+        with self.conn:
+            self.conn.execute('UPDATE articles SET "상태" = ?, "시도" = 0', (PENDING,))
+
+def open_state(save_folder, path=None, **kwargs):
+    """저장 경로 아래 수집상태.db (path를 지정하면 그 파일)"""
+    return CrawlState(path or Path(save_folder) / STATE_FILE_NAME, **kwargs)
+
+def main():
+    """상태 요약 출력"""
+    parser = argparse.ArgumentParser(description="수집 상태 확인")
+    parser.add_argument('path', help="수집상태.db 경로")
+    parser.add_argument('--failed', action='store_true', help="실패한 매물과 오류 출력")
+    parser.add_argument('--delisted', action='store_true', help="목록에서 사라진(삭제) 매물 출력")
+    args = parser.parse_args()
+
+    with CrawlState(args.path) as state:
+        counts = state.counts()
+        print(f"수집 상태 ({args.path}): " + ', '.join(f"{k} {v}개" for k, v in counts.items()))
+        if args.failed:
+            for article_id, row in state.rows().items():
+                if row['상태'] == FAILED:
+                    print(f"  {article_id} (시도 {row['시도']}회): {row['오류']}")
+        if args.delisted:
+            for article_id, row in state.rows().items():
+                if row['상태'] == DELISTED:
+                    print(f"  {article_id} (삭제 {row['삭제시간']}, 마지막 수집 {row['마지막수집']})")
+
+if __name__ == "__main__":
+    main()
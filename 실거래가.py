@@ -0,0 +1,153 @@
+"""
+실거래가 표 추출
+- 실거래가 상세 모달에서 한 번의 evaluate로: (탭 클릭 →) 더보기/스크롤로 끝까지 펼침 → 표 행 셀 읽기
+  (탭마다 innerText 전체를 읽어 정규식으로 찾던 방식 대신, 행 단위 셀 목록)
+- 행 → 거래(계약일 연도 포함, 층 정수, 가격 만원 정수)는 필드추출.parse_trade_rows (브라우저 없음)
+- 표를 못 찾으면 호출하는 쪽에서 탭 텍스트(정규식)로 대체
+- 저장한 HTML로 확인: python 실거래가.py 실거래가모달.html [--tab 전세] [--collected 2025-11-18]
+- 행 → 거래 변환 확인 (브라우저 없음): python -m pytest test_실거래가표.py (행 픽스처 테스트픽스처/실거래가표_행.json)
+"""
+import argparse
+import asyncio
+import time
+from pathlib import Path
+from 단계계측 import timed
+from 필드추출 import parse_trade_rows, parse_trades
+
+# 더보기/스크롤 최대 횟수, 행이 늘어날 때까지 기다리는 시간(ms)
+MAX_PAGES = 30
+PAGE_WAIT_MS = 2000
+
+TRADE_TABLE_SCRIPT = """
+async ({tabName, maxPages, waitMs}) => {
+    const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+    const visible = (el) => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    const textOf = (el) => (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim();
+    const DATE = /^(?:\\d{2,4}[.\\-\\/])?\\d{1,2}[.\\-\\/]\\d{1,2}\\.?$/;
+    const YEAR = /^\\d{4}\\s*년?$/;
+
+    // 실거래가 모달 (보이는 것 중 마지막, 없으면 문서 전체)
+    const findRoot = () => {
+        const modals = [...document.querySelectorAll(
+            '[role="dialog"], [class*="modal" i], [class*="layer" i], [class*="popup" i]'
+        )].filter(el => visible(el) && /층/.test(el.innerText || ''));
+        return modals.length ? modals[modals.length - 1] : document.body;
+    };
+
+    // 표 행 → 셀 문자열 목록 (날짜 셀이 있는 행과 'YYYY년' 행만)
+    const readRows = (root) => {
+        const rows = [];
+        for (const row of root.querySelectorAll('tr, [role="row"], li')) {
+            if (!visible(row) || row.querySelector('tr, [role="row"], li')) continue;
+            let cells = [...row.querySelectorAll(':scope > td, :scope > th, :scope > [role="cell"], :scope > [role="gridcell"]')];
+            if (!cells.length) cells = [...row.children];
+            let values = cells.map(textOf).filter(Boolean);
+            if (!values.length) values = [textOf(row)].filter(Boolean);
+            if (values.length === 1 && YEAR.test(values[0])) {
+                rows.push(values);
+            } else if (values.some(v => DATE.test(v.replace(/\\s/g, '')))) {
+                rows.push(values);
+            }
+        }
+        return rows;
+    };
+
+    const waitFor = async (predicate, timeout) => {
+        const started = performance.now();
+        while (performance.now() - started < timeout) {
+            if (predicate()) return true;
+            await sleep(50);
+        }
+        return predicate();
+    };
+    const signature = () => {
+        const rows = readRows(findRoot());
+        return rows.length + '|' + (rows[0] || []).join(' ');
+    };
+
+    // 탭 클릭 (이미 선택된 탭이면 tabName 없이 호출)
+    if (tabName) {
+        const root = findRoot();
+        const tab = [...root.querySelectorAll('[role="tab"], button, a')]
+            .find(el => visible(el) && textOf(el) === tabName);
+        if (!tab) return {found: false, rows: [], pages: 0};
+        const before = signature();
+        tab.click();
+        await waitFor(() => signature() !== before, waitMs);
+    }
+
+    // 더보기 버튼 → 없으면 스크롤 영역 끝까지, 행이 더 늘지 않으면 끝
+    let pages = 0;
+    while (pages < maxPages) {
+        const root = findRoot();
+        const count = readRows(root).length;
+        const more = [...root.querySelectorAll('button, a, [role="button"]')]
+            .find(el => visible(el) && /더보기/.test(textOf(el)) && textOf(el).length <= 12
+                        && !/소개|시설|실거래가/.test(textOf(el)));
+        if (more) {
+            more.click();
+        } else {
+            const scroller = root === document.body ? null : [root, ...root.querySelectorAll('*')]
+                .find(el => el.scrollHeight > el.clientHeight + 10 && /auto|scroll/.test(getComputedStyle(el).overflowY));
+            if (scroller) scroller.scrollTop = scroller.scrollHeight;
+            else window.scrollTo(0, document.body.scrollHeight);
+        }
+        const grew = await waitFor(() => readRows(findRoot()).length > count, more ? waitMs : waitMs / 2);
+        if (!grew) break;
+        pages += 1;
+    }
+    return {found: true, rows: readRows(findRoot()), pages};
+}
+"""
+
+@timed('extract_trade_rows')
+async def extract_trade_rows(page, tab_name=None, max_pages=MAX_PAGES, wait_ms=PAGE_WAIT_MS):
+    """
+    실거래가 모달 표 행 읽기 (한 번의 evaluate)
+    - tab_name: 클릭할 탭 (None이면 현재 탭 그대로)
+    - 반환값: {'found': 탭 있음, 'rows': [[셀, ...], ...], 'pages': 더보기/스크롤 횟수, 'ms': 소요 시간}
+    """
+    started = time.perf_counter()
+    table = await page.evaluate(TRADE_TABLE_SCRIPT, {'tabName': tab_name, 'maxPages': max_pages, 'waitMs': wait_ms})
+    table['ms'] = round((time.perf_counter() - started) * 1000)
+    return table
+
+async def check_fixture(path, tab_name, collected_at):
+    """저장한 HTML에서 표 추출 ↔ 탭 텍스트 정규식 결과 비교"""
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.goto(Path(path).resolve().as_uri())
+
+        table = await extract_trade_rows(page, None, wait_ms=300)
+        rows = parse_trade_rows(table['rows'], tab_name, collected_at)
+
+        started = time.perf_counter()
+        text = await page.evaluate("() => document.body.innerText")
+        legacy = parse_trades(text, tab_name, collected_at)
+        legacy_ms = (time.perf_counter() - started) * 1000
+        await browser.close()
+
+    print(f"{path}: 표 {len(table['rows'])}행 → 거래 {len(rows)}건 ({table['ms']}ms, 더보기 {table['pages']}회)")
+    print(f"   텍스트 정규식: 거래 {len(legacy)}건 ({legacy_ms:.0f}ms)")
+    for trans in rows[:5]:
+        print(f"   {trans['계약일']} | {trans['층']}층 | {trans['가격']} ({trans['가격_만원']}만원) {trans['비고']}")
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="저장한 실거래가 HTML에서 표 추출 확인")
+    parser.add_argument('files', nargs='+', help="실거래가 모달을 저장한 HTML 파일")
+    parser.add_argument('--tab', default='매매', choices=['매매', '전세', '월세'], help="거래 종류 (기본 매매)")
+    parser.add_argument('--collected', default=None, help="수집시간 (연도 추정 기준, 기본: 현재)")
+    args = parser.parse_args()
+
+    for path in args.files:
+        asyncio.run(check_fixture(path, args.tab, args.collected))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+호스트별 요청 제한 (토큰 버킷)
+- 호스트마다 초당 요청 수(rate)와 순간 허용량(burst) 지정
+- 여러 워커가 하나의 제한기를 공유 → 전체 요청 속도는 일정하게 유지
+- 고정 random_sleep 대신 필요한 만큼만 대기
+"""
+import asyncio
+import random
+import time
+from urllib.parse import urlparse
+
+# 호스트별 요청 예산 (초당 요청 수, 순간 허용량)
+HOST_BUDGETS = {
+    'fin.land.naver.com': (0.5, 2),
+    'm.land.naver.com': (0.3, 1),
+    'landthumb-phinf.pstatic.net': (4.0, 8),
+}
+
+# 목록에 없는 호스트 (로컬 픽스처 서버 등)
+DEFAULT_BUDGET = (2.0, 4)
+
+class TokenBucket:
+    """토큰 버킷"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+        self.requests = 0
+        self.waited = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, jitter=0.0):
+        """토큰 1개 사용 (없으면 채워질 때까지 대기)"""
+        async with self.lock:
+            self._refill()
+            wait = 0.0
+            if self.tokens < 1:
+                wait = (1 - self.tokens) / self.rate
+            # 요청 간격이 기계적으로 일정하지 않도록 약간의 흔들림 추가
+            if wait > 0 and jitter > 0:
+                wait += random.uniform(0, jitter)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                self._refill()
+            self.tokens -= 1
+            self.requests += 1
+            self.waited += wait
+            return wait
+
+class HostRateLimiter:
+    """호스트별 토큰 버킷 모음"""
+
+    def __init__(self, budgets=None, default_budget=DEFAULT_BUDGET, scale=1.0, jitter=0.3):
+        self.budgets = dict(HOST_BUDGETS if budgets is None else budgets)
+        self.default_budget = default_budget
+        self.scale = scale
+        self.jitter = jitter
+        self.buckets = {}
+
+    def bucket_for(self, host):
+        """호스트의 버킷 (없으면 생성)"""
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            rate, burst = self.budgets.get(host, self.default_budget)
+            bucket = TokenBucket(rate * self.scale, burst)
+            self.buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, url):
+        """URL의 호스트 예산에서 토큰 1개 사용"""
+        host = urlparse(url).hostname or ''
+        return await self.bucket_for(host).acquire(self.jitter)
+
+    def print_stats(self):
+        """호스트별 요청 수 / 대기 시간 출력"""
+        for host, bucket in self.buckets.items():
+            print(f"  - {host}: 요청 {bucket.requests}회, 대기 {bucket.waited:.1f}초 "
+                  f"(예산 {bucket.rate:.2f}회/초)")
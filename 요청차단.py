@@ -0,0 +1,177 @@
+"""
+요청 차단 (page.route)
+- 프로필별로 불필요한 요청 차단
+  text: 이미지/미디어/폰트/광고/분석 차단 (본문 추출, 실거래가 단계)
+  images: 미디어/폰트/광고/분석만 차단 (이미지 수집 단계)
+  off: 차단 없음 (page.route 없이 측정만 → 가로채기 비용 없이 차단 전 기준값)
+- 프로필별 전송량(CDP Network.loadingFinished)과 본문(innerText) 표시까지 걸린 시간 집계
+  (off 도 같은 값을 집계 → 차단 전/후 비교, 벤치마크.py --block-resources both)
+"""
+import time
+from urllib.parse import urlparse
+
+# 광고/분석 호스트 (부분 일치)
+TRACKER_HOSTS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'googlesyndication.com',
+    'adservice.google.com',
+    'facebook.net',
+    'scorecardresearch.com',
+    'criteo.com',
+    'wcs.naver.net',
+    'lcs.naver.com',
+    'nlog.naver.com',
+    'tivan.naver.com',
+    'veta.naver.com',
+    'adcr.naver.com',
+)
+
+# 프로필별 차단할 리소스 종류
+BLOCK_PROFILES = {
+    'text': {'resource_types': {'image', 'media', 'font'}, 'block_trackers': True},
+    'images': {'resource_types': {'media', 'font'}, 'block_trackers': True},
+    'off': {'resource_types': set(), 'block_trackers': False},
+}
+
+# 화면 상단 이미지 다시 불러오기 (text 프로필에서 차단된 이미지)
+RELOAD_IMAGES_SCRIPT = """
+(maxY) => {
+    let count = 0;
+    for (const img of document.querySelectorAll('img')) {
+        const rect = img.getBoundingClientRect();
+        if (rect.top > maxY || rect.bottom < 0) continue;
+        const src = img.getAttribute('src');
+        if (!src || !src.includes('http')) continue;
+        img.setAttribute('src', '');
+        img.setAttribute('src', src);
+        count++;
+    }
+    return count;
+}
+"""
+
+IMAGES_LOADED_SCRIPT = """
+(maxY) => Array.from(document.images)
+    .filter(img => img.getBoundingClientRect().top <= maxY)
+    .every(img => img.complete)
+"""
+
+def is_tracker(url):
+    """광고/분석 요청 여부"""
+    host = urlparse(url).hostname or ''
+    return any(t in host for t in TRACKER_HOSTS)
+
+def new_profile_stats():
+    return {'요청': 0, '차단': 0, '전송바이트': 0, '본문측정': 0, '본문시간': 0.0}
+
+class RequestBlocker:
+    """페이지 하나에 설치하는 요청 차단기 (프로필은 실행 중 변경 가능)"""
+
+    def __init__(self, profile='text', stats=None):
+        if profile not in BLOCK_PROFILES:
+            raise ValueError(f"알 수 없는 차단 프로필: {profile}")
+        self.profile = profile
+        self._routed = False
+        # 프로필별 집계 (풀 전체에서 공유 가능)
+        self.stats = stats if stats is not None else {}
+        self.article = {}
+
+    def _count(self, name, key, value=1):
+        self.stats.setdefault(name, new_profile_stats())[key] += value
+        self.article.setdefault(name, new_profile_stats())[key] += value
+
+    async def install(self, page, context):
+        """page.route 등록 + 전송량 측정용 CDP 세션 (off 로 설치하면 요청 수만 page.on 으로)"""
+        if self.profile == 'off':
+            page.on('request', self._on_request)
+        else:
+            await page.route('**/*', self._handle)
+            self._routed = True
+        try:
+            cdp = await context.new_cdp_session(page)
+            await cdp.send('Network.enable')
+            cdp.on('Network.loadingFinished', self._on_loading_finished)
+        except Exception:
+            # Chromium이 아니면 전송량은 측정하지 않음
+            pass
+
+    def set_profile(self, name):
+        """프로필 변경 (이후 요청부터 적용)"""
+        if name not in BLOCK_PROFILES:
+            raise ValueError(f"알 수 없는 차단 프로필: {name}")
+        if name != 'off' and not self._routed:
+            raise ValueError(f"off 로 설치한 차단기는 측정만 합니다: {name}")
+        self.profile = name
+
+    def should_block(self, request):
+        """현재 프로필에서 차단할 요청인지"""
+        rules = BLOCK_PROFILES[self.profile]
+        if request.resource_type in rules['resource_types']:
+            return True
+        return rules['block_trackers'] and is_tracker(request.url)
+
+    async def _handle(self, route):
+        profile = self.profile
+        self._count(profile, '요청')
+        try:
+            if self.should_block(route.request):
+                self._count(profile, '차단')
+                await route.abort()
+            else:
+                await route.continue_()
+        except Exception:
+            # 페이지가 닫히는 중이면 무시
+            pass
+
+    def _on_request(self, request):
+        self._count(self.profile, '요청')
+
+    def _on_loading_finished(self, params):
+        self._count(self.profile, '전송바이트', int(params.get('encodedDataLength') or 0))
+
+    async def wait_for_text(self, page, started, timeout=30000):
+        """본문(innerText)이 보일 때까지 대기 → 이동 시작부터 걸린 시간 기록"""
+        try:
+            await page.wait_for_function(
+                "() => document.body && document.body.innerText.trim().length > 0",
+                timeout=timeout,
+            )
+        except Exception:
+            return None
+        elapsed = time.perf_counter() - started
+        self._count(self.profile, '본문측정')
+        self._count(self.profile, '본문시간', elapsed)
+        return elapsed
+
+    async def load_visible_images(self, page, max_y=1500, timeout=5000):
+        """images 프로필 전환 후 상단 이미지 다시 불러오기 (화면 밖 썸네일은 받지 않음)"""
+        count = await page.evaluate(RELOAD_IMAGES_SCRIPT, max_y)
+        if count:
+            try:
+                await page.wait_for_function(IMAGES_LOADED_SCRIPT, arg=max_y, timeout=timeout)
+            except Exception:
+                pass
+        return count
+
+    def begin_article(self):
+        """매물 단위 집계 초기화"""
+        self.article = {}
+
+    def print_article(self):
+        """매물 하나의 프로필별 전송량 출력"""
+        if not self.article:
+            return
+        parts = [f"{name} {s['전송바이트'] / 1024:.0f}KB (차단 {s['차단']}/{s['요청']}건)"
+                 for name, s in self.article.items()]
+        print(f"   ✓ 전송량: {', '.join(parts)}")
+
+def print_block_stats(stats):
+    """프로필별 전체 통계 출력"""
+    for name, s in stats.items():
+        line = (f"요청 차단[{name}]: 요청 {s['요청']}건, 차단 {s['차단']}건, "
+                f"전송 {s['전송바이트'] / 1024 / 1024:.1f}MB")
+        if s['본문측정']:
+            line += f", 평균 본문 표시 {s['본문시간'] / s['본문측정']:.2f}초"
+        print(line)
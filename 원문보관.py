@@ -0,0 +1,228 @@
+"""
+원문 보관 / 오프라인 재처리
+- 크롤링 중 읽은 원문(본문 innerText, 관리비 팝업, 시설 더보기 후 본문, 실거래가 표 행 또는 탭 텍스트)을
+  매물마다 JSON 한 줄로 압축 보관 (zstandard 패키지가 있으면 .jsonl.zst, 없으면 .jsonl.gz)
+  - 압축 스트림은 FLUSH_RECORDS개 또는 FLUSH_INTERVAL초마다 flush (매 줄 flush는 압축률과 속도를 떨어뜨림)
+    → 비정상 종료 시 마지막 flush 뒤의 매물은 보관본에서 빠질 수 있음, 잘린 파일은 읽은 데까지 사용
+  - 단지 캐시 값(단지캐시)은 보관하지 않음 → 재처리는 단지정보/개발예정/주변대중교통도 보관한 본문에서 다시 추출
+- 정규식을 고친 뒤 다시 크롤링하지 않고 보관본으로 매물 JSON 재생성 (브라우저 없음, 모든 코어 사용)
+  python 원문보관.py 원문폴더 --out 재처리결과 [--workers 8]
+"""
+import argparse
+import gzip
+import io
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from 필드추출 import collected_datetime, get_path, parse_article
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 끝이 잘린 압축 파일을 읽을 때 나는 오류 (gzip: EOFError, zstd: ZstdError)
+TRUNCATED_ERRORS = (EOFError, OSError) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+# 텍스트에서 다시 얻을 수 없는 값 (보관본에 그대로 저장)
+PRESERVED_PATHS = [
+    '기본정보.이미지',
+    '단지정보.위도',
+    '단지정보.경도',
+]
+
+# 보관하지 않는 키 (크롤링 때만 쓰는 값)
+LIVE_ONLY_KEYS = ('단지캐시',)
+
+# 재처리 작업 단위 (프로세스당 한 번에 넘기는 매물 수)
+REPARSE_BATCH_SIZE = 200
+
+# 보관 파일 flush 간격 (매물 수 / 초)
+FLUSH_RECORDS = 20
+FLUSH_INTERVAL = 10.0
+
+def default_codec():
+    return 'zst' if zstandard is not None else 'gz'
+
+def open_archive(path, mode):
+    """보관 파일 열기 (텍스트 모드, 확장자로 압축 방식 결정)"""
+    path = Path(path)
+    if path.suffix == '.zst':
+        if zstandard is None:
+            raise RuntimeError(f"zstandard 패키지가 필요합니다: {path}")
+        if mode == 'w':
+            raw = zstandard.ZstdCompressor(level=3).stream_writer(open(path, 'wb'))
+        else:
+            raw = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'))
+        return io.TextIOWrapper(raw, encoding='utf-8')
+    return gzip.open(path, f'{mode}t', encoding='utf-8')
+
+def new_snapshot(meta, detect_options=False):
+    """매물 하나의 원문 모음 (크롤링하면서 채움)"""
+    return {
+        '메타정보': meta,
+        '본문': '',
+        '관리비': '',
+        '시설본문': '',
+        '시설옵션': detect_options,
+        '실거래가': {},
+        '실거래가표': {},
+        '보존': {},
+        '응답필드': [],
+        '단지캐시': {},
+    }
+
+def finish_snapshot(snapshot, result, captured_fields=None):
+    """크롤링 결과에서 텍스트로 얻을 수 없는 값과 JSON 응답 값 기록"""
+    for path in PRESERVED_PATHS:
+        value = get_path(result, path)
+        if value not in (None, []):
+            snapshot['보존'][path] = value
+    if captured_fields:
+        snapshot['응답필드'] = [[section, field, value] for (section, field), value in captured_fields.items()]
+    return snapshot
+
+class SnapshotArchive:
+    """실행 단위 원문 보관 파일 (원문_{시각}_{pid}.jsonl.gz|zst)"""
+
+    def __init__(self, folder, codec=None, flush_records=FLUSH_RECORDS, flush_interval=FLUSH_INTERVAL):
+        os.makedirs(folder, exist_ok=True)
+        codec = codec or default_codec()
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.path = Path(folder) / f'원문_{stamp}_{os.getpid()}.jsonl.{codec}'
+        self._file = open_archive(self.path, 'w')
+        self.count = 0
+        self.raw_bytes = 0
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, snapshot):
+        """매물 원문 한 줄 추가 (flush_records개 또는 flush_interval초마다 flush, 단지 캐시 값은 빼고)"""
+        record = {key: value for key, value in snapshot.items() if key not in LIVE_ONLY_KEYS}
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        self._file.write(line)
+        self.count += 1
+        self.raw_bytes += len(line.encode('utf-8'))
+        self._unflushed += 1
+        if self._unflushed >= self.flush_records or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._unflushed:
+            self._file.flush()
+            self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self._file.close()
+        size = self.path.stat().st_size
+        ratio = size / self.raw_bytes * 100 if self.raw_bytes else 0
+        print(f"원문 보관: {self.count}개 매물, {self.raw_bytes / 1024 / 1024:.1f}MB → "
+              f"{size / 1024 / 1024:.1f}MB ({ratio:.0f}%), {self.path}")
+
+def archive_files(folder):
+    """폴더 안 보관 파일 목록"""
+    folder = Path(folder)
+    return sorted(list(folder.glob('원문_*.jsonl.gz')) + list(folder.glob('원문_*.jsonl.zst')))
+
+def read_archive(path):
+    """보관 파일 → 줄 목록 (중간에 끊긴 파일은 읽은 데까지)"""
+    with open_archive(path, 'r') as f:
+        try:
+            for line in f:
+                if line.strip():
+                    yield line
+        except TRUNCATED_ERRORS:
+            print(f"     ℹ 끝이 잘린 보관 파일 (읽은 데까지 사용): {path}")
+
+def article_filename(result):
+    """재처리 결과 파일 이름 (매물ID + 수집시각)"""
+    meta = result['메타정보']
+    stamp = collected_datetime(meta.get('수집시간')).strftime('%Y%m%d_%H%M%S')
+    return f"article_{meta.get('매물ID', 'unknown')}_{stamp}.json"
+
+def reparse_lines(lines, out_folder):
+    """원문 줄 묶음 → 매물 JSON 파일 (작업 프로세스에서 실행) → (성공, 실패)
+    - 예전 보관본에 남은 단지캐시는 버리고 본문에서 다시 추출
+    """
+    ok = failed = 0
+    for line in lines:
+        try:
+            snapshot = json.loads(line)
+            for key in LIVE_ONLY_KEYS:
+                snapshot.pop(key, None)
+            result = parse_article(snapshot)
+            with open(os.path.join(out_folder, article_filename(result)), 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            ok += 1
+        except Exception:
+            failed += 1
+    return ok, failed
+
+def iter_batches(folder, batch_size=REPARSE_BATCH_SIZE):
+    """모든 보관 파일의 줄을 batch_size개씩"""
+    batch = []
+    for path in archive_files(folder):
+        for line in read_archive(path):
+            batch.append(line)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+def reparse(folder, out_folder, workers=None, batch_size=REPARSE_BATCH_SIZE):
+    """보관 폴더 전체 재처리 (프로세스 풀, 대기 중인 묶음은 워커 수의 2배까지만)"""
+    os.makedirs(out_folder, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    counts = {'성공': 0, '실패': 0}
+    started = time.perf_counter()
+
+    def collect(done):
+        for future in done:
+            ok, failed = future.result()
+            counts['성공'] += ok
+            counts['실패'] += failed
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for batch in iter_batches(folder, batch_size):
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(pool.submit(reparse_lines, batch, out_folder))
+        collect(wait(pending)[0])
+
+    elapsed = time.perf_counter() - started
+    return counts, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="보관한 원문으로 매물 JSON 재생성")
+    parser.add_argument('folder', help="원문 보관 폴더 (원문_*.jsonl.gz|zst)")
+    parser.add_argument('--out', required=True, help="재처리한 매물 JSON 저장 폴더")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument('--batch-size', type=int, default=REPARSE_BATCH_SIZE, help="프로세스당 한 번에 처리할 매물 수")
+    args = parser.parse_args()
+
+    files = archive_files(args.folder)
+    if not files:
+        print(f"❌ 보관 파일이 없습니다: {args.folder}")
+        return
+
+    print("\n" + "="*80)
+    print(f"원문 재처리: 보관 파일 {len(files)}개 → {args.out}")
+    print("="*80)
+
+    counts, elapsed = reparse(args.folder, args.out, args.workers, args.batch_size)
+    total = counts['성공'] + counts['실패']
+    rate = total / elapsed if elapsed > 0 else 0
+    print(f"✓ 성공 {counts['성공']}개, 실패 {counts['실패']}개 ({elapsed:.2f}초, {rate:.0f}개/초)")
+    print("="*80 + "\n")
+
+if __name__ == "__main__":
+    main()
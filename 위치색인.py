@@ -0,0 +1,408 @@
+"""
+단지 위치 색인 (격자)
+- build: 매물 출력 폴더(하위 폴더 포함)의 단지정보.위도/경도 → 단지별 점 (매물ID 목록, 개발예정 역 거리)
+  (단지는 메타정보.단지ID → 단지 주소 → 좌표 순으로 구분, 문자열 좌표도 숫자로)
+  → 폴더/위치색인.json 저장 (불러올 때 격자를 다시 만듦, 단지 수천 개면 수 ms)
+- 격자: 위도/경도를 cell_deg(기본 0.01도 ≈ 1.1km) 칸으로 나눈 dict → 질의는 범위에 걸친 칸만 확인
+  - radius: 반경(m) 안 단지 (가까운 순), bbox: 남/서/북/동 범위 안 단지
+  - nearest: 가까운 k개 (질의 칸부터 고리 모양으로 넓혀 가며 더 가까운 단지가 없을 때까지)
+- 개발예정 역: 매물마다 기록한 역까지 거리(거리_미터)를 그대로 사용
+  - station: 역 이름 → 그 역 거리가 기록된 단지 (가까운 순, --radius 이하)
+  - 역 좌표: 거리가 기록된 단지가 3개 이상이면 삼변측량으로 추정 → --station 역명 으로 반경 질의 중심에 사용
+- 실행:
+  python 위치색인.py build 매물데이터
+  python 위치색인.py radius 매물데이터 --at 37.4843,126.9016 --radius 1000
+  python 위치색인.py radius 매물데이터 --station 독산역 --radius 1000
+  python 위치색인.py bbox 매물데이터 --box 37.47,126.88,37.49,126.91
+  python 위치색인.py nearest 매물데이터 --at 37.4843,126.9016 --k 5
+  python 위치색인.py station 매물데이터 --name 독산역
+  python 위치색인.py bench 매물데이터 [--queries 10000]
+"""
+import argparse
+import json
+import math
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+from 단계계측 import percentile
+from 분석저장소 import source_folders
+from 출력저장소 import iter_records
+
+INDEX_FILE_NAME = '위치색인.json'
+
+# 격자 칸 크기 (도), 위도 1도 거리 (m)
+DEFAULT_CELL_DEG = 0.01
+METERS_PER_DEG = 111320.0
+EARTH_RADIUS_M = 6371008.8
+
+# 역 좌표 추정 반복 횟수
+TRILATERATION_STEPS = 50
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    """두 좌표 사이 거리 (m)"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+# ===== 단지 점 모으기 =====
+
+def to_coordinate(value):
+    """위도/경도 값(숫자 또는 문자열) → float (없거나 숫자가 아니면 None)"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+def find_point(by_key, keys, complex_id):
+    """키 목록 중 먼저 찾은 점 (단지ID가 다른 점은 주소가 같아도 건너뜀)"""
+    for key in keys:
+        point = by_key.get(key)
+        if point is not None and (not complex_id or not point['단지ID'] or point['단지ID'] == complex_id):
+            return point
+    return None
+
+def complex_points(records):
+    """
+    매물 기록 → 단지별 점 목록 (좌표 없는 매물은 제외)
+    - 같은 단지: 메타정보.단지ID가 있으면 단지ID, 없으면 단지 주소, 주소도 없으면 좌표로 묶음
+      (단지ID 없이 수집한 예전 매물도 주소가 같으면 같은 점으로)
+    """
+    points = []
+    by_key = {}
+    for record in records:
+        complex_info = record.get('단지정보') or {}
+        lat, lng = to_coordinate(complex_info.get('위도')), to_coordinate(complex_info.get('경도'))
+        if lat is None or lng is None:
+            continue
+        meta = record.get('메타정보') or {}
+        complex_id = str(meta.get('단지ID') or '') or None
+        address = complex_info.get('위치')
+        keys = [f"단지ID:{complex_id}"] if complex_id else []
+        keys.append(f"주소:{address}" if address else f"좌표:{lat:.5f},{lng:.5f}")
+        point = find_point(by_key, keys, complex_id)
+        if point is None:
+            point = {
+                '단지': address or f"{lat:.5f},{lng:.5f}",
+                '단지ID': complex_id,
+                '단지명': (record.get('매물정보') or {}).get('단지명'),
+                '위도': lat,
+                '경도': lng,
+                '매물ID': [],
+                '개발예정': {},
+            }
+            points.append(point)
+        elif complex_id and not point['단지ID']:
+            point['단지ID'] = complex_id
+        for key in keys:
+            by_key.setdefault(key, point)
+        article_id = meta.get('매물ID')
+        if article_id and article_id not in point['매물ID']:
+            point['매물ID'].append(article_id)
+        for plan in record.get('개발예정') or []:
+            if plan.get('역명') and plan.get('거리_미터') is not None:
+                point['개발예정'][plan['역명']] = plan['거리_미터']
+    return points
+
+# ===== 격자 색인 =====
+
+class GridIndex:
+    """단지 점 격자 색인 (칸 → 점 번호 목록)"""
+
+    def __init__(self, points, cell_deg=DEFAULT_CELL_DEG):
+        self.points = points
+        self.cell_deg = cell_deg
+        self.cells = {}
+        # 개발예정 역 → [(기록된 거리 m, 점 번호)] 가까운 순
+        self.stations = {}
+        for i, point in enumerate(points):
+            self.cells.setdefault(self.cell_of(point['위도'], point['경도']), []).append(i)
+            for name, distance in point.get('개발예정', {}).items():
+                self.stations.setdefault(name, []).append((distance, i))
+        for entries in self.stations.values():
+            entries.sort()
+        if self.cells:
+            rows = [cell[0] for cell in self.cells]
+            cols = [cell[1] for cell in self.cells]
+            self.bounds = (min(rows), min(cols), max(rows), max(cols))
+        else:
+            self.bounds = None
+
+    def cell_of(self, lat, lng):
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    # ----- 저장/불러오기 -----
+
+    def save(self, path):
+        data = {
+            '생성시간': datetime.now().isoformat(),
+            '셀크기_도': self.cell_deg,
+            '단지수': len(self.points),
+            '단지': self.points,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['단지'], data.get('셀크기_도', DEFAULT_CELL_DEG))
+
+    # ----- 질의 -----
+
+    def _cells_in(self, south, west, north, east):
+        """범위에 걸친 칸의 점 번호"""
+        row0, col0 = self.cell_of(south, west)
+        row1, col1 = self.cell_of(north, east)
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                yield from self.cells.get((row, col), ())
+
+    def bbox(self, south, west, north, east):
+        """남/서/북/동 범위 안 점"""
+        return [self.points[i] for i in self._cells_in(south, west, north, east)
+                if south <= self.points[i]['위도'] <= north and west <= self.points[i]['경도'] <= east]
+
+    def radius(self, lat, lng, meters):
+        """반경(m) 안 점 → [(거리 m, 점)] 가까운 순"""
+        dlat = meters / METERS_PER_DEG
+        dlng = meters / (METERS_PER_DEG * max(math.cos(math.radians(lat)), 1e-6))
+        found = []
+        for i in self._cells_in(lat - dlat, lng - dlng, lat + dlat, lng + dlng):
+            point = self.points[i]
+            distance = haversine_m(lat, lng, point['위도'], point['경도'])
+            if distance <= meters:
+                found.append((distance, point))
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def nearest(self, lat, lng, k=5):
+        """가까운 k개 → [(거리 m, 점)] (칸 고리를 넓혀 가며, 남은 칸이 더 멀면 끝)"""
+        if not self.points:
+            return []
+        k = min(k, len(self.points))
+        row, col = self.cell_of(lat, lng)
+        # 경도 방향 칸이 더 좁으므로 그쪽 폭으로 '확인한 거리' 계산
+        cell_m = self.cell_deg * METERS_PER_DEG * max(math.cos(math.radians(lat)), 1e-6)
+        min_row, min_col, max_row, max_col = self.bounds
+        max_ring = max(abs(row - min_row), abs(row - max_row), abs(col - min_col), abs(col - max_col))
+        found = []
+        for ring in range(max_ring + 1):
+            for r in range(row - ring, row + ring + 1):
+                for c in range(col - ring, col + ring + 1):
+                    if max(abs(r - row), abs(c - col)) != ring:
+                        continue
+                    for i in self.cells.get((r, c), ()):
+                        point = self.points[i]
+                        found.append((haversine_m(lat, lng, point['위도'], point['경도']), point))
+            if len(found) >= k:
+                found.sort(key=lambda item: item[0])
+                # 아직 안 본 칸까지 최소 거리 = ring 칸 폭
+                if found[k - 1][0] <= ring * cell_m:
+                    break
+        found.sort(key=lambda item: item[0])
+        return found[:k]
+
+    # ----- 개발예정 역 -----
+
+    def station(self, name, meters=None):
+        """개발예정 역까지 기록된 거리 → [(거리 m, 점)] 가까운 순"""
+        return [(distance, self.points[i]) for distance, i in self.stations.get(name, [])
+                if meters is None or distance <= meters]
+
+    def station_names(self):
+        """역 이름 → 거리가 기록된 단지 수"""
+        return {name: len(entries) for name, entries in self.stations.items()}
+
+    def estimate_station(self, name):
+        """역 좌표 추정 (거리가 기록된 단지 3개 이상, 가우스-뉴턴 삼변측량) → (위도, 경도, 평균오차 m) 또는 None"""
+        anchors = [(self.points[i]['위도'], self.points[i]['경도'], distance)
+                   for distance, i in self.stations.get(name, [])]
+        if len(anchors) < 3:
+            return None
+        lat0 = sum(a[0] for a in anchors) / len(anchors)
+        lng0 = sum(a[1] for a in anchors) / len(anchors)
+        # 평균 좌표 기준 평면(m) 좌표
+        lng_m = METERS_PER_DEG * math.cos(math.radians(lat0))
+        xy = [((lng - lng0) * lng_m, (lat - lat0) * METERS_PER_DEG, distance) for lat, lng, distance in anchors]
+        x = y = 0.0
+        for _ in range(TRILATERATION_STEPS):
+            # 정규방정식 (J^T J) d = -J^T r
+            a11 = a12 = a22 = b1 = b2 = 0.0
+            for px, py, distance in xy:
+                dx, dy = x - px, y - py
+                norm = math.hypot(dx, dy) or 1e-9
+                jx, jy = dx / norm, dy / norm
+                residual = norm - distance
+                a11 += jx * jx
+                a12 += jx * jy
+                a22 += jy * jy
+                b1 -= jx * residual
+                b2 -= jy * residual
+            det = a11 * a22 - a12 * a12
+            if abs(det) < 1e-12:
+                return None
+            step_x = (b1 * a22 - b2 * a12) / det
+            step_y = (a11 * b2 - a12 * b1) / det
+            x, y = x + step_x, y + step_y
+            if math.hypot(step_x, step_y) < 0.01:
+                break
+        error = sum(abs(math.hypot(x - px, y - py) - distance) for px, py, distance in xy) / len(xy)
+        return lat0 + y / METERS_PER_DEG, lng0 + x / lng_m, error
+
+# ===== 만들기/불러오기 =====
+
+def index_path(folder):
+    return Path(folder) / INDEX_FILE_NAME
+
+def build_index(folder, cell_deg=DEFAULT_CELL_DEG):
+    """매물 출력 폴더(하위 포함) → 위치색인.json → (색인, 파일 경로, 읽은 매물 수)"""
+    count = 0
+
+    def records():
+        nonlocal count
+        for source in source_folders(folder):
+            for record in iter_records(source):
+                count += 1
+                yield record
+
+    index = GridIndex(complex_points(records()), cell_deg)
+    return index, index.save(index_path(folder)), count
+
+def load_index(folder):
+    """폴더/위치색인.json (폴더 대신 색인 파일 경로도 가능)"""
+    path = Path(folder)
+    return GridIndex.load(path if path.is_file() else index_path(path))
+
+# ===== 명령행 =====
+
+def parse_coordinates(text, count):
+    values = [float(v) for v in text.split(',')]
+    if len(values) != count:
+        raise ValueError(f"좌표 {count}개가 필요합니다: {text}")
+    return values
+
+def print_points(found, elapsed, limit=20):
+    """[(거리, 점)] 또는 [점] 출력"""
+    for item in found[:limit]:
+        distance, point = item if isinstance(item, tuple) else (None, item)
+        head = f"{distance:7.0f}m  " if distance is not None else ''
+        name = f" {point['단지명']}" if point.get('단지명') else ''
+        print(f"   {head}{point['단지']}{name} ({point['위도']:.5f}, {point['경도']:.5f}) 매물 {len(point['매물ID'])}개")
+    if len(found) > limit:
+        print(f"   ... 외 {len(found) - limit}개")
+    articles = sum(len((item[1] if isinstance(item, tuple) else item)['매물ID']) for item in found)
+    print(f"\n단지 {len(found)}개, 매물 {articles}개, {elapsed * 1e6:.0f}µs")
+
+def run_bench(index, queries, seed=0):
+    """무작위 반경/최근접 질의 시간 (µs p50/p95)"""
+    if not index.points:
+        print("❌ 색인에 단지가 없습니다")
+        return
+    rng = random.Random(seed)
+    lats = [p['위도'] for p in index.points]
+    lngs = [p['경도'] for p in index.points]
+    centers = [(rng.uniform(min(lats), max(lats)), rng.uniform(min(lngs), max(lngs))) for _ in range(queries)]
+    print(f"\n위치색인 질의 {queries}개 (단지 {len(index.points)}개, 칸 {len(index.cells)}개)")
+    for label, query in [('radius 1km', lambda lat, lng: index.radius(lat, lng, 1000)),
+                         ('nearest k=5', lambda lat, lng: index.nearest(lat, lng, 5)),
+                         ('bbox ±0.01도', lambda lat, lng: index.bbox(lat - 0.01, lng - 0.01, lat + 0.01, lng + 0.01))]:
+        times = []
+        for lat, lng in centers:
+            started = time.perf_counter()
+            query(lat, lng)
+            times.append(time.perf_counter() - started)
+        print(f"   - {label}: p50 {percentile(times, 0.5) * 1e6:.0f}µs, p95 {percentile(times, 0.95) * 1e6:.0f}µs")
+
+def main():
+    parser = argparse.ArgumentParser(description="단지 위치 색인 (반경/범위/최근접/개발예정 역)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="매물 폴더 → 폴더/위치색인.json")
+    build.add_argument('folder', help="매물 데이터 폴더 (하위 폴더 포함)")
+    build.add_argument('--cell', type=float, default=DEFAULT_CELL_DEG, help=f"격자 칸 크기(도, 기본 {DEFAULT_CELL_DEG})")
+
+    radius = commands.add_parser('radius', help="반경 안 단지")
+    radius.add_argument('folder', help="매물 데이터 폴더 또는 위치색인.json")
+    radius.add_argument('--at', help="중심 '위도,경도'")
+    radius.add_argument('--station', help="중심으로 쓸 개발예정 역 이름 (좌표 추정)")
+    radius.add_argument('--radius', type=float, default=1000, help="반경(m, 기본 1000)")
+
+    bbox = commands.add_parser('bbox', help="범위 안 단지")
+    bbox.add_argument('folder', help="매물 데이터 폴더 또는 위치색인.json")
+    bbox.add_argument('--box', required=True, help="'남,서,북,동' (위도,경도,위도,경도)")
+
+    nearest = commands.add_parser('nearest', help="가까운 단지 k개")
+    nearest.add_argument('folder', help="매물 데이터 폴더 또는 위치색인.json")
+    nearest.add_argument('--at', required=True, help="중심 '위도,경도'")
+    nearest.add_argument('--k', type=int, default=5, help="개수 (기본 5)")
+
+    station = commands.add_parser('station', help="개발예정 역까지 기록된 거리로 단지 찾기")
+    station.add_argument('folder', help="매물 데이터 폴더 또는 위치색인.json")
+    station.add_argument('--name', help="역 이름 (없으면 역 목록)")
+    station.add_argument('--radius', type=float, help="최대 거리(m)")
+
+    bench = commands.add_parser('bench', help="무작위 질의 시간 측정")
+    bench.add_argument('folder', help="매물 데이터 폴더 또는 위치색인.json")
+    bench.add_argument('--queries', type=int, default=10000, help="질의 수 (기본 10000)")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        started = time.perf_counter()
+        index, path, count = build_index(args.folder, args.cell)
+        print(f"✅ 위치색인 저장: {path} (매물 {count}개 → 단지 {len(index.points)}개, 칸 {len(index.cells)}개, "
+              f"{time.perf_counter() - started:.1f}초)")
+        return
+
+    try:
+        index = load_index(args.folder)
+    except FileNotFoundError:
+        print(f"❌ 위치색인이 없습니다: {args.folder} (먼저 python 위치색인.py build {args.folder})")
+        return
+
+    try:
+        if args.command == 'radius':
+            if args.station:
+                estimate = index.estimate_station(args.station)
+                if estimate is None:
+                    print(f"❌ {args.station}: 거리가 기록된 단지가 3개 미만이라 좌표를 추정할 수 없습니다")
+                    return
+                lat, lng, error = estimate
+                print(f"   {args.station} 추정 좌표: {lat:.5f}, {lng:.5f} (평균 오차 {error:.0f}m)")
+            elif args.at:
+                lat, lng = parse_coordinates(args.at, 2)
+            else:
+                print("❌ --at 또는 --station 이 필요합니다")
+                return
+            started = time.perf_counter()
+            found = index.radius(lat, lng, args.radius)
+            print_points(found, time.perf_counter() - started)
+        elif args.command == 'bbox':
+            south, west, north, east = parse_coordinates(args.box, 4)
+            started = time.perf_counter()
+            found = index.bbox(south, west, north, east)
+            print_points(found, time.perf_counter() - started)
+        elif args.command == 'nearest':
+            lat, lng = parse_coordinates(args.at, 2)
+            started = time.perf_counter()
+            found = index.nearest(lat, lng, args.k)
+            print_points(found, time.perf_counter() - started)
+        elif args.command == 'station':
+            if not args.name:
+                for name, count in sorted(index.station_names().items(), key=lambda item: -item[1]):
+                    print(f"   {name}: 단지 {count}개")
+                return
+            started = time.perf_counter()
+            found = index.station(args.name, args.radius)
+            print_points(found, time.perf_counter() - started)
+        elif args.command == 'bench':
+            run_bench(index, args.queries)
+    except ValueError as e:
+        print(f"❌ {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+매물 위치좌표 수집
+- 좌표 캐시(단지캐시.db coordinates 테이블) → 단지ID 또는 주소(단지정보.위치)로 먼저 조회
+- 캐시에 없으면 모바일 near 페이지(m.land.naver.com/near/article/{매물ID}) 소스에서 좌표 패턴 검색
+  1) 컨텍스트 요청(쿠키 공유)으로 HTML만 받아서 검색 (렌더링 없음)
+  2) 없으면 같은 컨텍스트의 별도 탭에서 열어 렌더링된 소스 검색 (이미지/폰트/미디어 차단)
+- 로드뷰 팝업을 열지 않고, 매물 페이지(lease.page)는 이동하지 않음 → 원래 페이지 복귀 불필요
+"""
+import re
+from 단계계측 import timed
+from 페이지도구 import wait_for_element
+
+# near 페이지 소스 좌표 패턴 (위도, 경도 순서)
+SOURCE_PATTERNS = [
+    r'map\.naver\.com/viewer/panorama[^"\']*lat=([0-9.]+)[^"\']*lng=([0-9.]+)',
+    r'lat=([0-9.]+)[^"\'&]*lng=([0-9.]+)',
+    r'"latitude"\s*:\s*([0-9.]+)[^}]{0,200}"longitude"\s*:\s*([0-9.]+)',
+    r'"lat"\s*:\s*([0-9.]+)[^}]{0,200}"lng"\s*:\s*([0-9.]+)',
+    r'"y"\s*:\s*([0-9.]+)[^}]{0,200}"x"\s*:\s*([0-9.]+)',
+]
+COMPILED_SOURCE_PATTERNS = [re.compile(p) for p in SOURCE_PATTERNS]
+
+# near 페이지 주소 (벤치마크에서는 픽스처 서버 주소로 바꿈)
+NEAR_BASE_URL = 'https://m.land.naver.com'
+
+# near 페이지 준비 표시 (지도 컨트롤 버튼)
+NEAR_READY_SELECTOR = 'button[class*="roadview"], button[class*="btn_control"]'
+
+# 별도 탭에서 받지 않을 리소스
+TAB_BLOCKED_TYPES = {'image', 'media', 'font', 'stylesheet'}
+
+# 좌표를 어디서 얻었는지 (캐시/소스요청/별도탭/실패)
+COORDINATE_STATS = {'캐시': 0, '소스요청': 0, '별도탭': 0, '실패': 0}
+
+def valid_coordinate(lat, lng):
+    """좌표 유효성 검증 (한국 범위)"""
+    return 33.0 <= lat <= 39.0 and 124.0 <= lng <= 132.0
+
+def near_url(article_id):
+    return f"{NEAR_BASE_URL}/near/article/{article_id}"
+
+def coordinate_keys(complex_id=None, address=None):
+    """좌표 캐시 키 (단지ID 우선, 다음 주소)"""
+    keys = []
+    if complex_id:
+        keys.append(f'단지:{complex_id}')
+    if address:
+        keys.append('주소:' + re.sub(r'\s+', ' ', address).strip())
+    return keys
+
+def source_coordinates(page_content):
+    """페이지 소스에서 좌표 검색 → (위도, 경도) 또는 None"""
+    for pattern in COMPILED_SOURCE_PATTERNS:
+        for match in pattern.findall(page_content):
+            try:
+                lat = float(match[0])
+                lng = float(match[1])
+            except ValueError:
+                continue
+            if valid_coordinate(lat, lng):
+                return lat, lng
+    return None
+
+async def request_near_source(lease, article_id):
+    """near 페이지 HTML (컨텍스트 요청, 렌더링 없음)"""
+    url = near_url(article_id)
+    if lease.limiter is not None:
+        await lease.limiter.acquire(url)
+    response = await lease.context.request.get(url, timeout=15000)
+    if not response.ok:
+        return ''
+    return await response.text()
+
+async def _block_heavy(route):
+    if route.request.resource_type in TAB_BLOCKED_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def tab_near_source(lease, article_id):
+    """near 페이지를 같은 컨텍스트의 별도 탭에서 열어 렌더링된 소스 (탭은 바로 닫음)"""
+    url = near_url(article_id)
+    tab = await lease.context.new_page()
+    try:
+        await tab.route('**/*', _block_heavy)
+        if lease.limiter is not None:
+            await lease.limiter.acquire(url)
+        await tab.goto(url, wait_until='domcontentloaded', timeout=30000)
+        await wait_for_element(tab, NEAR_READY_SELECTOR, "near 페이지", timeout=5000)
+        return await tab.content()
+    finally:
+        await tab.close()
+
+async def collect_coordinates(lease, article_id):
+    """near 페이지 소스에서 좌표 → (위도, 경도) 또는 None (매물 페이지는 그대로)"""
+    try:
+        coordinates = source_coordinates(await request_near_source(lease, article_id))
+        if coordinates is not None:
+            COORDINATE_STATS['소스요청'] += 1
+            print(f"     ✓ 좌표 (near 페이지 소스): {coordinates[0]}, {coordinates[1]}")
+            return coordinates
+    except Exception as e:
+        print(f"     ℹ near 페이지 요청 실패: {e}")
+
+    print("     → 별도 탭에서 near 페이지 검색...")
+    try:
+        coordinates = source_coordinates(await tab_near_source(lease, article_id))
+    except Exception as e:
+        print(f"     ℹ 별도 탭 처리 실패: {e}")
+        coordinates = None
+    if coordinates is not None:
+        COORDINATE_STATS['별도탭'] += 1
+        print(f"     ✓ 좌표 (별도 탭): {coordinates[0]}, {coordinates[1]}")
+    else:
+        COORDINATE_STATS['실패'] += 1
+        print("     ℹ 좌표 수집 실패")
+    return coordinates
+
+@timed('find_coordinates (별도 작업)')
+async def find_coordinates(lease, article_id, keys=(), cache=None):
+    """
+    좌표 캐시 → 없으면 near 페이지 소스 → (위도, 경도) 또는 None
+    - keys: coordinate_keys() 결과, cache: 단지캐시.ComplexCache (없으면 캐시 생략)
+    - 새로 찾은 좌표는 모든 키로 캐시에 저장
+    """
+    if cache is not None and keys:
+        coordinates = cache.get_coordinates(keys)
+        if coordinates is not None:
+            COORDINATE_STATS['캐시'] += 1
+            print(f"     ✓ 좌표 캐시 ({keys[0]}): {coordinates[0]}, {coordinates[1]}")
+            return coordinates
+
+    coordinates = await collect_coordinates(lease, article_id)
+    if coordinates is not None and cache is not None and keys:
+        cache.put_coordinates(keys, coordinates)
+    return coordinates
+
+def print_coordinate_stats():
+    total = sum(COORDINATE_STATS.values())
+    if not total:
+        return
+    print(f"위치좌표: 캐시 {COORDINATE_STATS['캐시']}, near 소스 {COORDINATE_STATS['소스요청']}, "
+          f"별도 탭 {COORDINATE_STATS['별도탭']}, 실패 {COORDINATE_STATS['실패']} (총 {total}건)")
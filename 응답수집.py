@@ -0,0 +1,298 @@
+"""
+네트워크 응답 수집
+- 매물 페이지가 렌더링 전에 받아오는 JSON(XHR/fetch) 응답을 page.on('response')로 기록
+- 매물 상세 API 경로별 JSON 경로표(API_FIELDS)로 columns_structure.json 스키마 필드에 매핑
+  (다른 응답의 같은 이름 키는 읽지 않음)
+- 정규식 추출은 그대로 두고, 응답에서 찾은 값이 있으면 그 값을 우선 사용
+- 기록한 응답은 JSONL 픽스처로 저장 → 브라우저 없이 매핑 결과 확인
+  python 응답수집.py 응답_{매물ID}.jsonl
+  python 응답수집.py 응답픽스처/응답_2561654187.jsonl --expect 응답픽스처/기대값_2561654187.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+from urllib.parse import urlparse
+
+# 수집할 응답 (XHR/fetch + JSON)
+CAPTURE_RESOURCE_TYPES = ('xhr', 'fetch')
+MAX_BODY_BYTES = 2_000_000
+
+def to_number(value):
+    """숫자/숫자 문자열 → int 또는 float"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    match = re.search(r'-?[\d,]+(?:\.\d+)?', str(value))
+    if not match:
+        return None
+    number = float(match.group().replace(',', ''))
+    return int(number) if number.is_integer() else number
+
+def to_date(value):
+    """'20251117' / '2025.11.17' / '2025-11-17T..' → '2025-11-17'"""
+    digits = re.sub(r'\D', '', str(value))
+    if len(digits) < 8:
+        return None
+    return f"{digits[:4]}-{digits[4:6]}-{digits[6:8]}"
+
+def to_text(value):
+    """문자열 정리"""
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    text = str(value).strip()
+    return text or None
+
+def won_to_manwon(value):
+    """원 → 만원"""
+    number = to_number(value)
+    if number is None:
+        return None
+    manwon = number / 10000
+    return int(manwon) if float(manwon).is_integer() else round(manwon, 1)
+
+def to_bool(value):
+    """'Y'/'N', true/false → bool"""
+    if isinstance(value, bool):
+        return value
+    if str(value).upper() in ('Y', 'TRUE', '1'):
+        return True
+    if str(value).upper() in ('N', 'FALSE', '0'):
+        return False
+    return None
+
+# 매물 상세 API 경로 → {(섹션, 필드): (JSON 경로, 변환 함수)}
+# - 경로는 '.'으로 구분 (리스트는 숫자 위치), 응답마다 정해진 위치만 읽음
+# - 응답 모양은 응답픽스처/ 의 기록 참고 (--save-responses로 다시 기록해서 확인)
+API_FIELDS = {
+    '/front-api/v1/article/basicInfo': {
+        ('기본정보', '매물번호'): ('result.articleNumber', to_text),
+        ('기본정보', '공급면적_제곱미터'): ('result.spaceInfo.supplySpace', to_number),
+        ('기본정보', '전용면적_제곱미터'): ('result.spaceInfo.exclusiveSpace', to_number),
+        ('기본정보', '전용률_퍼센트'): ('result.spaceInfo.exclusiveSpaceRate', to_number),
+        ('기본정보', '해당층'): ('result.floorInfo.correspondingFloorCount', to_number),
+        ('기본정보', '총층수'): ('result.floorInfo.totalFloorCount', to_number),
+        ('기본정보', '방수'): ('result.detailInfo.roomCount', to_number),
+        ('기본정보', '욕실수'): ('result.detailInfo.bathroomCount', to_number),
+        ('기본정보', '향'): ('result.detailInfo.directionTypeName', to_text),
+        ('기본정보', '복층여부'): ('result.detailInfo.duplexTypeName', to_text),
+        ('기본정보', '입주가능일'): ('result.detailInfo.moveInTypeName', to_text),
+        ('기본정보', '매물소개'): ('result.detailInfo.articleDescription', to_text),
+        ('기본정보', '최초게재일'): ('result.exposureStartDate', to_date),
+        ('기본정보', '제공업체'): ('result.cpName', to_text),
+        ('기본정보', '관리비_만원'): ('result.managementFee.monthlyManagementCost', won_to_manwon),
+        ('기본정보', '관리비부과기준'): ('result.managementFee.managementCostTypeName', to_text),
+        ('매물정보', '집주인확인매물'): ('result.verificationInfo.isOwnerConfirmed', to_bool),
+        ('매물정보', '집주인확인일'): ('result.verificationInfo.ownerConfirmYmd', to_date),
+    },
+    '/front-api/v1/complex': {
+        ('단지정보', '위도'): ('result.coordinates.yCoordinate', to_number),
+        ('단지정보', '경도'): ('result.coordinates.xCoordinate', to_number),
+        ('단지정보', '건축물용도'): ('result.buildingUseTypeName', to_text),
+        ('단지정보', '사용승인일'): ('result.useApproveYmd', to_date),
+        ('단지정보', '총세대수'): ('result.totalHouseholdCount', to_number),
+        ('단지정보', '현관구조'): ('result.entranceTypeName', to_text),
+        ('단지정보', '난방'): ('result.heatMethodTypeName', to_text),
+        ('단지정보', '주차대수'): ('result.parkingInfo.totalParkingCount', to_number),
+        ('단지정보', '세대당주차'): ('result.parkingInfo.parkingCountPerHousehold', to_number),
+        ('단지정보', '용적률_퍼센트'): ('result.floorAreaRatio', to_number),
+        ('단지정보', '건폐율_퍼센트'): ('result.buildingCoverageRatio', to_number),
+        ('단지정보', '관리사무소전화'): ('result.managementOfficeTelNo', to_text),
+        ('단지정보', '건설사'): ('result.constructionCompanyName', to_text),
+    },
+    '/front-api/v1/complex/pyeong': {
+        ('단지정보', '해당면적세대수'): ('result.householdCount', to_number),
+    },
+    '/front-api/v1/article/agent': {
+        ('중개사', '전화'): ('result.representativeTelNo', to_text),
+        ('중개사', '위치'): ('result.address', to_text),
+        ('중개사', '등록번호'): ('result.establishRegistrationNo', to_text),
+    },
+}
+
+# ResponseCapture url_keywords로 넘기는 API 경로
+API_PATHS = tuple(API_FIELDS)
+
+def compile_paths(table):
+    """'a.b.0' → ('a', 'b', 0)"""
+    return {
+        target: (tuple(int(part) if part.isdigit() else part for part in path.split('.')), convert)
+        for target, (path, convert) in table.items()
+    }
+
+COMPILED_FIELDS = {endpoint: compile_paths(table) for endpoint, table in API_FIELDS.items()}
+
+def endpoint_of(url):
+    """응답 URL → API_FIELDS 경로 (매물 상세 API가 아니면 None)"""
+    path = urlparse(url).path.rstrip('/')
+    return path if path in COMPILED_FIELDS else None
+
+def get_json_path(data, path):
+    """JSON에서 경로 값 (중간에 없으면 None)"""
+    for part in path:
+        if isinstance(part, int):
+            if not isinstance(data, list) or part >= len(data):
+                return None
+            data = data[part]
+        elif isinstance(data, dict):
+            data = data.get(part)
+        else:
+            return None
+        if data is None:
+            return None
+    return data
+
+def map_responses(responses):
+    """수집한 응답 목록 → {(섹션, 필드): 값} (API 경로별 정해진 위치만, 먼저 온 응답 우선)"""
+    fields = {}
+    for response in responses:
+        endpoint = endpoint_of(response['URL'])
+        if endpoint is None or not 200 <= response.get('상태', 200) < 300:
+            continue
+        for target, (path, convert) in COMPILED_FIELDS[endpoint].items():
+            if target in fields:
+                continue
+            value = get_json_path(response['본문'], path)
+            if value in (None, ''):
+                continue
+            value = convert(value)
+            if value is not None:
+                fields[target] = value
+    return fields
+
+def apply_captured_fields(result, fields):
+    """응답에서 찾은 값을 결과에 반영 (정규식으로 찾은 값보다 우선) → 반영한 필드 수"""
+    for (section, field), value in fields.items():
+        result.setdefault(section, {})[field] = value
+    return len(fields)
+
+class ResponseCapture:
+    """페이지 JSON 응답 기록기 (start → 크롤링 → stop)"""
+
+    def __init__(self, page, url_keywords=None):
+        self.page = page
+        # 지정하면 URL 경로가 이 값 중 하나로 끝나는 응답만 기록 (보통 API_PATHS)
+        self.url_keywords = tuple(url_keywords) if url_keywords else None
+        self.responses = []
+        self._tasks = set()
+
+    def start(self):
+        self.page.on('response', self._on_response)
+        return self
+
+    async def stop(self):
+        """리스너 해제 후 읽는 중인 응답까지 기다림 → 응답 목록"""
+        try:
+            self.page.remove_listener('response', self._on_response)
+        except Exception:
+            pass
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        return self.responses
+
+    def _on_response(self, response):
+        if response.request.resource_type not in CAPTURE_RESOURCE_TYPES:
+            return
+        if 'json' not in response.headers.get('content-type', ''):
+            return
+        if self.url_keywords and not urlparse(response.url).path.rstrip('/').endswith(self.url_keywords):
+            return
+        task = asyncio.ensure_future(self._read(response))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _read(self, response):
+        try:
+            body = await response.body()
+            if len(body) > MAX_BODY_BYTES:
+                return
+            self.responses.append({
+                'URL': response.url,
+                '상태': response.status,
+                '본문': json.loads(body),
+            })
+        except Exception:
+            # 페이지 이동 중 사라진 응답 등은 무시
+            pass
+
+    def fields(self):
+        return map_responses(self.responses)
+
+    def save_fixture(self, path):
+        """기록한 응답을 JSONL 픽스처로 저장"""
+        save_responses(self.responses, path)
+
+def save_responses(responses, path):
+    """응답 목록 → JSONL"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for response in responses:
+            f.write(json.dumps(response, ensure_ascii=False) + '\n')
+
+def load_responses(path):
+    """JSONL 픽스처 → 응답 목록"""
+    responses = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                responses.append(json.loads(line))
+    return responses
+
+async def finish_capture(capture, result, article_id, response_folder=None, apply=True):
+    """응답 수집 종료 → 결과에 반영 (+ 픽스처 저장) → 반영한 {(섹션, 필드): 값}
+    - apply=False: 픽스처만 저장하고 결과는 그대로 (--save-responses만 준 경우) → None
+    """
+    responses = await capture.stop()
+    fields = None
+    if apply:
+        fields = map_responses(responses)
+        applied = apply_captured_fields(result, fields)
+        print(f"   ✓ JSON 응답 {len(responses)}개 → {applied}개 필드 반영")
+    if response_folder:
+        os.makedirs(response_folder, exist_ok=True)
+        save_responses(responses, os.path.join(response_folder, f'응답_{article_id}.jsonl'))
+        print(f"   ✓ JSON 응답 {len(responses)}개 저장")
+    return fields
+
+def compare_expected(result, expected):
+    """매핑 결과 ↔ 기대값 → 다른 항목 목록 [(섹션, 필드, 기대값, 결과값)]"""
+    diffs = []
+    for section in sorted(set(expected) | set(result)):
+        want, got = expected.get(section, {}), result.get(section, {})
+        for field in sorted(set(want) | set(got)):
+            if want.get(field) != got.get(field):
+                diffs.append((section, field, want.get(field), got.get(field)))
+    return diffs
+
+def main():
+    """픽스처 매핑 결과 출력 (--expect: 기대값과 비교, 다르면 종료 코드 1)"""
+    parser = argparse.ArgumentParser(description="기록한 응답 픽스처 → 스키마 매핑 확인")
+    parser.add_argument('fixture', help="응답 픽스처 JSONL 파일")
+    parser.add_argument('--expect', help="기대 매핑 JSON ({섹션: {필드: 값}}), 지정하면 비교만")
+    args = parser.parse_args()
+
+    responses = load_responses(args.fixture)
+    fields = map_responses(responses)
+
+    result = {}
+    apply_captured_fields(result, fields)
+    print(f"응답 {len(responses)}개 → 필드 {len(fields)}개 매핑")
+    if not args.expect:
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+
+    with open(args.expect, 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+    diffs = compare_expected(result, expected)
+    if not diffs:
+        print(f"   ✓ 기대값과 같음 ({args.expect})")
+        return
+    for section, field, want, got in diffs:
+        print(f"   ❌ {section}.{field}: 기대 {want!r} → 결과 {got!r}")
+    sys.exit(1)
+
+if __name__ == "__main__":
+    main()
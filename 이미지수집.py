@@ -0,0 +1,281 @@
+"""
+매물 이미지 수집
+- 이미지 후보(src, 크기, 위치)를 한 번의 evaluate로 수집 (요소별 왕복 없음)
+- 후보 규칙: 보이는 이미지, 300x300 이상, Y < 1500, 네이버 이미지 호스트
+- 이미지 단계 소요 시간 로그 출력
+- 최대 N개 동시 다운로드 (풀의 공유 요청 컨텍스트로 연결 재사용)
+- 파일 쓰기는 스레드에서 처리 (이벤트 루프 차단 없음)
+- 매물별/전체 다운로드 속도(bytes/s, 장/s) 집계
+- 이미지 저장소(이미지저장소.py)로 매물 간 중복 이미지는 한 번만 다운로드
+"""
+import asyncio
+import os
+import random
+import re
+import time
+from datetime import datetime
+from 단계계측 import timed
+from 이미지저장소 import get_image_store, print_store_stats
+
+# 이미지 후보 규칙
+MIN_WIDTH = 300
+MIN_HEIGHT = 300
+MAX_Y = 1500
+MAX_IMAGES = 10
+
+# 매물당 동시 다운로드 수
+DOWNLOAD_CONCURRENCY = 4
+
+# 실행 전체 집계
+IMAGE_STATS = {
+    '매물': 0,
+    '이미지': 0,
+    '바이트': 0,
+    '재사용': 0,
+    '다운로드시간': 0.0,
+}
+
+# 보이는 큰 이미지 후보를 한 번에 수집
+FIND_IMAGES_SCRIPT = """
+({minWidth, minHeight, maxY}) => {
+    const seen = new Set();
+    const candidates = [];
+
+    for (const img of document.querySelectorAll('img')) {
+        const rect = img.getBoundingClientRect();
+        const style = window.getComputedStyle(img);
+        if (rect.width === 0 || rect.height === 0 || style.visibility === 'hidden') continue;
+        if (rect.width < minWidth || rect.height < minHeight) continue;
+        if (rect.y > maxY) continue;
+
+        const src = img.getAttribute('src');
+        if (!src || !src.includes('http')) continue;
+        if (seen.has(src)) continue;
+        if (!(src.includes('phinf') || src.includes('land.naver') || src.includes('naver.net'))) continue;
+
+        seen.add(src);
+        candidates.push({src: src, width: rect.width, height: rect.height, y: rect.y});
+    }
+    return candidates;
+}
+"""
+
+# 페이지 소스에서 찾는 이미지 URL 패턴 (후보가 없을 때)
+IMAGE_URL_PATTERNS = [
+    re.compile(r'https://[^"\']+phinf[^"\']+\.(?:jpg|jpeg|png|webp)'),
+    re.compile(r'https://[^"\']+land\.naver[^"\']+\.(?:jpg|jpeg|png|webp)'),
+    re.compile(r'https://[^"\']+naver\.net[^"\']+\.(?:jpg|jpeg|png|webp)'),
+]
+
+async def random_sleep(min_sec=1, max_sec=3):
+    """랜덤 대기"""
+    await asyncio.sleep(random.uniform(min_sec, max_sec))
+
+async def find_image_candidates(page):
+    """페이지 안에서 이미지 후보 목록 수집 (src, width, height, y)"""
+    return await page.evaluate(FIND_IMAGES_SCRIPT, {
+        'minWidth': MIN_WIDTH,
+        'minHeight': MIN_HEIGHT,
+        'maxY': MAX_Y,
+    })
+
+async def find_source_image_urls(page):
+    """페이지 소스에서 이미지 URL 추출"""
+    page_content = await page.content()
+    urls = []
+    for pattern in IMAGE_URL_PATTERNS:
+        for url in pattern.findall(page_content):
+            if url not in urls:
+                urls.append(url)
+    return urls
+
+def image_extension(src):
+    """URL에서 파일 확장자 추정"""
+    lower = src.lower()
+    if '.png' in lower:
+        return 'png'
+    if '.jpeg' in lower or '.jpg' in lower:
+        return 'jpg'
+    if '.webp' in lower:
+        return 'webp'
+    if '.gif' in lower:
+        return 'gif'
+    return 'jpg'
+
+def write_image_file(filename, image_data):
+    """이미지 파일 쓰기 (스레드에서 실행)"""
+    with open(filename, 'wb') as f:
+        f.write(image_data)
+
+def image_record(idx, src, filename, size, img_box, digest=None, reused=False):
+    """이미지 메타데이터 (매물 JSON의 이미지 항목)"""
+    record = {
+        '순서': idx,
+        'URL': src,
+        '파일경로': filename,
+        '파일크기_bytes': size,
+        '이미지크기': f"{int(img_box['width'])}x{int(img_box['height'])}",
+        '수집시간': datetime.now().isoformat()
+    }
+    if digest:
+        record['해시'] = digest
+        record['재사용'] = reused
+    return record
+
+async def download_and_save_image(page, src, image_folder, idx, images_data, img_box, limiter=None,
+                                  request=None, store=None):
+    """
+    이미지 다운로드 및 저장
+    - request: 공유 요청 컨텍스트 (없으면 page.request 사용)
+    - store: 이미지 저장소 (이미 받은 URL은 요청 없이 하드링크)
+    """
+    owner = False
+    try:
+        # URL 정리 (쿼리 파라미터 제거하지 않음)
+        clean_url = src.strip()
+        filename = f'{image_folder}/image_{idx}.{image_extension(src)}'
+
+        if store is not None:
+            owner = await store.wait_inflight(clean_url)
+            if not owner:
+                entry = store.lookup(clean_url)
+                await store.link(entry, filename, reused=True)
+                images_data.append(image_record(idx, src, filename, entry['크기'], img_box, entry['해시'], reused=True))
+                return True
+
+        if limiter is not None:
+            await limiter.acquire(clean_url)
+        client = request if request is not None else page.request
+        response = await client.get(clean_url)
+        if response.ok:
+            image_data = await response.body()
+
+            # 파일 크기 확인 (최소 3KB)
+            if len(image_data) < 3000:
+                return False
+
+            digest = None
+            if store is not None:
+                entry = await store.put(clean_url, image_data, image_extension(src))
+                await store.link(entry, filename)
+                digest = entry['해시']
+            else:
+                await asyncio.to_thread(write_image_file, filename, image_data)
+
+            images_data.append(image_record(idx, src, filename, len(image_data), img_box, digest))
+            return True
+
+    except Exception as e:
+        # 에러 무시하고 계속 진행
+        return False
+    finally:
+        if owner:
+            store.finish_inflight(clean_url)
+
+async def download_images(page, targets, image_folder, images_data, limiter=None, request=None,
+                          concurrency=DOWNLOAD_CONCURRENCY, label="이미지 저장", store=None):
+    """
+    이미지 목록 동시 다운로드
+    - targets: [(순서, src, 크기정보)]
+    - 동시 다운로드 수는 concurrency로 제한 (호스트별 요청 제한은 limiter가 담당)
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(idx, src, img_box):
+        async with semaphore:
+            success = await download_and_save_image(page, src, image_folder, idx, images_data, img_box, limiter, request, store)
+        if success:
+            print(f"     ✓ {idx}번째 {label} ({int(img_box['width'])}x{int(img_box['height'])})")
+
+    await asyncio.gather(*(fetch(idx, src, img_box) for idx, src, img_box in targets))
+
+def record_download_stats(images_data, elapsed):
+    """매물 다운로드 속도 로그 + 전체 집계 (저장소에서 재사용한 이미지는 제외)"""
+    downloaded = [img for img in images_data if not img.get('재사용')]
+    total_bytes = sum(img['파일크기_bytes'] for img in downloaded)
+    IMAGE_STATS['매물'] += 1
+    IMAGE_STATS['이미지'] += len(downloaded)
+    IMAGE_STATS['재사용'] += len(images_data) - len(downloaded)
+    IMAGE_STATS['바이트'] += total_bytes
+    IMAGE_STATS['다운로드시간'] += elapsed
+    if downloaded and elapsed > 0:
+        print(f"     ✓ 다운로드 {total_bytes / 1024:.0f}KB / {elapsed:.2f}초 → "
+              f"{total_bytes / elapsed / 1024:.0f}KB/s, {len(downloaded) / elapsed:.1f}장/s")
+    if len(downloaded) < len(images_data):
+        print(f"     ✓ 저장소 재사용 {len(images_data) - len(downloaded)}장 (요청 없음)")
+
+@timed('save_images')
+async def save_images(page, article_id, image_base_folder='', limiter=None, scan_source=False,
+                      request=None, concurrency=DOWNLOAD_CONCURRENCY, dedupe=True, blocker=None):
+    """
+    매물 이미지 수집 및 파일로 저장
+    - scan_source=True: 후보 이미지가 없으면 페이지 소스에서 URL 추출
+    - request: 공유 요청 컨텍스트 (lease.request)
+    - dedupe=True: 이미지 저장 경로 아래 저장소(_store)로 중복 다운로드 방지
+    - blocker: 요청 차단기 (이 단계에서만 images 프로필 사용)
+    """
+    images_data = []
+    started = time.perf_counter()
+    download_time = 0.0
+
+    # 이미지 저장 폴더 생성
+    image_folder = f'{image_base_folder}/images_{article_id}' if image_base_folder else f'images_{article_id}'
+    os.makedirs(image_folder, exist_ok=True)
+    store = get_image_store(image_base_folder) if dedupe else None
+    previous_profile = blocker.profile if blocker is not None else None
+
+    try:
+        print("     → 페이지 상단으로 스크롤...")
+        await page.evaluate("window.scrollTo(0, 0)")
+        await random_sleep(1, 2)
+
+        if blocker is not None and previous_profile == 'text':
+            blocker.set_profile('images')
+            reloaded = await blocker.load_visible_images(page, MAX_Y)
+            print(f"     → 이미지 허용 프로필 전환 (상단 이미지 {reloaded}개 다시 불러옴)")
+
+        print("     → 메인 이미지 찾는 중...")
+        lookup_started = time.perf_counter()
+        candidates = (await find_image_candidates(page))[:MAX_IMAGES]
+        lookup_time = time.perf_counter() - lookup_started
+        print(f"     ✓ 이미지 후보 {len(candidates)}개 ({lookup_time*1000:.0f}ms)")
+
+        download_started = time.perf_counter()
+        targets = [(idx, candidate['src'], candidate) for idx, candidate in enumerate(candidates, 1)]
+        await download_images(page, targets, image_folder, images_data, limiter, request, concurrency, store=store)
+
+        # 후보가 없으면 페이지 소스에서 이미지 URL 추출
+        if scan_source and not images_data:
+            print("     → 페이지 소스에서 이미지 URL 추출 시도...")
+            # 임시 박스 정보
+            temp_box = {'width': 800, 'height': 600}
+            source_urls = (await find_source_image_urls(page))[:MAX_IMAGES]
+            targets = [(idx, url, temp_box) for idx, url in enumerate(source_urls, 1)]
+            await download_images(page, targets, image_folder, images_data, limiter, request, concurrency,
+                                  label="이미지 URL 추출", store=store)
+        download_time = time.perf_counter() - download_started
+
+        images_data.sort(key=lambda img: img['순서'])
+        record_download_stats(images_data, download_time)
+        print(f"     ✓ 총 {len(images_data)}개 이미지 파일 저장 완료 (이미지 단계 {time.perf_counter() - started:.2f}초)")
+        return images_data
+
+    except Exception as e:
+        print(f"     ℹ 이미지 수집 실패: {e} (이미지 단계 {time.perf_counter() - started:.2f}초)")
+        return images_data
+    finally:
+        if blocker is not None:
+            blocker.set_profile(previous_profile)
+
+def print_image_stats():
+    """이미지 다운로드 전체 통계 출력"""
+    elapsed = IMAGE_STATS['다운로드시간']
+    if not IMAGE_STATS['매물']:
+        return
+    line = (f"이미지: {IMAGE_STATS['매물']}개 매물, 다운로드 {IMAGE_STATS['이미지']}장 "
+            f"(재사용 {IMAGE_STATS['재사용']}장), {IMAGE_STATS['바이트'] / 1024 / 1024:.1f}MB")
+    if elapsed > 0:
+        line += (f" / 다운로드 {elapsed:.1f}초 → {IMAGE_STATS['바이트'] / elapsed / 1024:.0f}KB/s, "
+                 f"{IMAGE_STATS['이미지'] / elapsed:.1f}장/s")
+    print(line)
+    print_store_stats()
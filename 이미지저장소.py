@@ -0,0 +1,170 @@
+"""
+내용 주소 기반 이미지 저장소
+- 이미지 원본은 SHA-256 해시 이름으로 한 번만 저장 (objects/ab/abcdef....jpg)
+- URL → 해시 색인은 index.jsonl에 한 줄씩 추가 (실행 간 유지)
+  - 샤드 프로세스들이 같은 저장소를 함께 쓰므로 추가할 때 파일 잠금(fcntl.flock) → 줄이 섞이지 않음
+- 매물 폴더(images_{매물ID})에는 하드링크 (실패하면 복사)
+- 이미 아는 URL은 네트워크 요청 없이 바로 연결
+"""
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # Windows에는 fcntl 모듈이 없음 (프로세스 안의 스레드 잠금만)
+    fcntl = None
+
+# 저장소 폴더 이름 (이미지 저장 경로 아래)
+STORE_DIR_NAME = '_store'
+INDEX_FILE_NAME = 'index.jsonl'
+
+class ImageStore:
+    """URL/해시 색인을 가진 이미지 저장소"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.objects = self.root / 'objects'
+        self.index_path = self.root / INDEX_FILE_NAME
+        self.objects.mkdir(parents=True, exist_ok=True)
+
+        self.by_url = {}
+        self._inflight = {}
+        self._write_lock = threading.Lock()
+        self.stats = {
+            '신규': 0,
+            '재사용': 0,
+            '중복내용': 0,
+            '절약바이트': 0,
+        }
+        self._load_index()
+
+    def _load_index(self):
+        """index.jsonl 읽기 (깨진 줄은 무시)"""
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if (self.root / entry['파일']).exists():
+                    self.by_url[entry['URL']] = entry
+
+    def lookup(self, url):
+        """이미 저장된 URL이면 색인 항목 반환"""
+        return self.by_url.get(url)
+
+    def object_path(self, entry):
+        """색인 항목 → 원본 파일 경로"""
+        return self.root / entry['파일']
+
+    def _put_sync(self, url, data, ext):
+        """원본 저장 + 색인 추가 (스레드에서 실행)"""
+        digest = hashlib.sha256(data).hexdigest()
+        relative = Path('objects') / digest[:2] / f'{digest}.{ext}'
+        path = self.root / relative
+
+        duplicate = path.exists()
+        if not duplicate:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+
+        entry = {
+            'URL': url,
+            '해시': digest,
+            '파일': relative.as_posix(),
+            '크기': len(data),
+            '저장시간': datetime.now().isoformat(),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._write_lock:
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                # 다른 프로세스의 추가와 섞이지 않도록 한 줄 쓰는 동안 잠금 (닫을 때 풀림)
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                f.write(line)
+                f.flush()
+        return entry, duplicate
+
+    async def put(self, url, data, ext):
+        """다운로드한 이미지 저장 → 색인 항목"""
+        entry, duplicate = await asyncio.to_thread(self._put_sync, url, data, ext)
+        self.by_url[url] = entry
+        self.stats['신규'] += 1
+        if duplicate:
+            # URL은 다르지만 내용이 같은 이미지
+            self.stats['중복내용'] += 1
+            self.stats['절약바이트'] += len(data)
+        return entry
+
+    async def wait_inflight(self, url):
+        """
+        같은 URL을 다른 워커가 받는 중이면 끝날 때까지 대기
+        - 반환값 True: 이번 호출이 다운로드 담당 (끝나면 finish_inflight 호출)
+        """
+        while url in self._inflight:
+            await self._inflight[url].wait()
+            if url in self.by_url:
+                return False
+        if url in self.by_url:
+            return False
+        self._inflight[url] = asyncio.Event()
+        return True
+
+    def finish_inflight(self, url):
+        """다운로드 담당 종료 알림"""
+        event = self._inflight.pop(url, None)
+        if event is not None:
+            event.set()
+
+    def _link_sync(self, entry, destination):
+        """매물 폴더에 하드링크 (실패하면 복사)"""
+        source = self.object_path(entry)
+        destination = Path(destination)
+        if destination.exists():
+            if destination.samefile(source):
+                return
+            destination.unlink()
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copyfile(source, destination)
+
+    async def link(self, entry, destination, reused=False):
+        """원본을 매물 폴더 경로로 연결"""
+        await asyncio.to_thread(self._link_sync, entry, destination)
+        if reused:
+            self.stats['재사용'] += 1
+            self.stats['절약바이트'] += entry['크기']
+
+    def print_stats(self):
+        """저장소 통계 출력"""
+        print(f"이미지 저장소({self.root}): 신규 {self.stats['신규']}개, 재사용 {self.stats['재사용']}개, "
+              f"중복내용 {self.stats['중복내용']}개, 절약 {self.stats['절약바이트'] / 1024 / 1024:.1f}MB")
+
+# 저장 경로별 저장소 (프로세스 안에서 공유)
+_STORES = {}
+
+def get_image_store(image_base_folder=''):
+    """이미지 저장 경로 아래 저장소 (같은 경로면 같은 인스턴스)"""
+    root = Path(image_base_folder or '.') / STORE_DIR_NAME
+    key = str(root.resolve())
+    if key not in _STORES:
+        _STORES[key] = ImageStore(root)
+    return _STORES[key]
+
+def print_store_stats():
+    """사용한 모든 저장소 통계 출력"""
+    for store in _STORES.values():
+        store.print_stats()
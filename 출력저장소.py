@@ -0,0 +1,599 @@
+"""
+수집 결과 저장 (출력 방식: --output json|jsonl|parquet)
+- json: 기존 방식, 기록마다 들여쓴 JSON 파일 하나 (article_{매물ID}_{시각}.json)
+- jsonl: 압축 JSONL 샤드에 이어쓰기 ({접두어}_{시각}_{pid}_{번호}.jsonl.gz|zst, zstandard 있으면 zst)
+  - batch_size개(또는 flush_interval초)마다 묶어서 압축 → 파일 끝에 추가 + fsync
+    (묶음마다 독립된 gzip 멤버/zstd 프레임 → 중간에 죽어도 마지막으로 쓴 묶음까지 그대로 읽힘)
+  - shard_size개마다 새 샤드 (파일 수 = 기록 수 / shard_size)
+- parquet: columns_structure.json 섹션을 '섹션.필드' 열로 펼친 표 (pyarrow 필요)
+  - 열 타입은 필드 표(필드추출.FIELD_TABLE)의 변환 함수로 결정 (정수/실수/참거짓/문자열), 목록은 JSON 문자열
+  - 묶음마다 row group + 같은 기록을 gzip 일지(.parquet.part.jsonl.gz)에 추가 + fsync → 묶음마다 콜백
+  - 샤드를 닫을 때 .part → .parquet, 일지 삭제 (죽어서 남은 일지는 다음 실행에서 .parquet 으로 복구)
+- on_saved(위치) 콜백은 디스크에 쓴 뒤에만 호출 → 수집 상태 완료 표시 (쓰기 전에 죽으면 다시 수집)
+- 읽기: iter_records(폴더) 는 세 방식 파일을 모두 읽음
+- 쓰기 속도 비교: python 출력저장소.py 매물JSON폴더 [--repeat 5] [--shard-size 5000]
+"""
+import argparse
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from 원문보관 import TRUNCATED_ERRORS, default_codec
+from 필드추출 import (FIELD_TABLE, LIST_TABLE, bus_list, bus_number_list, comma_int, manwon_to_won, to_float,
+                   to_int)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+OUTPUT_KINDS = ['json', 'jsonl', 'parquet']
+
+# 샤드당 기록 수, 한 번에 쓰는 기록 수, 묶음이 덜 찼어도 쓰는 간격(초)
+DEFAULT_SHARD_SIZE = 5000
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_FLUSH_INTERVAL = 10.0
+# parquet은 샤드를 닫아야 읽을 수 있으므로 샤드를 작게, 묶음(row group)은 크게 (닫기 전까지는 일지로 읽음)
+PARQUET_SHARD_SIZE = 1000
+PARQUET_BATCH_SIZE = 200
+# 닫지 않은 parquet 샤드의 기록 일지 ({샤드}.parquet.part.jsonl.gz)
+JOURNAL_SUFFIX = '.part.jsonl.gz'
+
+COLUMNS_STRUCTURE_PATH = Path(__file__).with_name('columns_structure.json')
+
+# 필드 표에 없는 열 타입 (크롤러가 직접 넣는 값)
+EXTRA_COLUMNS = {
+    '단지정보.위도': 'float',
+    '단지정보.경도': 'float',
+    # 필드추출.add_price_fields
+    '기본정보.매매가_만원': 'int',
+    '대출정보.대출한도.최대금액_만원': 'int',
+    '대출계산기.대출금액_만원': 'int',
+    '대출계산기.KB시세_만원': 'int',
+    '매물분포.가격범위_최저_만원': 'int',
+    '매물분포.가격범위_최고_만원': 'int',
+}
+
+# 펼친 열에 없는 값은 JSON 문자열 한 열로
+LEFTOVER_COLUMN = '기타'
+
+# ===== 열 구조 (parquet) =====
+
+CONVERTER_TYPES = {
+    to_int: 'int',
+    comma_int: 'int',
+    manwon_to_won: 'int',
+    to_float: 'float',
+    bus_list: 'json',
+    bus_number_list: 'json',
+}
+
+def converter_type(convert):
+    """필드 표 변환 함수 → 열 타입"""
+    if convert in CONVERTER_TYPES:
+        return CONVERTER_TYPES[convert]
+    if convert.__name__ == '<lambda>':
+        # const(값): 인자 없이 부르면 고정값
+        value = convert()
+        if isinstance(value, bool):
+            return 'bool'
+        if isinstance(value, (list, dict)):
+            return 'json'
+    return 'str'
+
+def field_types():
+    """필드 경로 → 열 타입 (필드 표 순서)"""
+    types = {}
+    for _, _, targets, _ in FIELD_TABLE:
+        for path, convert, *_ in targets:
+            types.setdefault(path, converter_type(convert))
+    for _, _, path, _, _ in LIST_TABLE:
+        types.setdefault(path, 'json')
+    types.update(EXTRA_COLUMNS)
+    return types
+
+def load_columns(structure_path=COLUMNS_STRUCTURE_PATH):
+    """columns_structure.json + 필드 표 → [(열 이름, 타입)] (목록은 'json')"""
+    with open(structure_path, 'r', encoding='utf-8') as f:
+        structure = json.load(f)
+    types = field_types()
+    columns = {}
+
+    def walk(node, prefix):
+        for key, value in node.items():
+            path = prefix + key
+            if isinstance(value, dict):
+                walk(value, path + '.')
+            elif isinstance(value, list):
+                columns[path] = 'json'
+            else:
+                columns[path] = types.get(path, 'bool' if path.startswith('시설정보.') else 'str')
+
+    walk({section: structure[section] for section in structure['대형컬럼목록']}, '')
+    for path, kind in types.items():
+        columns.setdefault(path, kind)
+    return list(columns.items())
+
+def coerce(value, kind):
+    """값 → 열 타입 (바꿀 수 없으면 None)"""
+    if value is None or value == '':
+        return None
+    try:
+        if kind == 'int':
+            return int(str(value).replace(',', '')) if not isinstance(value, (int, float)) else int(value)
+        if kind == 'float':
+            return float(value)
+        if kind == 'bool':
+            return bool(value)
+        if kind == 'json':
+            return json.dumps(value, ensure_ascii=False)
+        return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+
+def flatten_record(record, column_types):
+    """매물 JSON → {열: 값} (열에 없는 값은 기타 열에 JSON으로)"""
+    row = {}
+    leftovers = {}
+
+    def walk(node, prefix):
+        for key, value in node.items():
+            path = prefix + key
+            if path in column_types:
+                row[path] = coerce(value, column_types[path])
+            elif isinstance(value, dict) and value:
+                walk(value, path + '.')
+            else:
+                leftovers[path] = value
+
+    walk(record, '')
+    row[LEFTOVER_COLUMN] = json.dumps(leftovers, ensure_ascii=False) if leftovers else None
+    return row
+
+def unflatten_row(row, column_types):
+    """parquet 행 → 매물 JSON (JSON 열은 다시 풀고, 값이 없는 열은 생략)"""
+    record = {}
+    for path, value in row.items():
+        if value is None:
+            continue
+        if path == LEFTOVER_COLUMN:
+            for extra_path, extra_value in json.loads(value).items():
+                set_nested(record, extra_path, extra_value)
+            continue
+        if column_types.get(path) == 'json':
+            value = json.loads(value)
+        set_nested(record, path, value)
+    return record
+
+def set_nested(data, path, value):
+    keys = path.split('.')
+    for key in keys[:-1]:
+        data = data.setdefault(key, {})
+    data[keys[-1]] = value
+
+def arrow_schema(columns):
+    kinds = {'int': pa.int64(), 'float': pa.float64(), 'bool': pa.bool_(), 'str': pa.string(), 'json': pa.string()}
+    return pa.schema([(name, kinds[kind]) for name, kind in columns] + [(LEFTOVER_COLUMN, pa.string())])
+
+# ===== 저장 방식 =====
+
+class RecordSink:
+    """저장 방식 공통 (집계 + with 문)"""
+    kind = None
+
+    def __init__(self, folder, prefix='article'):
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.stats = {'기록': 0, '원본바이트': 0, '파일': 0, '묶음': 0, '쓰기시간': 0.0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, record, name, on_saved=None):
+        """기록 하나 저장 → 위치 문자열 (name: json 방식 파일 이름, 다른 방식은 무시)"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def stored_bytes(self):
+        return 0
+
+    def print_stats(self):
+        if not self.stats['기록']:
+            return
+        elapsed = self.stats['쓰기시간']
+        rate = f", {self.stats['기록'] / elapsed:.0f}개/초" if elapsed > 0 else ''
+        print(f"출력 ({self.kind}): {self.stats['기록']}개 → 파일 {self.stats['파일']}개, "
+              f"{self.stats['원본바이트'] / 1024 / 1024:.1f}MB → {self.stored_bytes() / 1024 / 1024:.1f}MB, "
+              f"쓰기 {elapsed:.2f}초{rate}")
+
+class JsonFileSink(RecordSink):
+    """기록마다 들여쓴 JSON 파일 (기존 방식)"""
+    kind = 'json'
+
+    def __init__(self, folder, prefix='article'):
+        super().__init__(folder, prefix)
+        self._bytes = 0
+
+    def write(self, record, name, on_saved=None):
+        started = time.perf_counter()
+        path = self.folder / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = json.dumps(record, ensure_ascii=False, indent=2)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        size = len(text.encode('utf-8'))
+        self._bytes += size
+        self.stats['기록'] += 1
+        self.stats['파일'] += 1
+        self.stats['원본바이트'] += size
+        self.stats['쓰기시간'] += time.perf_counter() - started
+        if on_saved is not None:
+            on_saved(str(path))
+        return str(path)
+
+    def stored_bytes(self):
+        return self._bytes
+
+class JsonlShardSink(RecordSink):
+    """압축 JSONL 샤드 이어쓰기 (묶음마다 압축 + fsync, shard_size개마다 새 샤드)"""
+    kind = 'jsonl'
+
+    def __init__(self, folder, prefix='article', shard_size=DEFAULT_SHARD_SIZE, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, codec=None, fsync=True):
+        super().__init__(folder, prefix)
+        self.shard_size = shard_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.codec = codec or default_codec()
+        self.fsync = fsync
+        self._stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self._shard_index = 0
+        self._shard_records = 0
+        self._file = None
+        self._path = None
+        self._pending = []
+        self._callbacks = []
+        self._last_flush = time.perf_counter()
+        self._bytes = 0
+        self._compressor = zstandard.ZstdCompressor(level=3) if self.codec == 'zst' else None
+
+    def _open_shard(self):
+        self._shard_index += 1
+        self._shard_records = 0
+        self._path = self.folder / f"{self.prefix}_{self._stamp}_{os.getpid()}_{self._shard_index:04d}.jsonl.{self.codec}"
+        self._file = open(self._path, 'ab')
+        self.stats['파일'] += 1
+
+    def _compress(self, data):
+        if self._compressor is not None:
+            return self._compressor.compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    def write(self, record, name=None, on_saved=None):
+        started = time.perf_counter()
+        if self._file is None:
+            self._open_shard()
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        self._pending.append(line)
+        self._shard_records += 1
+        location = f"{self._path}#{self._shard_records}"
+        if on_saved is not None:
+            self._callbacks.append((on_saved, location))
+        self.stats['기록'] += 1
+        self.stats['원본바이트'] += len(line.encode('utf-8'))
+        self.stats['쓰기시간'] += time.perf_counter() - started
+
+        if len(self._pending) >= self.batch_size or time.perf_counter() - self._last_flush >= self.flush_interval:
+            self.flush()
+        if self._shard_records >= self.shard_size:
+            self._close_shard()
+        return location
+
+    def flush(self):
+        """모아 둔 줄을 한 묶음으로 압축해서 추가 + fsync → 콜백 호출"""
+        if not self._pending:
+            return
+        started = time.perf_counter()
+        data = self._compress(''.join(self._pending).encode('utf-8'))
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._bytes += len(data)
+        self._pending = []
+        self._last_flush = time.perf_counter()
+        self.stats['묶음'] += 1
+        self.stats['쓰기시간'] += self._last_flush - started
+
+        callbacks, self._callbacks = self._callbacks, []
+        for callback, location in callbacks:
+            callback(location)
+
+    def _close_shard(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        self._close_shard()
+
+    def stored_bytes(self):
+        return self._bytes
+
+class ParquetSink(RecordSink):
+    """columns_structure.json 열로 펼친 parquet 샤드 (묶음마다 row group + 일지 fsync → 콜백)"""
+    kind = 'parquet'
+
+    def __init__(self, folder, prefix='article', shard_size=PARQUET_SHARD_SIZE, batch_size=PARQUET_BATCH_SIZE,
+                 fsync=True):
+        if pa is None:
+            raise RuntimeError("parquet 출력에는 pyarrow 패키지가 필요합니다 (pip install pyarrow)")
+        super().__init__(folder, prefix)
+        self.shard_size = shard_size
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self.columns = load_columns()
+        self.column_types = dict(self.columns)
+        self.schema = arrow_schema(self.columns)
+        self._stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self._shard_index = 0
+        self._shard_records = 0
+        self._writer = None
+        self._journal = None
+        self._path = None
+        self._rows = []
+        self._lines = []
+        self._callbacks = []
+        self._bytes = 0
+        recover_parquet_shards(self.folder, prefix)
+
+    def _part_path(self):
+        return self._path.with_name(self._path.name + '.part')
+
+    def _open_shard(self):
+        self._shard_index += 1
+        self._shard_records = 0
+        self._path = self.folder / f"{self.prefix}_{self._stamp}_{os.getpid()}_{self._shard_index:04d}.parquet"
+        self._writer = pq.ParquetWriter(str(self._part_path()), self.schema, compression='zstd')
+        self._journal = open(journal_path(self._path), 'ab')
+        self.stats['파일'] += 1
+
+    def write(self, record, name=None, on_saved=None):
+        started = time.perf_counter()
+        if self._writer is None:
+            self._open_shard()
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        self._rows.append(flatten_record(record, self.column_types))
+        self._lines.append(line)
+        self._shard_records += 1
+        location = f"{self._path}#{self._shard_records}"
+        if on_saved is not None:
+            self._callbacks.append((on_saved, location))
+        self.stats['기록'] += 1
+        self.stats['원본바이트'] += len(line.encode('utf-8'))
+        if len(self._rows) >= self.batch_size:
+            self._write_rows()
+        self.stats['쓰기시간'] += time.perf_counter() - started
+        if self._shard_records >= self.shard_size:
+            self._close_shard()
+        return location
+
+    def _write_rows(self):
+        """모아 둔 행 → row group 하나 + 일지에 추가 + fsync → 콜백"""
+        if not self._rows:
+            return
+        self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self.schema))
+        self._journal.write(gzip.compress(''.join(self._lines).encode('utf-8'), compresslevel=6))
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+        self._rows = []
+        self._lines = []
+        self.stats['묶음'] += 1
+
+        callbacks, self._callbacks = self._callbacks, []
+        for callback, location in callbacks:
+            callback(location)
+
+    def _close_shard(self):
+        """남은 행 쓰기 → 파일 닫기 → .part 이름 바꾸기 → 일지 삭제"""
+        if self._writer is None:
+            return
+        started = time.perf_counter()
+        self._write_rows()
+        self._writer.close()
+        self._writer = None
+        self._journal.close()
+        self._journal = None
+        os.replace(self._part_path(), self._path)
+        journal_path(self._path).unlink()
+        self._bytes += self._path.stat().st_size
+        self.stats['쓰기시간'] += time.perf_counter() - started
+
+    def close(self):
+        self._close_shard()
+
+    def stored_bytes(self):
+        return self._bytes
+
+def journal_path(path):
+    """parquet 샤드 → 쓰는 동안의 gzip JSONL 일지 경로"""
+    return path.with_name(path.name + JOURNAL_SUFFIX)
+
+def parquet_path(journal):
+    """일지 경로 → parquet 샤드 경로"""
+    return journal.with_name(journal.name[:-len(JOURNAL_SUFFIX)])
+
+def writer_alive(path):
+    """샤드 이름의 pid ({접두어}_{시각}_{pid}_{번호}) 가 아직 살아 있는지 (살아 있으면 복구하지 않음)"""
+    try:
+        pid = int(path.stem.split('_')[-2])
+    except (IndexError, ValueError):
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+def recover_parquet_shards(folder, prefix='article'):
+    """죽어서 남은 일지 → 원래 이름의 .parquet (콜백이 알려 준 위치 그대로)
+    - pyarrow 가 없으면 그대로 둠 (일지는 iter_records 로 읽힘)
+    """
+    if pq is None:
+        return
+    columns = load_columns()
+    column_types = dict(columns)
+    for journal in sorted(Path(folder).glob(f'{prefix}_*.parquet{JOURNAL_SUFFIX}')):
+        path = parquet_path(journal)
+        if writer_alive(path):
+            continue
+        if path.exists():
+            # 이름을 바꾼 뒤 일지를 지우기 전에 죽음
+            journal.unlink()
+            continue
+        rows = [flatten_record(record, column_types) for record in read_jsonl_shard(journal)]
+        if rows:
+            pq.write_table(pa.Table.from_pylist(rows, schema=arrow_schema(columns)), str(path), compression='zstd')
+            print(f"     ℹ 끝나지 않은 parquet 샤드 복구 ({len(rows)}개): {path.name}")
+        journal.unlink()
+        path.with_name(path.name + '.part').unlink(missing_ok=True)
+
+def open_sink(kind, folder, prefix='article', shard_size=None, **options):
+    """출력 방식 이름 → 저장 객체"""
+    if kind == 'json':
+        return JsonFileSink(folder, prefix)
+    if kind == 'jsonl':
+        return JsonlShardSink(folder, prefix, shard_size=shard_size or DEFAULT_SHARD_SIZE, **options)
+    if kind == 'parquet':
+        return ParquetSink(folder, prefix, shard_size=shard_size or PARQUET_SHARD_SIZE, **options)
+    raise ValueError(f"알 수 없는 출력 방식: {kind} ({', '.join(OUTPUT_KINDS)})")
+
+# ===== 읽기 =====
+
+def output_files(folder, prefix='article'):
+    """폴더 안 출력 파일 (json, jsonl 샤드, 닫힌 parquet 샤드, 아직 닫지 않은 parquet 샤드의 일지)"""
+    folder = Path(folder)
+    patterns = [f'{prefix}_*.json', f'{prefix}_*.jsonl.gz', f'{prefix}_*.jsonl.zst', f'{prefix}_*.parquet']
+    files = []
+    for path in (path for pattern in patterns for path in folder.glob(pattern)):
+        if path.name.endswith(JOURNAL_SUFFIX):
+            # 닫는 중이라 .parquet 과 일지가 같이 있으면 .parquet 만
+            if parquet_path(path).exists():
+                continue
+        files.append(path)
+    return sorted(files)
+
+def read_jsonl_shard(path):
+    """JSONL 샤드 → 기록 (끝이 잘린 샤드는 읽은 데까지)"""
+    path = Path(path)
+    if path.suffix == '.zst':
+        if zstandard is None:
+            raise RuntimeError(f"zstandard 패키지가 필요합니다: {path}")
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True)
+        f = io.TextIOWrapper(raw, encoding='utf-8')
+    else:
+        f = gzip.open(path, 'rt', encoding='utf-8')
+    with f:
+        try:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # 묶음 중간에서 잘린 마지막 줄
+                        break
+        except TRUNCATED_ERRORS:
+            print(f"     ℹ 끝이 잘린 샤드 (읽은 데까지 사용): {path}")
+
+def read_parquet_shard(path):
+    """parquet 샤드 → 기록 (매물 JSON 모양으로 되돌림)"""
+    if pq is None:
+        raise RuntimeError(f"pyarrow 패키지가 필요합니다: {path}")
+    column_types = dict(load_columns())
+    table = pq.read_table(str(path))
+    for row in table.to_pylist():
+        yield unflatten_row(row, column_types)
+
+def iter_records(folder, prefix='article'):
+    """출력 폴더의 모든 기록 (저장 방식 상관없이)"""
+    for path in output_files(folder, prefix):
+        name = path.name
+        if name.endswith('.json'):
+            with open(path, 'r', encoding='utf-8') as f:
+                yield json.load(f)
+        elif name.endswith('.parquet'):
+            yield from read_parquet_shard(path)
+        else:
+            yield from read_jsonl_shard(path)
+
+# ===== 쓰기 속도 비교 =====
+
+def measure_sink(kind, records, repeat, shard_size=None):
+    """임시 폴더에 records × repeat 저장 → {'기록', '파일', '저장MB', '초', '개_초'}"""
+    folder = tempfile.mkdtemp(prefix=f'출력_{kind}_')
+    try:
+        started = time.perf_counter()
+        with open_sink(kind, folder, shard_size=shard_size) as sink:
+            for round_index in range(repeat):
+                for idx, record in enumerate(records):
+                    meta = record.get('메타정보', {})
+                    sink.write(record, f"article_{meta.get('매물ID', idx)}_{round_index}_{idx}.json", on_saved=None)
+        elapsed = time.perf_counter() - started
+        files = [p for p in Path(folder).iterdir() if p.is_file()]
+        return {
+            '기록': sink.stats['기록'],
+            '파일': len(files),
+            '저장MB': round(sum(p.stat().st_size for p in files) / 1024 / 1024, 2),
+            '초': round(elapsed, 3),
+            '개_초': round(sink.stats['기록'] / elapsed) if elapsed > 0 else 0,
+        }
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="출력 방식별 쓰기 속도 비교 (매물 JSON 폴더 사용)")
+    parser.add_argument('folder', help="매물 JSON 폴더 (article_*.json 또는 샤드)")
+    parser.add_argument('--repeat', type=int, default=5, help="기록 반복 횟수 (기본 5)")
+    parser.add_argument('--shard-size', type=int, default=None, help="샤드당 기록 수")
+    parser.add_argument('--kinds', nargs='+', default=OUTPUT_KINDS, choices=OUTPUT_KINDS, help="비교할 출력 방식")
+    args = parser.parse_args()
+
+    records = list(iter_records(args.folder))
+    if not records:
+        print(f"❌ 매물 기록이 없습니다: {args.folder}")
+        return
+
+    print(f"\n출력 방식 비교: 기록 {len(records)}개 × {args.repeat}회")
+    for kind in args.kinds:
+        if kind == 'parquet' and pa is None:
+            print(f"   - {kind}: pyarrow 없음 (건너뜀)")
+            continue
+        result = measure_sink(kind, records, args.repeat, args.shard_size)
+        print(f"   - {kind:8s}: {result['기록']}개 → 파일 {result['파일']}개, {result['저장MB']}MB, "
+              f"{result['초']}초 ({result['개_초']}개/초)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+파싱 프로세스 풀
+- 원문 → 매물 JSON 파싱(필드추출.parse_article)을 ProcessPoolExecutor에서 실행
+  → 이벤트 루프는 브라우저 I/O만 처리하고, 다른 매물의 페이지 작업과 파싱이 겹쳐서 진행
+- workers=0: 프로세스 없이 이벤트 루프에서 바로 파싱 (비교/디버깅용)
+- 이벤트 루프 지연 측정: 주기적으로 sleep(interval) 후 실제로 깨어난 시각과의 차이 기록
+- 매물별 파싱 시간/루프 지연 출력 + 전체 통계
+"""
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from 필드추출 import parse_article
+
+# 루프 지연 측정 간격(초)과 보관할 측정값 수
+LAG_INTERVAL = 0.05
+LAG_SAMPLES = 20000
+
+def timed_parse(snapshot):
+    """파싱 + 소요 시간 (작업 프로세스에서 실행)"""
+    started = time.perf_counter()
+    result = parse_article(snapshot)
+    return result, time.perf_counter() - started
+
+class LoopLagMonitor:
+    """이벤트 루프 지연 측정기 (start → ... → stop)"""
+
+    def __init__(self, interval=LAG_INTERVAL):
+        self.interval = interval
+        # (측정 시각, 지연 초)
+        self.samples = deque(maxlen=LAG_SAMPLES)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+        return self
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - started - self.interval)
+            self.samples.append((now, lag))
+            self.total += lag
+            self.count += 1
+            self.max = max(self.max, lag)
+
+    def max_since(self, since):
+        """since(perf_counter) 이후 최대 지연(초)"""
+        worst = 0.0
+        for at, lag in reversed(self.samples):
+            if at < since:
+                break
+            worst = max(worst, lag)
+        return worst
+
+    def print_stats(self):
+        if not self.count:
+            return
+        print(f"이벤트 루프 지연: 평균 {self.total / self.count * 1000:.1f}ms, 최대 {self.max * 1000:.1f}ms "
+              f"({self.count}회 측정)")
+
+class ParsePool:
+    """파싱 프로세스 풀 (async with 로 사용)"""
+
+    def __init__(self, workers=1, lag_monitor=True):
+        self.workers = workers
+        self.executor = None
+        self.monitor = LoopLagMonitor() if lag_monitor else None
+        self.stats = {'매물': 0, '파싱시간': 0.0, '대기시간': 0.0, '최대파싱': 0.0}
+
+    async def __aenter__(self):
+        if self.workers > 0:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        if self.monitor is not None:
+            self.monitor.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self.monitor is not None:
+            await self.monitor.stop()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    async def parse(self, snapshot, article_started=None):
+        """
+        원문 → 매물 JSON
+        - article_started: 매물 크롤링 시작 시각(perf_counter), 있으면 그 이후 루프 지연도 출력
+        """
+        submitted = time.perf_counter()
+        if self.executor is not None:
+            loop = asyncio.get_running_loop()
+            result, parse_time = await loop.run_in_executor(self.executor, timed_parse, snapshot)
+        else:
+            result, parse_time = timed_parse(snapshot)
+        waited = time.perf_counter() - submitted
+
+        self.stats['매물'] += 1
+        self.stats['파싱시간'] += parse_time
+        self.stats['대기시간'] += waited
+        self.stats['최대파싱'] = max(self.stats['최대파싱'], parse_time)
+
+        where = f"프로세스 {self.workers}개" if self.executor is not None else "이벤트 루프"
+        line = f"   ✓ 파싱 {parse_time * 1000:.1f}ms ({where}, 대기 포함 {waited * 1000:.1f}ms)"
+        if self.monitor is not None and article_started is not None:
+            line += f", 루프 지연 최대 {self.monitor.max_since(article_started) * 1000:.1f}ms"
+        print(line)
+        return result
+
+    def print_stats(self):
+        """전체 파싱/루프 지연 통계 출력"""
+        count = self.stats['매물']
+        if count:
+            print(f"파싱: {count}개 매물, 평균 {self.stats['파싱시간'] / count * 1000:.1f}ms "
+                  f"(최대 {self.stats['최대파싱'] * 1000:.1f}ms, 대기 포함 평균 {self.stats['대기시간'] / count * 1000:.1f}ms)")
+        if self.monitor is not None:
+            self.monitor.print_stats()
+
+async def parse_snapshot(snapshot, parse_pool=None, article_started=None):
+    """파싱 풀이 있으면 풀에서, 없으면 바로 파싱"""
+    if parse_pool is None:
+        return parse_article(snapshot)
+    return await parse_pool.parse(snapshot, article_started)
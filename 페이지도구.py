@@ -0,0 +1,257 @@
+"""
+페이지 공용 도구
+- 버튼/링크 탐색을 페이지 안에서 한 번의 evaluate로 처리
+  (요소마다 inner_text/is_visible/bounding_box를 따로 기다리지 않음)
+- 선택한 요소는 data 속성으로 표시한 뒤 locator로 클릭
+- 호출별 왕복(IPC) 횟수와 탐색 시간 집계
+- 준비 조건 대기: 고정 대기 대신 섹션 텍스트/팝업/화면 변화가 보이면 바로 진행
+  (단계별 대기 시간 집계, 지터는 사람처럼 보여야 하는 곳에만 유지)
+"""
+import asyncio
+import random
+import time
+from 단계계측 import timed
+
+# 본문 텍스트 서명 (클릭 전후 화면 변화 비교용)
+TEXT_SIGNATURE_JS = """
+const textSignature = () => {
+    const text = document.body ? document.body.innerText : '';
+    let hash = 0;
+    for (let i = 0; i < text.length; i++) {
+        hash = (hash * 31 + text.charCodeAt(i)) | 0;
+    }
+    return text.length + ':' + hash;
+};
+"""
+
+# 클릭 후보 탐색 + 표시 + 스크롤 (한 번의 왕복)
+FIND_AND_MARK_SCRIPT = """
+({selector, keywords, exact, parentKeywords, token, scrollOffset}) => {
+""" + TEXT_SIGNATURE_JS + """
+    document.querySelectorAll('[data-ld-click]').forEach(el => el.removeAttribute('data-ld-click'));
+
+    const elements = document.querySelectorAll(selector);
+    let chosen = null;
+    let matched = 0;
+
+    for (const el of elements) {
+        const text = el.innerText || '';
+        const hit = exact
+            ? keywords.some(k => text.trim() === k)
+            : keywords.some(k => text.includes(k));
+        if (!hit) continue;
+        matched++;
+
+        if (parentKeywords && parentKeywords.length) {
+            const parentText = el.parentElement ? (el.parentElement.innerText || '') : '';
+            if (!parentKeywords.some(k => parentText.includes(k))) continue;
+        }
+
+        const rect = el.getBoundingClientRect();
+        const style = window.getComputedStyle(el);
+        if (rect.width === 0 || rect.height === 0 || style.visibility === 'hidden') continue;
+
+        chosen = el;
+        break;
+    }
+
+    if (!chosen) {
+        return {found: false, scanned: elements.length, matched: matched};
+    }
+
+    chosen.setAttribute('data-ld-click', token);
+    window.scrollBy(0, chosen.getBoundingClientRect().top - scrollOffset);
+    const box = chosen.getBoundingClientRect();
+
+    return {
+        found: true,
+        scanned: elements.length,
+        matched: matched,
+        signature: textSignature(),
+        text: (chosen.innerText || '').trim().slice(0, 40),
+        box: {x: box.x, y: box.y, width: box.width, height: box.height}
+    };
+}
+"""
+
+# 본문에 서명이 바뀔 때까지 대기
+TEXT_CHANGED_SCRIPT = """
+(before) => {
+""" + TEXT_SIGNATURE_JS + """
+    return textSignature() !== before;
+}
+"""
+
+# 본문에 키워드 중 하나가 보일 때까지 대기
+TEXT_READY_SCRIPT = """
+({keywords, minLength}) => {
+    const text = document.body ? document.body.innerText : '';
+    if (text.length < minLength) return false;
+    return !keywords.length || keywords.some(k => text.includes(k));
+}
+"""
+
+# 단계별 준비 조건 (본문에 하나라도 있으면 준비 완료)
+SECTION_MARKERS = {
+    '본문': [],
+    '기본정보': ['공급면적', '전용면적', '방수/욕실수', '해당층'],
+    '단지정보': ['세대수', '사용승인일', '건축물용도', '총동수'],
+    '실거래가': ['실거래가'],
+    '관리비 팝업': ['관리비 합계', '포함 항목', '관리비 기준'],
+}
+
+# 준비 조건 폴링 간격 (ms)
+POLL_INTERVAL = 100
+
+# 실행 전체 집계
+CLICK_STATS = {
+    '호출': 0,
+    '왕복': 0,
+    '기존방식왕복': 0,
+    '탐색시간': 0.0,
+}
+
+# 단계별 준비 대기 집계
+WAIT_STATS = {}
+
+async def random_sleep(min_sec=1, max_sec=3):
+    """랜덤 대기"""
+    await asyncio.sleep(random.uniform(min_sec, max_sec))
+
+def legacy_round_trips(scanned, clicked):
+    """요소별 조회 방식이었다면 필요한 왕복 횟수 (비교용 추정치)"""
+    # query_selector_all 1회 + 요소마다 inner_text 1회
+    # + 클릭 대상의 is_visible/bounding_box/스크롤/마우스이동/클릭 5회
+    return 1 + scanned + (5 if clicked else 0)
+
+@timed('click_button_with_text')
+async def click_button_with_text(page, text_keywords, description="버튼", selector='button, a',
+                                 exact=False, parent_keywords=None, scroll_offset=200, change_timeout=2000):
+    """
+    텍스트로 버튼 찾아서 클릭
+    - exact=True: 텍스트가 키워드와 정확히 일치 (탭 클릭 등)
+    - parent_keywords: 부모 요소 텍스트에 키워드가 있어야 함 (관리비 상세보기 등)
+    - 클릭 후 화면 텍스트가 바뀔 때까지 대기 (최대 change_timeout ms, 0이면 대기 안 함)
+    """
+    round_trips = 0
+    started = time.perf_counter()
+    lookup_time = 0.0
+    found = None
+
+    try:
+        token = f"{time.time_ns()}-{random.randint(0, 1 << 30)}"
+        found = await page.evaluate(FIND_AND_MARK_SCRIPT, {
+            'selector': selector,
+            'keywords': list(text_keywords),
+            'exact': exact,
+            'parentKeywords': list(parent_keywords or []),
+            'token': token,
+            'scrollOffset': scroll_offset,
+        })
+        round_trips += 1
+        lookup_time = time.perf_counter() - started
+
+        if not found['found']:
+            print(f"     ℹ {description} 없음 (후보 {found['scanned']}개, 왕복 {round_trips}회, 탐색 {lookup_time*1000:.0f}ms)")
+            return False
+
+        box = found['box']
+        await random_sleep(0.3, 0.6)
+        await page.mouse.move(
+            box['x'] + box['width'] / 2,
+            box['y'] + box['height'] / 2
+        )
+        round_trips += 1
+        await random_sleep(0.2, 0.4)
+
+        await page.locator(f'[data-ld-click="{token}"]').first.click()
+        round_trips += 1
+        if change_timeout:
+            await wait_for_change(page, found['signature'], description, timeout=change_timeout)
+            round_trips += 1
+
+        print(f"     ✓ {description} 클릭 완료 (후보 {found['scanned']}개, 왕복 {round_trips}회, "
+              f"탐색 {lookup_time*1000:.0f}ms, 기존 방식 약 {legacy_round_trips(found['scanned'], True)}회)")
+        return True
+    except Exception as e:
+        print(f"     ℹ {description} 처리 실패: {e}")
+        return False
+    finally:
+        CLICK_STATS['호출'] += 1
+        CLICK_STATS['왕복'] += round_trips
+        CLICK_STATS['탐색시간'] += lookup_time
+        if found:
+            CLICK_STATS['기존방식왕복'] += legacy_round_trips(found['scanned'], found['found'])
+
+def record_wait(stage, elapsed, ready):
+    """단계별 대기 시간 집계 + 로그"""
+    stats = WAIT_STATS.setdefault(stage, {'횟수': 0, '시간': 0.0, '시간초과': 0})
+    stats['횟수'] += 1
+    stats['시간'] += elapsed
+    if ready:
+        print(f"     ✓ {stage} 준비 ({elapsed*1000:.0f}ms)")
+    else:
+        stats['시간초과'] += 1
+        print(f"     ℹ {stage} 대기 시간 초과 ({elapsed*1000:.0f}ms)")
+
+async def wait_until(page, script, arg, stage, timeout):
+    """준비 조건(JS 함수)이 참이 될 때까지 대기 → 준비 여부"""
+    started = time.perf_counter()
+    try:
+        await page.wait_for_function(script, arg=arg, timeout=timeout, polling=POLL_INTERVAL)
+        ready = True
+    except Exception:
+        ready = False
+    record_wait(stage, time.perf_counter() - started, ready)
+    return ready
+
+async def wait_for_text(page, keywords, stage, timeout=10000, min_length=0):
+    """본문에 키워드 중 하나가 보일 때까지 대기"""
+    return await wait_until(page, TEXT_READY_SCRIPT, {'keywords': list(keywords), 'minLength': min_length},
+                            stage, timeout)
+
+async def wait_for_section(page, section, timeout=10000):
+    """섹션 텍스트(SECTION_MARKERS)가 보일 때까지 대기"""
+    return await wait_for_text(page, SECTION_MARKERS[section], section, timeout, min_length=1)
+
+async def text_signature(page):
+    """현재 본문 텍스트 서명"""
+    return await page.evaluate("() => {" + TEXT_SIGNATURE_JS + " return textSignature(); }")
+
+async def wait_for_change(page, signature, stage, timeout=2000):
+    """본문 텍스트가 signature에서 바뀔 때까지 대기 (팝업 열림/닫힘, 탭 전환, 더보기)"""
+    return await wait_until(page, TEXT_CHANGED_SCRIPT, signature, stage, timeout)
+
+async def wait_for_element(page, selector, stage, timeout=10000):
+    """선택자에 맞는 요소가 붙을 때까지 대기"""
+    started = time.perf_counter()
+    try:
+        await page.wait_for_selector(selector, state='attached', timeout=timeout)
+        ready = True
+    except Exception:
+        ready = False
+    record_wait(stage, time.perf_counter() - started, ready)
+    return ready
+
+async def wait_for_height_change(page, last_height, stage, timeout=1500):
+    """스크롤 후 문서 높이가 늘어날 때까지 대기 → 새 높이 (늘지 않으면 그대로)"""
+    await wait_until(page, "(last) => document.body.scrollHeight !== last", last_height, stage, timeout)
+    return await page.evaluate("() => document.body.scrollHeight")
+
+def print_wait_stats():
+    """단계별 대기 시간 통계 출력"""
+    if not WAIT_STATS:
+        return
+    print("준비 대기:")
+    for stage, stats in sorted(WAIT_STATS.items(), key=lambda x: -x[1]['시간']):
+        print(f"   - {stage}: {stats['횟수']}회, 합계 {stats['시간']:.1f}초, "
+              f"평균 {stats['시간'] / stats['횟수'] * 1000:.0f}ms, 시간초과 {stats['시간초과']}회")
+
+def print_click_stats():
+    """버튼 클릭 왕복 통계 출력"""
+    calls = CLICK_STATS['호출']
+    if not calls:
+        return
+    print(f"버튼 탐색: {calls}회 호출, 왕복 {CLICK_STATS['왕복']}회 "
+          f"(기존 방식 약 {CLICK_STATS['기존방식왕복']}회), "
+          f"평균 탐색 {CLICK_STATS['탐색시간'] / calls * 1000:.0f}ms")
@@ -0,0 +1,14 @@
+"""
+터미널 표 출력 도구
+- display_width: 표시 폭 (한글 등 전각 문자는 2칸)
+- pad: 표시 폭 기준 왼쪽/오른쪽 정렬
+"""
+import unicodedata
+
+def display_width(text):
+    """터미널 표시 폭 (한글 등 전각 문자는 2칸)"""
+    return sum(2 if unicodedata.east_asian_width(c) in ('W', 'F') else 1 for c in text)
+
+def pad(text, width, right=False):
+    space = ' ' * max(0, width - display_width(text))
+    return space + text if right else text + space
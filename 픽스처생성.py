@@ -0,0 +1,442 @@
+"""
+벤치마크용 픽스처 사이트 생성 (고정 시드 → 항상 같은 코퍼스)
+- regions.html: 법정동 단지 목록 (/complexes/{단지ID}?tab=transaction 링크)
+- complexes/{단지ID}.html, complexes/{단지ID}.article.html: 단지 거래 탭 / 매물 탭 (매물목록 펼치기)
+- articles/{매물ID}.html: 매물 상세 (필드추출 패턴에 맞는 본문, 소개말 더보기, 관리비 상세보기 팝업,
+  시설 더보기, 실거래가 더보기 → 상세보기 모달(매매/전세/월세 탭, 표 더보기), 상단 이미지)
+- near/{매물ID}.html: 모바일 near 페이지 (소스에 좌표)
+- phinf/{매물ID}/{N}.png: 매물 이미지 (잡음 PNG, 압축해도 실제 사진과 비슷한 크기)
+- 실행: python 픽스처생성.py 폴더 [--complexes 4] [--articles 5] [--seed 0]
+"""
+import argparse
+import json
+import random
+import struct
+import zlib
+from pathlib import Path
+
+# 단지 이름 재료 / 중개사 / 건설사
+COMPLEX_NAMES = ['한강푸르지오', '공항래미안', '마곡힐스테이트', '등촌자이', '화곡센트레빌', '방화롯데캐슬',
+                 '염창아이파크', '가양한신', '발산더샵', '우장산쌍용']
+AGENTS = ['김민수', '이서연', '박지훈', '최유진', '정하늘']
+BUILDERS = ['삼성물산', '현대건설', 'GS건설', '대우건설', '롯데건설']
+BANKS = ['KB국민은행', '신한은행', '우리은행', '하나은행', '농협은행']
+STATIONS = [('마곡나루역', '서부광역철도'), ('공항시장역', '대장홍대선'), ('화곡역', '강서하남선')]
+
+# 매물 이미지 크기 (표시 크기는 HTML에서 320x320)
+IMAGE_SIZE = (256, 192)
+
+# 실거래가 모달 한 번에 보이는 행 수 (나머지는 더보기)
+TRADE_PAGE_SIZE = 10
+
+def format_price(manwon):
+    """만원 정수 → '10억 5,000' 형식"""
+    eok, man = divmod(int(manwon), 10000)
+    if eok and man:
+        return f"{eok}억 {man:,}"
+    if eok:
+        return f"{eok}억"
+    return f"{man:,}"
+
+def png_bytes(rng, width, height):
+    """잡음 RGB PNG (필터 없음)"""
+    raw = b''.join(b'\x00' + rng.randbytes(width * 3) for _ in range(height))
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(raw, 6)) + chunk(b'IEND', b'')
+
+def complex_info(seed, index):
+    """단지 하나의 고정 값 (이름, 좌표, 세대수 등)"""
+    rng = random.Random(f'{seed}-단지-{index}')
+    households = rng.randrange(300, 2500)
+    return {
+        '단지ID': str(100000 + index),
+        '단지명': COMPLEX_NAMES[index % len(COMPLEX_NAMES)] + ('' if index < len(COMPLEX_NAMES) else str(index)),
+        '위도': round(37.540 + index * 0.0031, 6),
+        '경도': round(126.800 + index * 0.0042, 6),
+        '번지': f"{rng.randrange(1, 300)}-{rng.randrange(1, 30)}",
+        '사용승인': (rng.randrange(1995, 2022), rng.randrange(1, 13), rng.randrange(1, 29)),
+        '세대수': households,
+        '주차': int(households * rng.uniform(0.9, 1.6)),
+        '용적률': rng.randrange(180, 300),
+        '건폐율': rng.randrange(12, 30),
+        '건설사': rng.choice(BUILDERS),
+        '기준가': rng.randrange(60000, 160000, 500),
+    }
+
+def trade_rows(rng, tab, base_price, count):
+    """실거래가 모달 행 (연도 행 + [계약일, 층, 가격]), 최근 순"""
+    rows = []
+    year, month, day = 2025, 10, 28
+    current_year = None
+    for _ in range(count):
+        day -= rng.randrange(3, 25)
+        while day < 1:
+            month -= 1
+            day += 28
+        if month < 1:
+            year, month = year - 1, 12
+        if year != current_year:
+            rows.append([f"{year}년"])
+            current_year = year
+        floor = rng.randrange(1, 26)
+        if tab == '매매':
+            price = format_price(round(base_price * rng.uniform(0.9, 1.08), -2))
+        elif tab == '전세':
+            price = format_price(round(base_price * rng.uniform(0.5, 0.65), -2))
+        else:
+            price = f"{format_price(round(base_price * rng.uniform(0.1, 0.2), -3))}/{rng.randrange(80, 250)}"
+        rows.append([f"{month:02d}.{day:02d}", f"{floor}층", price])
+    return rows
+
+ARTICLE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{name}아파트 매물</title>
+<style>
+body {{ font-family: sans-serif; margin: 0 auto; max-width: 1100px; padding: 20px; }}
+section {{ margin: 24px 0; }}
+.photos img {{ width: 320px; height: 320px; margin-right: 8px; }}
+.modal {{ display: none; position: fixed; left: 10%; right: 10%; bottom: 0; height: 45vh; overflow-y: auto;
+          background: #fff; border: 1px solid #888; padding: 12px; }}
+.hidden {{ display: none; }}
+</style></head>
+<body>
+<h1>{name}아파트 {dong}동</h1>
+<p>아파트 {supply}㎡ (전용 {exclusive}) {floor}/{total_floors}층 {facing}</p>
+<p>집주인확인매물 {confirmed}</p>
+<p>{summary}</p>
+<div class="photos">{images}</div>
+
+<section><h2>대출 한도</h2><p>{region}, LTV {ltv}%</p><p>최대 {loan_limit}만원</p></section>
+<section><h2>금리 정보</h2>{rates}</section>
+<section><h2>가격분포</h2><p>가격분포 매매 {range_low} ~ {range_high}</p><p>매물수 {listing_count}개</p></section>
+<section><h2>대출 계산기</h2>
+<p>대출 금액 최대 {loan_limit}만원</p><p>KB시세 {kb_price}만원</p><p>대출 기간 최대 40년</p>
+<p>원리금균등 원금균등</p><p>최저 금리 {best_bank} {best_rate}%</p><p>예상 월 원리금 {monthly_payment}원</p>
+</section>
+
+<section id="trade">
+<h2>실거래가</h2>
+<p>최근 실거래 {latest_price} ({latest_date}, {latest_floor})</p>
+<ul id="trade-summary" class="hidden">{trade_summary}</ul>
+<button id="trade-more">실거래가 더보기</button>
+<button id="trade-detail" class="hidden">실거래가 상세보기</button>
+</section>
+
+<section><h2>시설 정보</h2><p>{facilities}</p><p id="facility-more" class="hidden">옵션 {extra_facility}</p>
+<button id="facility-button">시설 더보기</button></section>
+
+<section><h2>기본 정보</h2>
+<p>매매가 {price}만원</p>
+<p>관리비 {fee_manwon}만원 <button id="fee-button">상세보기</button></p>
+<p>관리비부과기준 정액관리비</p>
+<p>공급면적 {supply}㎡</p>
+<p>전용면적 {exclusive}㎡ (전용률 {exclusive_ratio}%)</p>
+<p>층 {floor}층/ 총 {total_floors}층</p>
+<p>방수/욕실수 {rooms}/{baths}개</p>
+<p>향 (거실 기준) {facing}</p>
+<p>복층여부 단층</p>
+<p>입주가능일 즉시입주</p>
+<p>매물번호 {article_id}</p>
+</section>
+
+<section><h2>매물소개</h2>
+<p id="intro">{intro_short}</p>
+<button id="intro-button">소개말 더보기</button>
+<p>{posted} 최초게재<span>부동산뱅크</span> 제공</p>
+</section>
+
+<section><h2>단지 정보</h2>
+<p>위치 서울시 강서구 공항동 {lot}</p>
+<p>건축물용도 공동주택(아파트)</p>
+<p>사용승인일 {approved} ({age}년차)</p>
+<p>세대수 {households} 세대 (해당 면적 {area_households} 세대)</p>
+<p>현관구조 계단식</p>
+<p>난방 개별난방, 도시가스</p>
+<p>주차 {parking} 대 (세대당 {parking_ratio}대)</p>
+<p>용적률/건폐율 {far}% / {bcr}%</p>
+<p>관리사무소 전화 02-{office_phone}</p>
+<p>건설사 {builder}</p>
+</section>
+
+<section><h2>개발 예정</h2>
+<p>{station}({open_year}년예정) 노선 {line}</p>
+<p>개통 {open_year}년 예정 거리 {station_distance}m도보 {station_walk}분</p>
+</section>
+
+<section><h2>주변 대중교통</h2><p>버스 마을 강서05, 강서06</p><p>지선 6630, 6632</p><p>간선 601, 605</p></section>
+
+<section><h2>중개소</h2>
+<p>중개사 {agent}</p><p>{agency}공인중개사사무소</p>
+<p>전화 02-{agency_phone}</p>
+<p>위치 서울시 강서구 공항동 {agency_lot} 상가동 1층 101호</p>
+<p>등록번호 11500-2019-{registration}</p>
+<p>최근 3개월 집주인확인 {confirmed_count}건</p>
+</section>
+
+<section><h2>중개 보수</h2><p>최대 {brokerage}만원</p><p>상한 요율 0.5%</p></section>
+<section><h2>세금</h2><p>취득세 합계 약 {acquisition_tax}만원</p><p>재산세 합계 약 {property_tax}만원</p>
+<p>종합부동산세 과세대상 아님</p></section>
+
+<div id="fee-modal" class="modal" role="dialog">
+<h3>관리비 상세</h3>
+<p>관리비 합계 {fee_total}원</p>
+<p>2025년 9월 {fee_total}원</p>
+<p>월 평균 {fee_average}원</p>
+<p>여름(6~8월) 평균 {fee_summer}원</p>
+<p>겨울(12~2월) 평균 {fee_winter}원</p>
+<p>포함 항목(사용료) : 일반관리비, 청소비, 경비비, 승강기유지비</p>
+<p>관리비 기준 : 최근 12개월 평균</p>
+<button id="fee-close">닫기</button>
+</div>
+
+<div id="trade-modal" class="modal" role="dialog">
+<h3>실거래가</h3>
+<div role="tablist"><button role="tab">매매</button> <button role="tab">전세</button> <button role="tab">월세</button></div>
+<table><thead><tr><th>계약일</th><th>층</th><th>가격</th></tr></thead><tbody id="trade-rows"></tbody></table>
+<button id="trade-page">더보기</button>
+</div>
+
+<script>
+const TRADES = {trades_json};
+const INTRO = {intro_json};
+const PAGE_SIZE = {page_size};
+let tradeTab = '매매';
+let tradeShown = 0;
+
+const show = (id) => document.getElementById(id).classList.remove('hidden');
+const byId = (id) => document.getElementById(id);
+
+document.querySelectorAll('.photos img').forEach(img => {{ img.src = location.origin + img.dataset.src; }});
+
+byId('intro-button').onclick = () => {{ byId('intro').innerText = INTRO; byId('intro-button').remove(); }};
+byId('facility-button').onclick = () => {{ show('facility-more'); byId('facility-button').remove(); }};
+byId('fee-button').onclick = () => {{ byId('fee-modal').style.display = 'block'; }};
+byId('fee-close').onclick = () => {{ byId('fee-modal').style.display = 'none'; }};
+byId('trade-more').onclick = () => {{ show('trade-summary'); show('trade-detail'); byId('trade-more').remove(); }};
+
+const renderTrades = () => {{
+    const rows = TRADES[tradeTab].slice(0, tradeShown);
+    byId('trade-rows').innerHTML = rows.map(cells => cells.length === 1
+        ? `<tr><td colspan="3">${{cells[0]}}</td></tr>`
+        : `<tr>${{cells.map(c => `<td>${{c}}</td>`).join('')}}</tr>`).join('');
+    byId('trade-page').style.display = tradeShown < TRADES[tradeTab].length ? '' : 'none';
+}};
+// 상세보기를 다시 누르면 펼침 표시만 바뀜 (모달은 열린 채)
+byId('trade-detail').onclick = () => {{
+    const button = byId('trade-detail');
+    const expanded = button.getAttribute('aria-expanded') === 'true';
+    button.setAttribute('aria-expanded', String(!expanded));
+    button.innerText = expanded ? '실거래가 상세보기' : '실거래가 상세보기 ▲';
+    if (byId('trade-modal').style.display !== 'block') {{
+        byId('trade-modal').style.display = 'block';
+        tradeTab = '매매';
+        tradeShown = PAGE_SIZE;
+        renderTrades();
+    }}
+}};
+document.querySelectorAll('#trade-modal [role="tab"]').forEach(tab => {{
+    tab.onclick = () => {{ tradeTab = tab.innerText; tradeShown = PAGE_SIZE; renderTrades(); }};
+}});
+byId('trade-page').onclick = () => {{ tradeShown += PAGE_SIZE; renderTrades(); }};
+</script>
+</body></html>
+"""
+
+NEAR_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>주변 정보</title></head>
+<body>
+<div id="map"></div>
+<button class="btn_control roadview">로드뷰</button>
+<script>window.__INITIAL_STATE__ = {state_json};</script>
+</body></html>
+"""
+
+COMPLEX_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{name}아파트</title></head>
+<body>
+<h1>{name}아파트</h1>
+<p>{households}세대 · 사용승인 {approved_year}년</p>
+{body}
+</body></html>
+"""
+
+REGIONS_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>공항동 단지 목록</title></head>
+<body>
+<h1>서울시 강서구 공항동</h1>
+<ul>
+{links}
+</ul>
+</body></html>
+"""
+
+def article_page(seed, info, index):
+    """매물 상세 HTML + (매물ID, 목록 요약, 이미지 수)"""
+    article_id = str(2600000000 + int(info['단지ID']) % 1000 * 1000 + index)
+    rng = random.Random(f'{seed}-매물-{article_id}')
+    price = round(info['기준가'] * rng.uniform(0.92, 1.1), -2)
+    supply = rng.choice([(79.3, 59.9), (112.4, 84.9), (142.1, 114.8)])
+    floor, total_floors = rng.randrange(1, 25), 25
+    facing = rng.choice(['남향', '남동향', '남서향', '동향'])
+    fee_total = rng.randrange(180, 380) * 1000
+    loan_limit = round(price * 0.5, -2)
+    rates = [(bank, round(rng.uniform(3.5, 4.3), 2)) for bank in rng.sample(BANKS, 3)]
+    best_bank, best_rate = min(rates, key=lambda r: r[1])
+    station, line = rng.choice(STATIONS)
+    approved = info['사용승인']
+    image_count = rng.randrange(2, 5)
+    trades = {
+        '매매': trade_rows(rng, '매매', info['기준가'], rng.randrange(15, 40)),
+        '전세': trade_rows(rng, '전세', info['기준가'], rng.randrange(8, 25)),
+        '월세': trade_rows(rng, '월세', info['기준가'], rng.randrange(4, 15)),
+    }
+    latest = next(row for row in trades['매매'] if len(row) == 3)
+    intro = (f"{facing} {floor}층 올수리 매물입니다. 샷시포함 전체 수리되어 바로 입주 가능합니다.\n"
+             f"단지 내 초등학교 도보 5분, {station} 개통 예정으로 교통 여건이 좋아집니다.\n"
+             "주차 여유 있고 관리 상태 좋은 단지입니다. 방문 전 연락 부탁드립니다.")
+
+    values = {
+        'article_id': article_id,
+        'name': info['단지명'],
+        'dong': 100 + rng.randrange(1, 15),
+        'supply': supply[0],
+        'exclusive': supply[1],
+        'exclusive_ratio': round(supply[1] / supply[0] * 100),
+        'floor': floor,
+        'total_floors': total_floors,
+        'facing': facing,
+        'confirmed': f"2025. {rng.randrange(8, 11)}. {rng.randrange(1, 29)}.",
+        'summary': f"올수리 {facing} 채광 좋은 {floor}층",
+        'images': ''.join(f'<img data-src="/phinf/{article_id}/{n}.png" width="320" height="320" alt="매물 사진 {n}">'
+                          for n in range(1, image_count + 1)),
+        'region': '비규제',
+        'ltv': 50,
+        'loan_limit': format_price(loan_limit),
+        'rates': ''.join(f"<p>{bank} {rate}% ~ {round(rate + 1.2, 2)}%</p>" for bank, rate in rates),
+        'range_low': format_price(round(price * 0.9, -3)),
+        'range_high': format_price(round(price * 1.15, -3)),
+        'listing_count': rng.randrange(3, 30),
+        'kb_price': format_price(round(price * 0.97, -2)),
+        'best_bank': best_bank,
+        'best_rate': best_rate,
+        'monthly_payment': f"{round(loan_limit * 10000 * 0.0048):,}",
+        'latest_price': latest[2],
+        'latest_date': latest[0],
+        'latest_floor': latest[1],
+        'trade_summary': ''.join(f"<li>{row[0]} {row[1]} {row[2]}</li>"
+                                 for row in [row for row in trades['매매'] if len(row) == 3][:5]),
+        'facilities': '냉장고, 세탁기, 싱크대, 인덕션, 신발장, 엘리베이터',
+        'extra_facility': '붙박이장',
+        'price': format_price(price),
+        'fee_manwon': round(fee_total / 10000),
+        'rooms': 3 if supply[1] > 60 else 2,
+        'baths': 2 if supply[1] > 60 else 1,
+        'intro_short': intro.split('\n')[0][:30] + '...',
+        'posted': f"2025. {rng.randrange(8, 11)}. {rng.randrange(1, 29)}.",
+        'lot': info['번지'],
+        'approved': f"{approved[0]}.{approved[1]:02d}.{approved[2]:02d}",
+        'age': 2026 - approved[0],
+        'households': f"{info['세대수']:,}",
+        'area_households': f"{max(20, info['세대수'] // rng.randrange(3, 8)):,}",
+        'parking': f"{info['주차']:,}",
+        'parking_ratio': round(info['주차'] / info['세대수'], 2),
+        'far': info['용적률'],
+        'bcr': info['건폐율'],
+        'office_phone': f"{rng.randrange(2600, 2700)}-{rng.randrange(1000, 9999)}",
+        'builder': info['건설사'],
+        'station': station,
+        'line': line,
+        'open_year': rng.randrange(2027, 2032),
+        'station_distance': rng.randrange(300, 1500),
+        'station_walk': rng.randrange(5, 20),
+        'agent': rng.choice(AGENTS),
+        'agency': info['단지명'][:2],
+        'agency_phone': f"{rng.randrange(2600, 2700)}-{rng.randrange(1000, 9999)}",
+        'agency_lot': info['번지'],
+        'registration': f"{rng.randrange(100, 999):05d}",
+        'confirmed_count': rng.randrange(1, 40),
+        'brokerage': f"{round(price * 0.005):,}",
+        'acquisition_tax': f"{round(price * 0.033):,}",
+        'property_tax': f"{round(price * 0.002):,}",
+        'fee_total': f"{fee_total:,}",
+        'fee_average': f"{int(round(fee_total * 0.95, -3)):,}",
+        'fee_summer': f"{int(round(fee_total * 0.9, -3)):,}",
+        'fee_winter': f"{int(round(fee_total * 1.15, -3)):,}",
+        'trades_json': json.dumps(trades, ensure_ascii=False),
+        'intro_json': json.dumps(intro, ensure_ascii=False),
+        'page_size': TRADE_PAGE_SIZE,
+    }
+    listing = f"매매 {values['price']} 아파트 {supply[1]}㎡ {floor}/{total_floors}층 {facing}"
+    return article_id, ARTICLE_TEMPLATE.format(**values), listing, image_count
+
+def complex_pages(info, listings):
+    """단지 거래 탭 / 매물 탭 HTML (매물 탭은 처음 3개만 보이고 펼치기로 나머지)"""
+    common = {'name': info['단지명'], 'households': f"{info['세대수']:,}", 'approved_year': info['사용승인'][0]}
+    transaction = COMPLEX_TEMPLATE.format(
+        body=f'<p>최근 거래가 보이는 탭입니다.</p><a href="/complexes/{info["단지ID"]}?tab=article">매물</a>', **common)
+    hidden = ' class="more" style="display:none"'
+    items = ''.join(f'<li{hidden if n >= 3 else ""}><a href="/articles/{article_id}">{text}</a></li>'
+                    for n, (article_id, text) in enumerate(listings))
+    expand = ('<button onclick="document.querySelectorAll(\'li.more\').forEach(li => li.style.display = \'\');'
+              'this.remove()">매물목록 펼치기</button>') if len(listings) > 3 else ''
+    article = COMPLEX_TEMPLATE.format(body=f'<ul>{items}</ul>{expand}', **common)
+    return transaction, article
+
+def generate_fixture_site(root, complexes=4, articles=5, seed=0):
+    """픽스처 사이트 파일 생성 → {'단지': N, '매물': N, '이미지': N, '바이트': N}"""
+    root = Path(root)
+    for folder in ['articles', 'complexes', 'near', 'phinf']:
+        (root / folder).mkdir(parents=True, exist_ok=True)
+    counts = {'단지': 0, '매물': 0, '이미지': 0, '바이트': 0}
+
+    def write(path, data):
+        data = data.encode('utf-8') if isinstance(data, str) else data
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        counts['바이트'] += len(data)
+
+    links = []
+    for complex_index in range(complexes):
+        info = complex_info(seed, complex_index)
+        listings = []
+        for article_index in range(articles):
+            article_id, html, listing, image_count = article_page(seed, info, article_index)
+            write(root / 'articles' / f'{article_id}.html', html)
+            state = {'article': {'articleNo': article_id, 'complexNo': info['단지ID'],
+                                 'lat': info['위도'], 'lng': info['경도']}}
+            write(root / 'near' / f'{article_id}.html', NEAR_TEMPLATE.format(state_json=json.dumps(state)))
+            image_rng = random.Random(f'{seed}-이미지-{article_id}')
+            for n in range(1, image_count + 1):
+                write(root / 'phinf' / article_id / f'{n}.png', png_bytes(image_rng, *IMAGE_SIZE))
+            listings.append((article_id, listing))
+            counts['매물'] += 1
+            counts['이미지'] += image_count
+
+        transaction, article = complex_pages(info, listings)
+        write(root / 'complexes' / f"{info['단지ID']}.html", transaction)
+        write(root / 'complexes' / f"{info['단지ID']}.article.html", article)
+        links.append(f'<li><a href="/complexes/{info["단지ID"]}?tab=transaction">{info["단지명"]}아파트 '
+                     f'{info["세대수"]:,}세대</a></li>')
+        counts['단지'] += 1
+
+    write(root / 'regions.html', REGIONS_TEMPLATE.format(links='\n'.join(links)))
+    return counts
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="벤치마크용 픽스처 사이트 생성")
+    parser.add_argument('root', help="생성할 픽스처 폴더")
+    parser.add_argument('--complexes', type=int, default=4, help="단지 수 (기본 4)")
+    parser.add_argument('--articles', type=int, default=5, help="단지당 매물 수 (기본 5)")
+    parser.add_argument('--seed', type=int, default=0, help="코퍼스 시드 (같은 시드면 같은 파일)")
+    args = parser.parse_args()
+
+    counts = generate_fixture_site(args.root, args.complexes, args.articles, args.seed)
+    print(f"✓ 픽스처 생성: {args.root} (단지 {counts['단지']}개, 매물 {counts['매물']}개, "
+          f"이미지 {counts['이미지']}장, {counts['바이트'] / 1024 / 1024:.1f}MB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+로컬 픽스처 서버
+- 저장해 둔 매물 페이지(articles/{매물ID}.html)를 로컬에서 제공
+- 단지 목록/단지 탭/near 페이지/이미지도 같은 폴더에서 제공 (픽스처생성.py 구조)
+- 응답마다 지연(latency ± jitter) → 실제 사이트와 비슷한 대기로 벤치마크(벤치마크.py)
+- 요청 수/응답 바이트 집계 (server.traffic)
+- 실제 사이트에 요청하지 않고 크롤러 동시성/요청 제한을 확인할 때 사용
+- URL 데이터 파일(URL목록) 생성 기능 포함
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+# 경로 → 파일 ({id}, {tab} 치환, 없으면 정적 파일 규칙)
+ROUTES = [
+    (re.compile(r'^/articles/(?P<id>\d+)/?$'), ['articles/{id}.html']),
+    (re.compile(r'^/near/article/(?P<id>\d+)/?$'), ['near/{id}.html']),
+    (re.compile(r'^/complexes/(?P<id>\d+)/?$'), ['complexes/{id}.{tab}.html', 'complexes/{id}.html']),
+    (re.compile(r'^/regions/?$'), ['regions.html']),
+]
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """
+    /articles/{ID} → articles/{ID}.html, /near/article/{ID} → near/{ID}.html,
+    /complexes/{ID}?tab=X → complexes/{ID}.X.html (없으면 complexes/{ID}.html), /regions → regions.html,
+    나머지는 정적 파일
+    """
+
+    def translate_path(self, path):
+        parts = urlsplit(path)
+        tab = parse_qs(parts.query).get('tab', ['transaction'])[0]
+        for pattern, candidates in ROUTES:
+            match = pattern.match(parts.path)
+            if not match:
+                continue
+            paths = [candidate.format(id=match.groupdict().get('id'), tab=tab) for candidate in candidates]
+            relative = next((p for p in paths if os.path.isfile(os.path.join(self.directory, p))), paths[-1])
+            return super().translate_path('/' + relative)
+        return super().translate_path(path)
+
+    def do_GET(self):
+        # 응답 지연 (스레드마다 따로 기다리므로 동시 요청은 겹침)
+        delay = getattr(self.server, 'latency', 0.0) + random.uniform(-1, 1) * getattr(self.server, 'jitter', 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        super().do_GET()
+
+    def send_response(self, code, message=None):
+        record_traffic(self.server, '요청')
+        if code >= 400:
+            record_traffic(self.server, '오류')
+        super().send_response(code, message)
+
+    def copyfile(self, source, outputfile):
+        record_traffic(self.server, '바이트', os.fstat(source.fileno()).st_size)
+        super().copyfile(source, outputfile)
+
+    def log_message(self, format, *args):
+        # 요청 로그는 출력하지 않음 (크롤러 로그와 섞이지 않도록)
+        pass
+
+def record_traffic(server, key, amount=1):
+    """서버 요청/바이트 집계 (핸들러 스레드에서 호출)"""
+    with server.traffic_lock:
+        server.traffic[key] += amount
+
+def start_fixture_server(root, host='127.0.0.1', port=0, latency=0.0, jitter=0.0):
+    """
+    백그라운드 스레드에서 픽스처 서버 실행 → (server, base_url)
+    - latency/jitter: 응답 지연(초), 요청마다 latency ± jitter
+    - server.traffic: {'요청', '오류', '바이트'}
+    """
+    handler = partial(FixtureHandler, directory=str(root))
+    server = ThreadingHTTPServer((host, port), handler)
+    server.latency = latency
+    server.jitter = jitter
+    server.traffic = {'요청': 0, '오류': 0, '바이트': 0}
+    server.traffic_lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://{host}:{server.server_address[1]}"
+    return server, base_url
+
+def fixture_url_list(root, base_url):
+    """픽스처 매물 페이지 목록 → URL목록 항목 (순번, 매물ID, URL)"""
+    article_ids = sorted(p.stem for p in Path(root, 'articles').glob('*.html') if p.stem.isdigit())
+    return [
+        {'순번': idx, '매물ID': article_id, 'URL': f"{base_url}/articles/{article_id}"}
+        for idx, article_id in enumerate(article_ids, 1)
+    ]
+
+def write_url_file(root, base_url, output_path):
+    """픽스처 매물 페이지 목록으로 URL 데이터 파일 생성"""
+    url_list = fixture_url_list(root, base_url)
+    result = {
+        '수집정보': {
+            '생성시간': datetime.now().isoformat(),
+            '총URL수': len(url_list),
+            '설명': '로컬 픽스처 매물 URL 목록'
+        },
+        'URL목록': url_list
+    }
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    return len(url_list)
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="로컬 픽스처 서버")
+    parser.add_argument('root', help="픽스처 폴더 (articles/{매물ID}.html 포함)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--url-file', help="생성할 URL 데이터 파일 경로")
+    parser.add_argument('--latency', type=float, default=0.0, help="응답 지연(초, 기본 0)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="응답 지연 흔들림(초, latency ± jitter)")
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server(args.root, port=args.port, latency=args.latency, jitter=args.jitter)
+
+    print("\n" + "="*80)
+    print("로컬 픽스처 서버")
+    print("="*80)
+    print(f"폴더: {args.root}")
+    print(f"주소: {base_url}")
+    if args.latency or args.jitter:
+        print(f"응답 지연: {args.latency * 1000:.0f}ms ± {args.jitter * 1000:.0f}ms")
+
+    if args.url_file:
+        count = write_url_file(args.root, base_url, args.url_file)
+        print(f"✓ URL 데이터 파일 생성: {args.url_file} ({count}개)")
+
+    print("="*80)
+    print("Ctrl+C로 종료\n")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n✓ 서버 종료 (요청 {server.traffic['요청']}회, 오류 {server.traffic['오류']}회, "
+              f"{server.traffic['바이트'] / 1024 / 1024:.1f}MB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,670 @@
+"""
+매물 페이지 텍스트 필드 추출기
+- 필드 표(FIELD_TABLE): 검색 섹션 → 미리 컴파일한 패턴 → (columns_structure.json 경로, 변환 함수)
+- page_text는 한 번만 섹션으로 나누고 각 패턴은 자기 섹션에서만 검색
+  (섹션에서 못 찾으면 전체 텍스트에서 다시 검색)
+- url기반/법정동별/상세 매물수집이 같은 표를 사용
+- parse_article: 보관한 원문(원문보관.py)만으로 매물 JSON 재구성 (브라우저 없음)
+- 실거래가: 표 행(실거래가.py에서 읽은 셀 목록) → parse_trade_rows, 표가 없을 때만 탭 텍스트 정규식
+- 벤치마크: python 필드추출.py 페이지텍스트폴더 [--repeat 20]
+"""
+import argparse
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from 가격정규화 import parse_price, parse_price_range, parse_rent
+
+# ===== 섹션 나누기 =====
+
+# 섹션 제목 (줄 맨 앞, 처음 나온 위치부터 다음 섹션 제목 전까지)
+SECTION_HEADINGS = [
+    ('대출한도', r'대출\s*한도'),
+    ('금리정보', r'금리\s*정보'),
+    ('매물분포', r'가격분포'),
+    ('대출계산기', r'대출\s*계산기'),
+    ('기본정보', r'기본\s*정보'),
+    ('매물소개', r'매물소개'),
+    ('단지정보', r'단지\s*정보'),
+    ('시설정보', r'시설\s*정보'),
+    ('개발예정', r'개발\s*(?:예정|호재)'),
+    ('중개사', r'중개소'),
+    ('중개보수', r'중개\s*보수'),
+    ('세금', r'세금'),
+    ('대중교통', r'(?:주변\s*)?대중교통'),
+]
+
+# 줄 맨 앞(^)을 먼저 확인하고 제목 후보 비교 (제목마다 ^를 두면 훨씬 느림)
+SECTION_SPLIT_PATTERN = re.compile(
+    '^[ \\t]*(?:' + '|'.join(f'(?P<s{i}>{heading})' for i, (_, heading) in enumerate(SECTION_HEADINGS)) + ')',
+    re.MULTILINE,
+)
+
+class PageSections:
+    """page_text를 한 번 나눈 섹션 모음 (없는 섹션은 전체 텍스트)"""
+
+    def __init__(self, page_text, mgmt_text=''):
+        self.text = page_text or ''
+        self.mgmt_text = mgmt_text or ''
+        self.sections = split_sections(self.text)
+
+    def get(self, name):
+        """섹션 텍스트 ('전체': 전체, '관리비상세': 관리비 팝업 텍스트가 있으면 그것)"""
+        if name == '전체':
+            return self.text
+        if name == '관리비상세':
+            return self.mgmt_text or self.text
+        return self.sections.get(name)
+
+def split_sections(text):
+    """섹션 제목 위치를 한 번에 찾아서 {섹션: 텍스트}"""
+    starts = {}
+    for match in SECTION_SPLIT_PATTERN.finditer(text):
+        name = SECTION_HEADINGS[int(match.lastgroup[1:])][0]
+        starts.setdefault(name, match.start())
+
+    ordered = sorted(starts.items(), key=lambda x: x[1])
+    sections = {}
+    for idx, (name, start) in enumerate(ordered):
+        end = ordered[idx + 1][1] if idx + 1 < len(ordered) else len(text)
+        sections[name] = text[start:end]
+    return sections
+
+# ===== 변환 함수 =====
+
+def strip(value):
+    return value.strip()
+
+def to_int(value):
+    return int(value)
+
+def to_float(value):
+    return float(value)
+
+def comma_int(value):
+    """'1,495' → 1495"""
+    return int(value.replace(',', ''))
+
+def manwon_to_won(value):
+    """'1,234'(만원) → 12340000(원)"""
+    return comma_int(value) * 10000
+
+def ymd(year, month, day):
+    return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+
+def ym(year, month):
+    return f"{year}-{month.zfill(2)}"
+
+def clean_intro(value):
+    """매물소개 정리 (갤러리 문구 제거, 짧은 줄 제거)"""
+    text = value.strip()
+    text = re.sub(r'\d+ 번째.*', '', text)
+    text = re.sub(r'선택됨.*', '', text)
+    lines = [line.strip() for line in text.split('\n') if line.strip() and len(line.strip()) > 5]
+    return '\n'.join(lines)
+
+def bus_list(value):
+    """마을버스 목록 (지선/간선 단어 제외)"""
+    buses = [b.strip() for b in re.split(r'[,\s]+', value) if b.strip() and b.strip() not in ['지선', '간선']]
+    return buses or None
+
+def bus_number_list(value):
+    """지선/간선 버스 번호 목록"""
+    buses = [b.strip() for b in re.split(r'[,\s]+', value) if b.strip() and b.strip().isdigit()]
+    return buses or None
+
+def const(value):
+    """패턴이 있으면 고정값"""
+    return lambda: value() if callable(value) else value
+
+# ===== 필드 표 =====
+
+# (검색 섹션, 패턴, [(필드 경로, 변환 함수, 그룹 번호...)], 플래그)
+# - 같은 필드를 여러 줄에 쓰면 먼저 찾은 값 사용 (대체 패턴)
+FIELD_TABLE = [
+    # 매물정보 (상단 요약)
+    ('전체', r'([가-힣\s]+(?:아파트|빌라|오피스텔|주상복합))\s*(\d+동)',
+     [('매물정보.단지명', strip, 1), ('매물정보.동', strip, 2)], 0),
+    ('전체', r'(?:아파트|빌라|오피스텔|주상복합)\s*([\d.]+)㎡\s*\(전용\s*([\d.]+)\)\s*(\d+)/(\d+)층',
+     [('매물정보.공급면적_제곱미터', to_float, 1), ('매물정보.전용면적_제곱미터', to_float, 2),
+      ('매물정보.해당층', to_int, 3), ('매물정보.총층수', to_int, 4)], 0),
+    ('전체', r'(\w+향)', [('매물정보.향', strip, 1)], 0),
+    ('전체', r'집주인확인매물', [('매물정보.집주인확인매물', const(True))], 0),
+    ('전체', r'집주인확인매물\s*(\d{4})\.\s*(\d{1,2})\.\s*(\d{1,2})\.', [('매물정보.집주인확인일', ymd, 1, 2, 3)], 0),
+    ('전체', r'(?:샷시포함|특|올수리|급매|가격조정|아이들|키우기|최적|깨끗|넓은|좋은|전망|채광|통풍)[^\n]{0,100}',
+     [('매물정보.매물요약', strip, 0)], 0),
+
+    # 대출정보
+    ('대출한도', r'(투기과열|조정대상|비규제)[,\s]*LTV\s*(\d+)%',
+     [('대출정보.대출한도.규제지역', strip, 1), ('대출정보.대출한도.LTV_퍼센트', to_int, 2)], 0),
+    ('대출한도', r'최대\s*([\d억,\s]+만?원)', [('대출정보.대출한도.최대금액', strip, 1)], 0),
+
+    # 매물분포
+    ('매물분포', r'가격분포\s*매매\s*([\d억,\s~]+)', [('매물분포.가격범위', strip, 1)], 0),
+    ('매물분포', r'매물수\s*(\d+)개', [('매물분포.총매물수', to_int, 1)], 0),
+
+    # 대출계산기
+    ('대출계산기', r'대출 금액\s*최대\s*([\d억,\s]+만?원)', [('대출계산기.대출금액', strip, 1)], 0),
+    ('대출계산기', r'KB시세\s+([\d억,\s]+만?원)', [('대출계산기.KB시세', strip, 1)], 0),
+    ('대출계산기', r'대출 기간\s*최대\s*(\d+)년', [('대출계산기.대출기간_년', to_int, 1)], 0),
+    ('대출계산기', r'원리금균등', [('대출계산기.상환방법', const(lambda: ['원리금균등', '원금균등']))], 0),
+    ('대출계산기', r'최저 금리[^\n]*?([가-힣]+(?:은행|생명))\s*([\d.]+%)',
+     [('대출계산기.최저금리_은행', strip, 1), ('대출계산기.최저금리', strip, 2)], 0),
+    ('대출계산기', r'예상 월 원리금\s*([\d,]+)원', [('대출계산기.예상월원리금_원', comma_int, 1)], 0),
+
+    # 기본정보
+    ('기본정보', r'매매가\s*([\d억,\s]+만?원)', [('기본정보.매매가', strip, 1)], 0),
+    ('기본정보', r'관리비부과기준\s*([^\n]+)', [('기본정보.관리비부과기준', strip, 1)], 0),
+    ('기본정보', r'관리비\s*(\d+)만원', [('기본정보.관리비_만원', to_int, 1)], 0),
+    ('관리비상세', r'관리비\s*합계\s*([\d,]+)\s*원', [('기본정보.관리비합계_원', comma_int, 1)], 0),
+    ('관리비상세', r'포함\s*항목\s*\(사용료\)\s*:\s*([^\n]+)', [('기본정보.관리비포함항목', strip, 1)], 0),
+    ('관리비상세', r'관리비\s*기준\s*:\s*([^\n]+)', [('기본정보.관리비기준', strip, 1)], 0),
+    ('기본정보', r'공급면적\s*([\d.]+)㎡', [('기본정보.공급면적_제곱미터', to_float, 1)], 0),
+    ('기본정보', r'전용면적\s*([\d.]+)㎡\s*\(전용률\s*(\d+)%\)',
+     [('기본정보.전용면적_제곱미터', to_float, 1), ('기본정보.전용률_퍼센트', to_int, 2)], 0),
+    ('기본정보', r'층\s*(\d+)층/\s*총\s*(\d+)층', [('기본정보.해당층', to_int, 1), ('기본정보.총층수', to_int, 2)], 0),
+    ('기본정보', r'방수/욕실수\s*(\d+)/(\d+)개', [('기본정보.방수', to_int, 1), ('기본정보.욕실수', to_int, 2)], 0),
+    ('기본정보', r'향\s*\(거실 기준\)\s*([^\n]+)', [('기본정보.향', strip, 1)], 0),
+    ('기본정보', r'복층여부\s*([^\n]+)', [('기본정보.복층여부', strip, 1)], 0),
+    ('기본정보', r'입주가능일\s*([^\n]+)', [('기본정보.입주가능일', strip, 1)], 0),
+    ('기본정보', r'매물번호\s*([0-9-]+)', [('기본정보.매물번호', strip, 1)], 0),
+    ('매물소개', r'매물소개\s*\n((?:(?!최초게재|허위|단지 정보|로딩중).)+)', [('기본정보.매물소개', clean_intro, 1)], re.DOTALL),
+    ('매물소개', r'(\d{4})\.\s*(\d{1,2})\.\s*(\d{1,2})\.\s*최초게재([가-힣]+)\s*제공',
+     [('기본정보.최초게재일', ymd, 1, 2, 3), ('기본정보.제공업체', strip, 4)], 0),
+
+    # 단지정보
+    ('단지정보', r'위치\s*([가-힣]+시\s+[가-힣]+구\s+[가-힣]+동\s+[\d-]+)', [('단지정보.위치', strip, 1)], 0),
+    ('단지정보', r'건축물용도\s*([^\n]+)', [('단지정보.건축물용도', strip, 1)], 0),
+    ('단지정보', r'사용승인일\s*(\d{4})\.(\d{2})\.(\d{2})\s*\((\d+)년차\)',
+     [('단지정보.사용승인일', ymd, 1, 2, 3), ('단지정보.건물연차', to_int, 4)], 0),
+    ('단지정보', r'세대수\s*(\d+(?:,\d+)?)\s*세대\s*\(해당 면적\s*(\d+(?:,\d+)?)\s*세대\)',
+     [('단지정보.총세대수', comma_int, 1), ('단지정보.해당면적세대수', comma_int, 2)], 0),
+    ('단지정보', r'현관구조\s*([^\n]+)', [('단지정보.현관구조', strip, 1)], 0),
+    ('단지정보', r'난방\s*([^\n]+)', [('단지정보.난방', strip, 1)], 0),
+    ('단지정보', r'주차\s*(\d+(?:,\d+)?)\s*대\s*\(세대당\s*([\d.]+)대\)',
+     [('단지정보.주차대수', comma_int, 1), ('단지정보.세대당주차', to_float, 2)], 0),
+    ('단지정보', r'용적률/건폐율\s*(\d+)%\s*/\s*(\d+)%',
+     [('단지정보.용적률_퍼센트', to_int, 1), ('단지정보.건폐율_퍼센트', to_int, 2)], 0),
+    ('단지정보', r'관리사무소 전화\s*([\d-]+)', [('단지정보.관리사무소전화', strip, 1)], 0),
+    ('단지정보', r'건설사\s*([^\n]+)', [('단지정보.건설사', strip, 1)], 0),
+
+    # 중개사
+    ('중개사', r'중개소\s*중개사\s*([^\n]+)\s*([가-힣]+공인중개사사무소)',
+     [('중개사.중개사명', strip, 1), ('중개사.중개소명', strip, 2)], 0),
+    ('중개사', r'중개사.*?전화\s*([\d-]+)', [('중개사.전화', strip, 1)], re.DOTALL),
+    ('중개사', r'위치\s*([^\n]+(?:상가동|호)[^\n]*)', [('중개사.위치', strip, 1)], 0),
+    ('중개사', r'등록번호\s*([\d-]+)', [('중개사.등록번호', strip, 1)], 0),
+    ('중개사', r'최근\s*(\d+)개월\s*집주인확인\s*(\d+)건',
+     [('중개사.최근실적_개월', to_int, 1), ('중개사.최근실적_건수', to_int, 2)], 0),
+
+    # 중개보수
+    ('중개보수', r'중개 보수\s*최대\s*([\d,]+)만원', [('중개보수.최대금액_원', manwon_to_won, 1)], 0),
+    ('중개보수', r'상한 요율\s*([\d.]+)%', [('중개보수.상한요율_퍼센트', to_float, 1)], 0),
+
+    # 세금
+    ('세금', r'취득세 합계\s*약\s*([\d,]+)만원', [('세금.취득세_원', manwon_to_won, 1)], 0),
+    ('세금', r'재산세 합계\s*약\s*([\d,]+)만원', [('세금.재산세_원', manwon_to_won, 1)], 0),
+    ('전체', r'^(?=.*종합부동산세)(?=.*과세대상 아님)', [('세금.종합부동산세', const('과세대상 아님'))], re.DOTALL),
+
+    # 관리비 (관리비 팝업 텍스트 우선, 대체 패턴 순서대로)
+    ('관리비상세', r'관리비\s*합계\s*([\d,]+)\s*원', [('관리비.관리비합계_원', comma_int, 1)], 0),
+    ('관리비상세', r'관리비\s*([\d,]+)\s*원', [('관리비.관리비합계_원', comma_int, 1)], 0),
+    ('관리비상세', r'(\d{1,3}(?:,\d{3})+)\s*원.*관리비', [('관리비.관리비합계_원', comma_int, 1)], 0),
+    ('관리비상세', r'(\d{4})[.\s년]*(\d{1,2})[.\s월]*([\d,]+)\s*원',
+     [('관리비.기준년월', ym, 1, 2), ('관리비.최근관리비_원', comma_int, 3)], 0),
+    ('관리비상세', r'(\d{4})\s*년\s*(\d{1,2})\s*월.*?([\d,]+)\s*원',
+     [('관리비.기준년월', ym, 1, 2), ('관리비.최근관리비_원', comma_int, 3)], 0),
+    ('관리비상세', r'월\s*평균\s*[:\s]*([\d,]+)\s*원', [('관리비.월평균_원', comma_int, 1)], 0),
+    ('관리비상세', r'평균\s*([\d,]+)\s*원', [('관리비.월평균_원', comma_int, 1)], 0),
+    ('관리비상세', r'여름\s*\([\d~월\s]+\)\s*평균\s*([\d,]+)\s*원', [('관리비.여름평균_원', comma_int, 1)], 0),
+    ('관리비상세', r'여름.*?([\d,]+)\s*원', [('관리비.여름평균_원', comma_int, 1)], 0),
+    ('관리비상세', r'겨울\s*\([\d~월\s]+\)\s*평균\s*([\d,]+)\s*원', [('관리비.겨울평균_원', comma_int, 1)], 0),
+    ('관리비상세', r'겨울.*?([\d,]+)\s*원', [('관리비.겨울평균_원', comma_int, 1)], 0),
+    ('관리비상세', r'포함\s*항목\s*\(사용료\)\s*:\s*([^\n]+)', [('관리비.포함항목', strip, 1)], 0),
+    ('관리비상세', r'포함\s*항목\s*:\s*([^\n]+)', [('관리비.포함항목', strip, 1)], 0),
+    ('관리비상세', r'관리비\s*기준\s*:\s*([^\n]+)', [('관리비.관리비기준', strip, 1)], 0),
+    ('관리비상세', r'기준\s*:\s*([^\n]+평균[^\n]*)', [('관리비.관리비기준', strip, 1)], 0),
+
+    # 주변대중교통
+    ('대중교통', r'버스\s*마을\s*([^\n]+)', [('주변대중교통.버스.마을', bus_list, 1)], 0),
+    ('대중교통', r'지선\s*([\d,\s]+)', [('주변대중교통.버스.지선', bus_number_list, 1)], 0),
+    ('대중교통', r'간선\s*([\d,\s]+)', [('주변대중교통.버스.간선', bus_number_list, 1)], 0),
+]
+
+# 여러 건을 모으는 필드: (검색 섹션, 패턴, 필드 경로, 항목 만들기, 중복 확인 키)
+LIST_TABLE = [
+    ('금리정보', r'([가-힣A-Z]+(?:은행|생명|저축은행|캐피탈))\s*([\d.]+%\s*~\s*[\d.]+%|[\d.]+%)', '대출정보.금리정보',
+     lambda m: {'은행명': m.group(1).strip(), '금리범위': m.group(2).strip()}, '은행명'),
+    ('금리정보', r'(SC제일은행|KB국민은행|우리은행|신한은행|하나은행|농협은행|IBK기업은행|교보생명|한화생명|삼성생명)\s*([\d.]+%\s*~\s*[\d.]+%|[\d.]+%)',
+     '대출정보.금리정보', lambda m: {'은행명': m.group(1).strip(), '금리범위': m.group(2).strip()}, '은행명'),
+    ('개발예정', r'([가-힣]+역)\((\d{4})년예정\)\s*노선\s*([^\n]+)\s*개통\s*(\d{4})년 예정\s*거리\s*(\d+)m도보\s*(\d+)분',
+     '개발예정', lambda m: {'역명': m.group(1), '개통예정년도': int(m.group(2)), '노선': m.group(3).strip(),
+                          '거리_미터': int(m.group(5)), '도보_분': int(m.group(6))}, None),
+]
+
+# 다른 필드 값 복사 (대상 ← 원본)
+COPY_FIELDS = [
+    ('관리비.관리비_만원', '기본정보.관리비_만원'),
+]
+
+# 시설 키워드
+FACILITIES = {
+    '벽걸이에어컨': ['벽걸이에어컨', '벽걸이 에어컨', '에어컨'],
+    '신발장': ['신발장'],
+    '냉장고': ['냉장고'],
+    '세탁기': ['세탁기'],
+    '싱크대': ['싱크대'],
+    '인덕션': ['인덕션'],
+    '레인지': ['레인지', '가스레인지'],
+    '엘리베이터': ['엘리베이터', 'EV']
+}
+
+# 옵션/시설 문구에서 추가 시설 찾기
+OPTION_PATTERN = re.compile(r'(?:옵션|시설|포함)[^\n]*?([가-힣]+(?:장|기|대|기기|시설))')
+
+# 컴파일된 표 (모듈 로드 시 한 번)
+COMPILED_FIELDS = [(section, re.compile(pattern, flags), targets) for section, pattern, targets, flags in FIELD_TABLE]
+COMPILED_LISTS = [(section, re.compile(pattern), path, build, key) for section, pattern, path, build, key in LIST_TABLE]
+
+# ===== 추출 =====
+
+def top_section(path):
+    return path.split('.', 1)[0]
+
+def get_path(data, path):
+    for key in path.split('.'):
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+def set_path(data, path, value):
+    keys = path.split('.')
+    for key in keys[:-1]:
+        data = data.setdefault(key, {})
+    data[keys[-1]] = value
+
+def search(sections, section, pattern):
+    """섹션에서 검색 → 없으면 전체 텍스트에서 검색"""
+    text = sections.get(section)
+    match = pattern.search(text) if text is not None else None
+    if match is None and section not in ('전체', '관리비상세'):
+        match = pattern.search(sections.text)
+    return match
+
+def fill_fields(result, sections, groups=None, fields=None):
+    """
+    groups(최상위 섹션 이름)에 속한 필드를 표대로 추출해서 result에 채움
+    - sections: PageSections
+    - fields: 지정하면 이 경로의 필드만 추출
+    - 반환값: 채운 필드 수
+    """
+    def selected(path):
+        if groups is not None and top_section(path) not in groups:
+            return False
+        return fields is None or path in fields
+
+    filled = set()
+
+    for section, pattern, targets in COMPILED_FIELDS:
+        paths = [t[0] for t in targets if selected(t[0])]
+        if not paths or all(p in filled for p in paths):
+            continue
+        match = search(sections, section, pattern)
+        if match is None:
+            continue
+        for path, convert, *group_ids in targets:
+            if path not in paths or path in filled:
+                continue
+            try:
+                value = convert(*[match.group(g) for g in group_ids])
+            except (TypeError, ValueError, AttributeError):
+                continue
+            if value is None:
+                continue
+            set_path(result, path, value)
+            filled.add(path)
+
+    for section, pattern, path, build, key in COMPILED_LISTS:
+        if not selected(path):
+            continue
+        text = sections.get(section)
+        if text is None:
+            text = sections.text
+        items = get_path(result, path)
+        if items is None:
+            items = []
+            set_path(result, path, items)
+        for match in pattern.finditer(text):
+            item = build(match)
+            if key and any(existing.get(key) == item[key] for existing in items):
+                continue
+            items.append(item)
+            filled.add(path)
+
+    for target, source in COPY_FIELDS:
+        value = get_path(result, source)
+        if selected(target) and value is not None:
+            set_path(result, target, value)
+            filled.add(target)
+
+    return len(filled)
+
+def extract_field(page_text, path):
+    """필드 하나만 추출 (크롤링 중 바로 필요한 값, 예: 좌표 캐시 키로 쓰는 단지정보.위치)"""
+    result = {}
+    fill_fields(result, PageSections(page_text), fields=[path])
+    return get_path(result, path)
+
+def extract_facilities(page_text, detect_options=False):
+    """시설 키워드 확인 (+ 옵션/시설 문구에서 추가 시설)"""
+    facilities = {}
+    for facility_key, keywords in FACILITIES.items():
+        facilities[facility_key] = any(keyword in page_text for keyword in keywords)
+
+    if detect_options:
+        for match in OPTION_PATTERN.finditer(page_text):
+            facility_name = match.group(1).strip()
+            # 이미 있는 시설이 아니고, 2글자 이상인 경우만
+            if facility_name not in FACILITIES and len(facility_name) >= 2:
+                facilities[facility_name] = True
+    return facilities
+
+ALL_GROUPS = ['매물정보', '대출정보', '매물분포', '대출계산기', '기본정보', '단지정보',
+              '개발예정', '중개사', '중개보수', '세금', '관리비', '주변대중교통']
+
+def extract_all(page_text, mgmt_text=''):
+    """페이지 텍스트 전체 추출 (벤치마크/오프라인 재처리용)"""
+    result = {}
+    sections = PageSections(page_text, mgmt_text)
+    fill_fields(result, sections, ALL_GROUPS)
+    result['시설정보'] = extract_facilities(page_text)
+    return result
+
+# ===== 실거래가 =====
+
+# 실거래가 탭 패턴 (연도가 없으면 수집시간 기준으로 추정, 가격은 줄을 넘지 않음)
+TRADE_PATTERNS = [
+    # 예: "11. 15. 69.84 5층 12억 5,000"
+    (re.compile(r'(?P<month>\d{1,2})[.\s]+(?P<day>\d{1,2})[.\s]+(?:[\d.]+\s*)?(?P<floor>\d+)\s*층\s*(?P<price>[\d억,][\d억, \t]*(?:만원?)?)(?![\d억, \t]*/)'), None),
+    # 예: "2025-11-15 5층 12억 5,000"
+    (re.compile(r'(?P<year>\d{4})[.-](?P<month>\d{1,2})[.-](?P<day>\d{1,2})\s*(?P<floor>\d+)\s*층\s*(?P<price>[\d억,][\d억, \t/]*)'), None),
+    # 예: "11. 15. 5층 1억/200" (보증금/월세)
+    (re.compile(r'(?P<month>\d{1,2})[.\s]+(?P<day>\d{1,2})[.\s]+(?:[\d.]+\s*)?(?P<floor>\d+)\s*층\s*(?P<price>[\d억,][\d억, \t]*)/(?P<monthly>[\d,]+)'), '월세'),
+]
+
+def collected_datetime(collected_at):
+    """수집시간(ISO 문자열) → datetime (없거나 잘못되면 현재 시각)"""
+    try:
+        return datetime.fromisoformat(collected_at)
+    except (TypeError, ValueError):
+        return datetime.now()
+
+def contract_date(month, day, collected, year=None):
+    """
+    계약일 'YYYY-MM-DD'
+    - 연도가 없으면 수집일 기준 연도, 수집일보다 뒤의 월/일이면 전년도
+    - 잘못된 월/일이면 None
+    """
+    month, day = int(month), int(day)
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return None
+    if year is None:
+        year = collected.year if (month, day) <= (collected.month, collected.day) else collected.year - 1
+    return f"{year}-{month:02d}-{day:02d}"
+
+def trade_record(date, floor, price, tab_name, remark=''):
+    """거래 한 건 (가격 문자열 + 만원 정수, 월세는 보증금/월세 따로)"""
+    trans = {
+        '계약일': date,
+        '층': floor,
+        '가격': price,
+        '비고': remark
+    }
+    if tab_name == '월세':
+        deposit, monthly = parse_rent(price)
+        trans['가격_만원'] = deposit
+        trans['월세_만원'] = monthly
+    else:
+        trans['가격_만원'] = parse_price(price)
+    return trans
+
+def parse_trades(trade_text, tab_name, collected_at=None):
+    """실거래가 탭 텍스트 → 거래 목록 (계약일/층/가격 중복 제거, 0층 제외)"""
+    collected = collected_datetime(collected_at)
+    seen = set()
+    transactions = []
+    for pattern, only_tab in TRADE_PATTERNS:
+        if only_tab and only_tab != tab_name:
+            continue
+        for match in pattern.finditer(trade_text):
+            parts = match.groupdict()
+            date = contract_date(parts['month'], parts['day'], collected, parts.get('year'))
+            if date is None or int(parts['floor']) == 0:
+                continue
+            if parts.get('monthly'):
+                price = f"{parts['price'].strip()}/{parts['monthly'].strip()}"
+            else:
+                price = re.sub(r'\s+', ' ', parts['price']).replace('만원', '').strip()
+            trans = trade_record(date, int(parts['floor']), price, tab_name)
+            key = (trans['계약일'], trans['층'], trans['가격'])
+            if key not in seen:
+                seen.add(key)
+                transactions.append(trans)
+    return transactions
+
+# 실거래가 표 셀 패턴
+TRADE_YEAR_ROW = re.compile(r'^(\d{4})\s*년?$')
+TRADE_DATE_CELL = re.compile(r'^(?:(?P<year>\d{2}|\d{4})[.\-/])?(?P<month>\d{1,2})[.\-/](?P<day>\d{1,2})\.?$')
+TRADE_FLOOR_CELL = re.compile(r'(?P<basement>지하|B)?\s*(?P<floor>\d+)\s*층')
+TRADE_PRICE_CELL = re.compile(r'^(?=.*\d)(?:\d[\d,]*(?:\.\d+)?\s*억\s*)?(?:\d[\d,]*)?\s*(?:만원?)?(?:\s*/\s*[\d,]+(?:만원?)?)?$')
+
+def parse_trade_rows(rows, tab_name, collected_at=None):
+    """
+    실거래가 표 행(셀 문자열 목록) → 거래 목록
+    - 셀 하나짜리 'YYYY년' 행은 이후 행의 연도, 연도가 없으면 수집시간 기준으로 추정
+    - 날짜와 가격이 없는 행(머리글 등)은 건너뜀, 층이 없으면 None (0층은 만들지 않음)
+    - 가격 후보 셀이 여럿이면 '억' 또는 '/'가 있는 셀, 없으면 마지막 셀 (앞쪽 숫자 셀은 면적 등)
+    """
+    collected = collected_datetime(collected_at)
+    year = None
+    seen = set()
+    transactions = []
+    for cells in rows:
+        cells = [re.sub(r'\s+', ' ', c).strip() for c in cells if c and c.strip()]
+        if len(cells) == 1 and TRADE_YEAR_ROW.match(cells[0]):
+            year = int(TRADE_YEAR_ROW.match(cells[0]).group(1))
+            continue
+
+        date = floor = None
+        prices = []
+        remarks = []
+        for cell in cells:
+            date_match = TRADE_DATE_CELL.match(cell.replace(' ', '')) if date is None else None
+            floor_match = TRADE_FLOOR_CELL.search(cell) if floor is None else None
+            if date_match:
+                row_year = date_match.group('year')
+                if row_year:
+                    row_year = int(row_year) + (2000 if len(row_year) == 2 else 0)
+                date = contract_date(date_match.group('month'), date_match.group('day'), collected, row_year or year)
+            elif floor_match:
+                floor = int(floor_match.group('floor')) * (-1 if floor_match.group('basement') else 1) or None
+            elif TRADE_PRICE_CELL.match(cell):
+                prices.append(re.sub(r'\s*/\s*', '/', cell).replace('만원', '').strip())
+            else:
+                remarks.append(cell)
+
+        if date is None or not prices:
+            continue
+        price = next((c for c in prices if '억' in c or '/' in c), prices[-1])
+        trans = trade_record(date, floor, price, tab_name, ' '.join(remarks))
+        key = (trans['계약일'], trans['층'], trans['가격'])
+        if key not in seen:
+            seen.add(key)
+            transactions.append(trans)
+    return transactions
+
+# ===== 원문 → 매물 JSON =====
+
+# 단계별 추출 그룹 (시설정보 앞/뒤)
+FIRST_GROUPS = ['매물정보', '대출정보', '매물분포', '대출계산기', '기본정보', '단지정보']
+LATER_GROUPS = ['개발예정', '중개사', '중개보수', '세금', '관리비', '주변대중교통']
+
+# 같은 단지 매물이면 같은 섹션 (단지캐시.py) / 그중 매물마다 다른 필드
+COMPLEX_GROUPS = ['단지정보', '개발예정', '주변대중교통']
+ARTICLE_COMPLEX_FIELDS = ['단지정보.해당면적세대수']
+
+def new_result(meta):
+    """빈 매물 결과 (columns_structure.json 기준)"""
+    return {
+        '메타정보': dict(meta),
+        '매물정보': {},
+        '대출정보': {
+            '대출한도': {},
+            '금리정보': []
+        },
+        '매물분포': {},
+        '실거래가': {
+            '매매': [],
+            '전세': [],
+            '월세': []
+        },
+        '대출계산기': {},
+        '기본정보': {
+            '이미지': []
+        },
+        '단지정보': {},
+        '개발예정': [],
+        '시설정보': {},
+        '중개사': {},
+        '중개보수': {},
+        '세금': {},
+        '관리비': {},
+        '주변대중교통': {}
+    }
+
+# 가격 문자열 필드 → 만원 정수 필드 (문자열 필드는 그대로 두고 옆에 추가)
+PRICE_FIELDS = [
+    ('기본정보.매매가', '기본정보.매매가_만원'),
+    ('대출정보.대출한도.최대금액', '대출정보.대출한도.최대금액_만원'),
+    ('대출계산기.대출금액', '대출계산기.대출금액_만원'),
+    ('대출계산기.KB시세', '대출계산기.KB시세_만원'),
+]
+PRICE_RANGE_FIELDS = [
+    ('매물분포.가격범위', '매물분포.가격범위_최저_만원', '매물분포.가격범위_최고_만원'),
+]
+
+def add_price_fields(result):
+    """가격 문자열 → '_만원' 정수 필드 (실거래가는 trade_record에서 이미 정수)"""
+    for source, target in PRICE_FIELDS:
+        value = parse_price(get_path(result, source))
+        if value is not None:
+            set_path(result, target, value)
+    for source, low_target, high_target in PRICE_RANGE_FIELDS:
+        low, high = parse_price_range(get_path(result, source))
+        if low is not None:
+            set_path(result, low_target, low)
+            set_path(result, high_target, high)
+
+def parse_article(snapshot):
+    """
+    보관한 원문 → 매물 JSON (브라우저 없이, 순수 함수)
+    - 본문/관리비/시설본문/실거래가 탭 텍스트를 크롤링 때와 같은 순서로 추출
+    - 보존: 텍스트에서 얻을 수 없는 값 (이미지, 좌표 등) {필드 경로: 값}
+    - 응답필드: JSON 응답에서 찾은 값 [[섹션, 필드, 값]] (정규식 값보다 우선)
+    - 단지캐시: 같은 단지에서 먼저 수집한 {섹션: 값} → 해당 섹션은 추출하지 않고 그대로 사용
+      (크롤링 중에만, 보관본에는 저장하지 않으므로 재처리는 본문에서 추출)
+    """
+    meta = snapshot.get('메타정보', {})
+    result = new_result(meta)
+    page_text = snapshot.get('본문', '')
+    mgmt_text = snapshot.get('관리비', '')
+    cached = snapshot.get('단지캐시') or {}
+    first_groups = [g for g in FIRST_GROUPS if g not in cached]
+    later_groups = [g for g in LATER_GROUPS if g not in cached]
+
+    sections = PageSections(page_text, mgmt_text)
+    fill_fields(result, sections, first_groups)
+    if cached:
+        fill_fields(result, sections, fields=ARTICLE_COMPLEX_FIELDS)
+
+    # 시설 더보기 후 다시 읽은 본문이 있으면 이후 단계는 그 텍스트 사용
+    if snapshot.get('시설본문'):
+        page_text = snapshot['시설본문']
+        sections = PageSections(page_text, mgmt_text)
+    result['시설정보'].update(extract_facilities(page_text, snapshot.get('시설옵션', False)))
+
+    result['주변대중교통']['버스'] = {}
+    fill_fields(result, sections, later_groups)
+
+    for section, value in cached.items():
+        if isinstance(value, dict):
+            result[section].update(value)
+        else:
+            result[section] = value
+
+    for tab_name, trade_text in snapshot.get('실거래가', {}).items():
+        result['실거래가'][tab_name] = parse_trades(trade_text, tab_name, meta.get('수집시간'))
+    for tab_name, rows in snapshot.get('실거래가표', {}).items():
+        result['실거래가'][tab_name] = parse_trade_rows(rows, tab_name, meta.get('수집시간'))
+
+    for path, value in snapshot.get('보존', {}).items():
+        set_path(result, path, value)
+    for section, field, value in snapshot.get('응답필드', []):
+        result.setdefault(section, {})[field] = value
+    add_price_fields(result)
+    return result
+
+# ===== 벤치마크 =====
+
+def legacy_extract(page_text, mgmt_text=''):
+    """비교용: 섹션 없이 매번 전체 텍스트에서 re.search (기존 방식)"""
+    result = {}
+    for section, pattern, targets, flags in FIELD_TABLE:
+        text = (mgmt_text or page_text) if section == '관리비상세' else page_text
+        match = re.search(pattern, text, flags)
+        if match:
+            for path, convert, *group_ids in targets:
+                if get_path(result, path) is None:
+                    try:
+                        set_path(result, path, convert(*[match.group(g) for g in group_ids]))
+                    except (TypeError, ValueError, AttributeError):
+                        pass
+    for section, pattern, path, build, key in LIST_TABLE:
+        set_path(result, path, [build(m) for m in re.finditer(pattern, page_text)])
+    return result
+
+def main():
+    """저장한 페이지 텍스트로 매물당 추출 시간 측정"""
+    parser = argparse.ArgumentParser(description="필드 추출 벤치마크")
+    parser.add_argument('folder', help="페이지 텍스트(*.txt) 폴더")
+    parser.add_argument('--repeat', type=int, default=20, help="매물당 반복 횟수")
+    args = parser.parse_args()
+
+    texts = [(p.name, p.read_text(encoding='utf-8')) for p in sorted(Path(args.folder).glob('*.txt'))]
+    if not texts:
+        print(f"❌ 페이지 텍스트가 없습니다: {args.folder}")
+        return
+
+    print("\n" + "="*80)
+    print(f"필드 추출 벤치마크 ({len(texts)}개 매물, 매물당 {args.repeat}회)")
+    print("="*80)
+
+    totals = {'표': 0.0, '기존': 0.0}
+    for name, text in texts:
+        timings = {}
+        for label, extract in (('표', extract_all), ('기존', legacy_extract)):
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                extract(text)
+            timings[label] = (time.perf_counter() - started) / args.repeat
+            totals[label] += timings[label]
+        fields = sum(len(v) if isinstance(v, (dict, list)) else 1 for v in extract_all(text).values())
+        print(f"{name}: {len(text):,}자, 필드 {fields}개 → 표 {timings['표']*1000:.2f}ms / 기존 {timings['기존']*1000:.2f}ms")
+
+    print("-"*80)
+    print(f"평균: 표 {totals['표'] / len(texts) * 1000:.2f}ms / 기존 {totals['기존'] / len(texts) * 1000:.2f}ms per 매물")
+    print("="*80 + "\n")
+
+if __name__ == "__main__":
+    main()